@@ -22,6 +22,7 @@ result_dict = {}
 setup = """
 from __main__ import write_excel_with_pyfastexcel_with_double_for_loop
 from __main__ import write_excel_with_pyfastexcel_with_row
+from __main__ import write_excel_with_pyfastexcel_with_row_msgpack
 from __main__ import write_excel_with_stream_writer
 from __main__ import write_excel_with_openpyxl_normal_wb
 from __main__ import write_excel_with_openpyxl_write_only_wb
@@ -49,6 +50,15 @@ def write_excel_with_pyfastexcel_with_row() -> None:
     wb.save('pyfastexcel_by_row.xlsx')
 
 
+def write_excel_with_pyfastexcel_with_row_msgpack() -> None:
+    wb = PyFastExcelWorkbook()
+    wb.WIRE_FORMAT = 'msgpack'
+    ws = wb['Sheet1']
+    for i, record in enumerate(data):
+        ws[i] = list(record.values())
+    wb.save('pyfastexcel_by_row_msgpack.xlsx')
+
+
 def write_excel_with_stream_writer() -> None:
     class CustomWriter(StreamWriter):
         def create_excel(self) -> bytes:
@@ -254,6 +264,9 @@ if __name__ == '__main__':
             'write_excel_with_pyfastexcel_with_double_for_loop',
         )
         benchmark += run_test_case('WorkBook by row', 'write_excel_with_pyfastexcel_with_row')
+        benchmark += run_test_case(
+            'WorkBook by row\n(msgpack)', 'write_excel_with_pyfastexcel_with_row_msgpack'
+        )
         benchmark += run_test_case('StreamWriter', 'write_excel_with_stream_writer')
         benchmark += run_test_case('Openpyxl\nWorkbook', 'write_excel_with_openpyxl_normal_wb')
         benchmark += run_test_case(
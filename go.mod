@@ -3,13 +3,10 @@ module github.com/Zncl2222/pyfastexcel
 go 1.19
 
 require (
-	github.com/perimeterx/marshmallow v1.1.5
 	github.com/xuri/excelize/v2 v2.9.0
 )
 
 require (
-	github.com/josharian/intern v1.0.0 // indirect
-	github.com/mailru/easyjson v0.7.7 // indirect
 	github.com/mohae/deepcopy v0.0.0-20170929034955-c48cc78d4826 // indirect
 	github.com/richardlehane/mscfb v1.0.4 // indirect
 	github.com/richardlehane/msoleps v1.0.4 // indirect
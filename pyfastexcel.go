@@ -6,6 +6,7 @@ import (
 )
 import (
 	"fmt"
+	"path/filepath"
 	"unsafe"
 
 	"encoding/base64"
@@ -39,12 +40,285 @@ func Export(data *C.char, useCatchPanic int64) *C.char {
 	return encodedRes
 }
 
+// ExportBytes takes a pointer to JSON or MessagePack data for an Excel file and returns a
+// pointer to the raw zip bytes of the generated Excel file.
+//
+// Args:
+//
+//	data (*C.char): A pointer to the JSON or MessagePack data for the Excel file.
+//	dataLen (int64): The length of the data in bytes.
+//	outLen (*int64): A pointer that receives the length of the returned buffer.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	unsafe.Pointer: A pointer to the generated Excel file, or nil if the export panicked.
+//
+// Notes:
+//   - The input buffer is only read during the call and is never retained by Go.
+//   - Remember to free the memory allocated for the returned pointer using `FreeCPointer`.
+//
+//export ExportBytes
+func ExportBytes(data *C.char, dataLen int64, outLen *int64, useCatchPanic int64) unsafe.Pointer {
+	*outLen = 0
+	if useCatchPanic != 0 {
+		defer catchPanic()
+	}
+	payload := unsafe.Slice((*byte)(unsafe.Pointer(data)), dataLen)
+	result := core.WriteExcelBytes(payload)
+	*outLen = int64(len(result))
+	return C.CBytes(result)
+}
+
+// ExportFile takes a pointer to JSON or MessagePack data for an Excel file and writes the
+// generated Excel file directly to the given path.
+//
+// Args:
+//
+//	data (*C.char): A pointer to the JSON or MessagePack data for the Excel file.
+//	dataLen (int64): The length of the data in bytes.
+//	path (*C.char): A C char pointer containing the destination path.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	*C.char: nil on success, otherwise a C char pointer containing the error message.
+//
+// Notes:
+//   - Remember to free the memory allocated for a non-nil returned pointer using `FreeCPointer`.
+//
+//export ExportFile
+func ExportFile(data *C.char, dataLen int64, path *C.char, useCatchPanic int64) (errMsg *C.char) {
+	if useCatchPanic != 0 {
+		defer catchPanicAsError(&errMsg)
+	}
+	payload := unsafe.Slice((*byte)(unsafe.Pointer(data)), dataLen)
+	if err := core.WriteExcelToFile(payload, C.GoString(path)); err != nil {
+		return C.CString(err.Error())
+	}
+	return nil
+}
+
+// ExportFiles writes several Excel files concurrently, each payload to the path
+// with the same index.
+//
+// Args:
+//
+//	data (**C.char): An array of pointers to the JSON or MessagePack data of the Excel files.
+//	dataLens (*int64): An array of the lengths of the data in bytes.
+//	paths (**C.char): An array of C char pointers containing the destination paths.
+//	count (int64): The number of Excel files.
+//	maxWorkers (int64): The maximum number of files written at the same time, the
+//	                    number of CPUs if it is not positive.
+//	errMsgs (**C.char): An array of count pointers that receives the error message of
+//	                    each file, nil if the file was written.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Notes:
+//   - The input buffers are only read during the call and are never retained by Go.
+//   - Remember to free every non-nil error message using `FreeCPointer`.
+//
+//export ExportFiles
+func ExportFiles(
+	data **C.char,
+	dataLens *int64,
+	paths **C.char,
+	count int64,
+	maxWorkers int64,
+	errMsgs **C.char,
+	useCatchPanic int64,
+) {
+	if useCatchPanic != 0 {
+		defer catchPanic()
+	}
+	dataPtrs := unsafe.Slice(data, count)
+	lens := unsafe.Slice(dataLens, count)
+	pathPtrs := unsafe.Slice(paths, count)
+	payloads := make([][]byte, count)
+	goPaths := make([]string, count)
+	for i := range payloads {
+		payloads[i] = unsafe.Slice((*byte)(unsafe.Pointer(dataPtrs[i])), lens[i])
+		goPaths[i] = C.GoString(pathPtrs[i])
+	}
+
+	msgs := unsafe.Slice(errMsgs, count)
+	for i, err := range core.WriteExcelFiles(payloads, goPaths, int(maxWorkers)) {
+		msgs[i] = nil
+		if err != nil {
+			msgs[i] = C.CString(err.Error())
+		}
+	}
+}
+
+// SessionNew creates an export session, so the workbook can be sent to Go sheet
+// by sheet and batch by batch.
+//
+// Args:
+//
+//	data (*C.char): A pointer to the JSON or MessagePack data containing the style, file_props and protection.
+//	dataLen (int64): The length of the data in bytes.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	int64: The id of the session, or 0 if the session could not be created.
+//
+// Notes:
+//   - Remember to release the session with `SessionFree` if it is not finished by
+//     `SessionSaveFile` or `SessionSaveBytes`.
+//
+//export SessionNew
+func SessionNew(data *C.char, dataLen int64, useCatchPanic int64) (id int64) {
+	if useCatchPanic != 0 {
+		defer catchPanic()
+	}
+	return core.NewSession(unsafe.Slice((*byte)(unsafe.Pointer(data)), dataLen))
+}
+
+// SessionOpenSheet opens a new sheet in the session and closes the sheet opened previously.
+//
+// Args:
+//
+//	id (int64): The id of the session.
+//	sheet (*C.char): A C char pointer containing the name of the sheet.
+//	data (*C.char): A pointer to the JSON or MessagePack data containing the sheet settings.
+//	dataLen (int64): The length of the data in bytes.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	*C.char: nil on success, otherwise a C char pointer containing the error message.
+//
+//export SessionOpenSheet
+func SessionOpenSheet(id int64, sheet *C.char, data *C.char, dataLen int64, useCatchPanic int64) (errMsg *C.char) {
+	if useCatchPanic != 0 {
+		defer catchPanicAsError(&errMsg)
+	}
+	payload := unsafe.Slice((*byte)(unsafe.Pointer(data)), dataLen)
+	core.GetSession(id).OpenSheet(C.GoString(sheet), payload)
+	return nil
+}
+
+// SessionAppendRows writes a batch of rows after the rows written previously in the opened sheet.
+//
+// Args:
+//
+//	id (int64): The id of the session.
+//	data (*C.char): A pointer to the JSON or MessagePack data containing the new styles and the rows.
+//	dataLen (int64): The length of the data in bytes.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	*C.char: nil on success, otherwise a C char pointer containing the error message.
+//
+//export SessionAppendRows
+func SessionAppendRows(id int64, data *C.char, dataLen int64, useCatchPanic int64) (errMsg *C.char) {
+	if useCatchPanic != 0 {
+		defer catchPanicAsError(&errMsg)
+	}
+	core.GetSession(id).AppendRows(unsafe.Slice((*byte)(unsafe.Pointer(data)), dataLen))
+	return nil
+}
+
+// SessionCloseSheet closes the opened sheet of the session.
+//
+// Args:
+//
+//	id (int64): The id of the session.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	*C.char: nil on success, otherwise a C char pointer containing the error message.
+//
+//export SessionCloseSheet
+func SessionCloseSheet(id int64, useCatchPanic int64) (errMsg *C.char) {
+	if useCatchPanic != 0 {
+		defer catchPanicAsError(&errMsg)
+	}
+	core.GetSession(id).CloseSheet()
+	return nil
+}
+
+// SessionSaveFile finishes the session and writes the Excel file to the given path.
+// The session is released whether or not the file is written.
+//
+// Args:
+//
+//	id (int64): The id of the session.
+//	path (*C.char): A C char pointer containing the destination path.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	*C.char: nil on success, otherwise a C char pointer containing the error message.
+//
+//export SessionSaveFile
+func SessionSaveFile(id int64, path *C.char, useCatchPanic int64) (errMsg *C.char) {
+	if useCatchPanic != 0 {
+		defer catchPanicAsError(&errMsg)
+	}
+	defer core.CloseSession(id)
+	if err := core.GetSession(id).SaveAs(C.GoString(path)); err != nil {
+		return C.CString(err.Error())
+	}
+	return nil
+}
+
+// SessionSaveBytes finishes the session and returns a pointer to the raw zip bytes
+// of the Excel file. The session is released whether or not the file is generated.
+//
+// Args:
+//
+//	id (int64): The id of the session.
+//	outLen (*int64): A pointer that receives the length of the returned buffer.
+//	useCatchPanic (int64): The flag to recover from panic instead of crashing the process.
+//
+// Returns:
+//
+//	unsafe.Pointer: A pointer to the generated Excel file, or nil if the export panicked.
+//
+// Notes:
+//   - Remember to free the memory allocated for the returned pointer using `FreeCPointer`.
+//
+//export SessionSaveBytes
+func SessionSaveBytes(id int64, outLen *int64, useCatchPanic int64) unsafe.Pointer {
+	*outLen = 0
+	if useCatchPanic != 0 {
+		defer catchPanic()
+	}
+	defer core.CloseSession(id)
+	result := core.GetSession(id).WriteToBuffer()
+	*outLen = int64(len(result))
+	return C.CBytes(result)
+}
+
+// SessionFree releases a session without writing the Excel file.
+//
+// Args:
+//
+//	id (int64): The id of the session.
+//
+//export SessionFree
+func SessionFree(id int64) {
+	core.CloseSession(id)
+}
+
 func catchPanic() {
 	if r := recover(); r != nil {
 		fmt.Printf("Recovered from panic: %v\n", r)
 	}
 }
 
+// catchPanicAsError recovers from panic and returns the panic message to the caller
+// through errMsg.
+func catchPanicAsError(errMsg **C.char) {
+	if r := recover(); r != nil {
+		*errMsg = C.CString(fmt.Sprintf("Recovered from panic: %v", r))
+	}
+}
+
 // FreeCPointer frees the memory allocated for a C char pointer.
 //
 // Args:
@@ -64,8 +338,8 @@ func FreeCPointer(cptr *C.char, printMsg int64) {
 func testExport(t *testing.T) {
 	// Mock input data
 	inputData := `{
-		"style": {
-			"style1": {
+		"style": [
+			{
 				"Font": {
 					"Bold": true
 				},
@@ -102,7 +376,7 @@ func testExport(t *testing.T) {
 				},
 				"CustomNumFmt": "0.00"
 			}
-		},
+		],
 		"protection": {},
 		"file_props": {
 			"Title": "Test Excel File",
@@ -127,8 +401,8 @@ func testExport(t *testing.T) {
 					["Column1", "Column2", "Column3"]
 				],
 				"Data": [
-					[["Data1", "style1"], ["Data2", "style1"], ["Data3", "style1"], []],
-					[["Data4", "style1"], ["Data5", "style1"], ["Data6", "style1"], []]
+					[["Data1", 0], ["Data2", 0], ["Data3", 0], []],
+					[["Data4", 0], ["Data5", 0], ["Data6", 0], []]
 				],
 				"Height": {"3": 252},
 				"Width": {"1": 25, "2": 26, "3": 6},
@@ -169,6 +443,98 @@ func testExport(t *testing.T) {
 	if len(decodedExcel) == 0 {
 		t.Error("Encoded Excel data is empty")
 	}
+
+	// Export the same payload through the raw bytes entry point
+	cInputData = C.CString(inputData)
+	var size int64
+	rawExcel := ExportBytes(cInputData, int64(len(inputData)), &size, 1)
+	FreeCPointer(cInputData, 0)
+	if rawExcel == nil || size == 0 {
+		t.Fatal("Raw Excel data is empty")
+	}
+	rawBytes := C.GoBytes(rawExcel, C.int(size))
+	FreeCPointer((*C.char)(rawExcel), 0)
+	if string(rawBytes[:2]) != "PK" {
+		t.Error("Raw Excel data is not a zip archive")
+	}
+
+	// Export the same payload directly to a file
+	cInputData = C.CString(inputData)
+	cPath := C.CString(filepath.Join(t.TempDir(), "export.xlsx"))
+	errMsg := ExportFile(cInputData, int64(len(inputData)), cPath, 1)
+	FreeCPointer(cInputData, 0)
+	FreeCPointer(cPath, 0)
+	if errMsg != nil {
+		t.Errorf("Failed to export Excel file: %s", C.GoString(errMsg))
+		FreeCPointer(errMsg, 0)
+	}
+
+	// Export the same payload to several files at once, an invalid payload only
+	// fails its own file
+	dir := t.TempDir()
+	invalidData := `{"style": [`
+	cData := []*C.char{C.CString(inputData), C.CString(invalidData)}
+	dataLens := []int64{int64(len(inputData)), int64(len(invalidData))}
+	cPaths := []*C.char{C.CString(filepath.Join(dir, "a.xlsx")), C.CString(filepath.Join(dir, "b.xlsx"))}
+	errMsgs := make([]*C.char, 2)
+	ExportFiles(&cData[0], &dataLens[0], &cPaths[0], 2, 2, &errMsgs[0], 1)
+	for i := range cData {
+		FreeCPointer(cData[i], 0)
+		FreeCPointer(cPaths[i], 0)
+	}
+	if errMsgs[0] != nil {
+		t.Errorf("Failed to export Excel file: %s", C.GoString(errMsgs[0]))
+		FreeCPointer(errMsgs[0], 0)
+	}
+	if errMsgs[1] == nil {
+		t.Error("Expected an error for the invalid payload")
+	} else {
+		FreeCPointer(errMsgs[1], 0)
+	}
+
+	// Export the same workbook through a session
+	meta := `{"style": [], "protection": {}, "file_props": {"Title": "", "Creator": "",
+		"Category": "", "ContentStatus": "", "Description": "", "Keywords": "", "Language": "",
+		"LastModifiedBy": "", "Revision": "", "Subject": "", "Version": "", "Identifier": "",
+		"Created": "", "Modified": ""}}`
+	cMeta := C.CString(meta)
+	id := SessionNew(cMeta, int64(len(meta)), 1)
+	FreeCPointer(cMeta, 0)
+	if id == 0 {
+		t.Fatal("Failed to create session")
+	}
+	sheetData := `{"Width": {}, "Height": {}, "MergeCells": [], "AutoFilter": [], "Panes": {},
+		"DataValidation": [], "Comment": [], "NoStyle": false, "Table": [], "Chart": [],
+		"PivotTable": [], "SheetVisible": true, "WriterEngine": "StreamWriter"}`
+	batch := `{"style": [{"Font": {}, "Fill": {}, "Border": {}, "Alignment": {},
+		"Protection": {}, "CustomNumFmt": "general"}], "data": [[["Data1"]]]}`
+	cSheet, cSheetData, cBatch := C.CString("Sheet1"), C.CString(sheetData), C.CString(batch)
+	defer FreeCPointer(cSheet, 0)
+	defer FreeCPointer(cSheetData, 0)
+	defer FreeCPointer(cBatch, 0)
+
+	for _, errMsg := range []*C.char{
+		SessionOpenSheet(id, cSheet, cSheetData, int64(len(sheetData)), 1),
+		SessionAppendRows(id, cBatch, int64(len(batch)), 1),
+		SessionCloseSheet(id, 1),
+	} {
+		if errMsg != nil {
+			t.Errorf("Unexpected session error: %s", C.GoString(errMsg))
+			FreeCPointer(errMsg, 0)
+		}
+	}
+	// A sheet can not be written twice in a session
+	if errMsg := SessionOpenSheet(id, cSheet, cSheetData, int64(len(sheetData)), 1); errMsg == nil {
+		t.Error("Expected an error when reopening a written sheet")
+	} else {
+		FreeCPointer(errMsg, 0)
+	}
+
+	sessionExcel := SessionSaveBytes(id, &size, 1)
+	if sessionExcel == nil || size == 0 {
+		t.Fatal("Session Excel data is empty")
+	}
+	FreeCPointer((*C.char)(sessionExcel), 0)
 }
 
 func main() {
@@ -1,7 +1,7 @@
 from pyfastexcel.enums import ChartDataLabelPosition, ChartLineType, ChartType, MarkerSymbol
 from pyfastexcel.style import CustomStyle, DefaultStyle
 from pyfastexcel.utils import set_debug_level
-from pyfastexcel.workbook import Workbook
+from pyfastexcel.workbook import Workbook, export_many
 from pyfastexcel.writer import StreamWriter
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     'CustomStyle',
     'DefaultStyle',
     'set_debug_level',
+    'export_many',
     # Constants for chart creation.
     'ChartType',
     'ChartDataLabelPosition',
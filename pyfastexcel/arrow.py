@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .storage import DATE_FORMAT, DATETIME_FORMAT, TIMEDELTA_FORMAT, ArrayBlock, ConvertedColumn
+from .utils import excel_serial, validate_and_format_value
+
+# The days from 1899-12-30 to 1970-01-01, the epoch of the Arrow temporal
+# types, which are converted into serial numbers by utils.excel_serial().
+_UNIX_EPOCH_DAYS = 25569
+_UNITS_PER_DAY = {'s': 86400, 'ms': 86400 * 10**3, 'us': 86400 * 10**6, 'ns': 86400 * 10**9}
+
+
+def convert_arrow_column(array: pa.Array) -> ConvertedColumn | None:
+    """
+    Converts a column of a record batch into values that can be sent as a raw
+    buffer to the shared library.
+
+    The numbers without nulls are read from the buffer of the Arrow array
+    without a conversion to Python objects, the nulls are sent as NaN, which
+    are written as empty cells.
+
+    Args:
+        array (pyarrow.Array): The column.
+
+    Returns:
+        ConvertedColumn | None: The converted column, or None if the column
+            should be written cell by cell, e.g. a column of lists.
+    """
+    dtype = array.type
+    if pa.types.is_dictionary(dtype):
+        if _is_string(dtype.value_type):
+            # Every value of the dictionary is sent once, and the cells are sent as codes.
+            codes = array.indices.cast(pa.int32()).fill_null(-1)
+            return ConvertedColumn(codes.to_numpy(), strings=array.dictionary.to_pylist())
+        return convert_arrow_column(array.dictionary_decode())
+    if _is_string(dtype):
+        return convert_arrow_column(array.dictionary_encode())
+    if pa.types.is_boolean(dtype):
+        if array.null_count:
+            return None
+        return ConvertedColumn(array.to_numpy(zero_copy_only=False))
+    if pa.types.is_integer(dtype) or pa.types.is_floating(dtype):
+        if array.null_count == 0:
+            return ConvertedColumn(array.to_numpy())
+        return ConvertedColumn(_to_float(array))
+    if pa.types.is_decimal(dtype):
+        return ConvertedColumn(_to_float(array))
+    if pa.types.is_timestamp(dtype):
+        if dtype.tz is not None:
+            # Excel has no time zone, the local time is written.
+            array = pc.local_timestamp(array)
+        days = _to_float(array.cast(pa.int64())) / _UNITS_PER_DAY[dtype.unit]
+        return _convert_days(days, DATETIME_FORMAT)
+    if pa.types.is_date32(dtype):
+        return _convert_days(_to_float(array.cast(pa.int32())), DATE_FORMAT)
+    if pa.types.is_date64(dtype):
+        days = _to_float(array.cast(pa.int64())) / _UNITS_PER_DAY['ms']
+        return _convert_days(days, DATE_FORMAT)
+    if pa.types.is_duration(dtype):
+        days = _to_float(array.cast(pa.int64())) / _UNITS_PER_DAY[dtype.unit]
+        return ConvertedColumn(days, number_format=TIMEDELTA_FORMAT)
+    return None
+
+
+def get_number_format(dtype: pa.DataType) -> str | None:
+    """
+    Gets the number format required by the values of an Arrow type, e.g. the
+    date format of the serial numbers of the dates.
+    """
+    converted = convert_arrow_column(pa.array([], type=dtype))
+    return None if converted is None else converted.number_format
+
+
+def read_batches(data: Any) -> tuple[pa.Schema, Iterable[pa.RecordBatch]]:
+    """
+    Reads the schema of a table, a record batch, a RecordBatchReader or an
+    iterable of record batches.
+
+    Args:
+        data (Any): The Arrow data.
+
+    Returns:
+        tuple[pyarrow.Schema, Iterable[pyarrow.RecordBatch]]: The schema and
+            the record batches. The first batch of an iterator is read to get
+            the schema, and it is kept in the returned batches.
+
+    Raises:
+        TypeError: If the data is not Arrow data, or the iterable is empty.
+    """
+    if isinstance(data, pa.Table):
+        # The batches share the buffers of the table.
+        return data.schema, data.to_batches()
+    if isinstance(data, pa.RecordBatch):
+        return data.schema, [data]
+    if isinstance(data, pa.RecordBatchReader):
+        return data.schema, data
+    if isinstance(data, Iterable) and not isinstance(data, (str, bytes, dict)):
+        batches = iter(data)
+        first = next(batches, None)
+        if isinstance(first, pa.RecordBatch):
+            return first.schema, _chain(first, batches)
+    raise TypeError(
+        'data should be a pyarrow Table, RecordBatch, RecordBatchReader or a '
+        'non-empty iterable of RecordBatch.',
+    )
+
+
+def _is_string(dtype: pa.DataType) -> bool:
+    return pa.types.is_string(dtype) or pa.types.is_large_string(dtype)
+
+
+def _convert_days(days: np.ndarray, number_format: str) -> ConvertedColumn | None:
+    serials = excel_serial(days + _UNIX_EPOCH_DAYS)
+    if (serials < 1).any():
+        # The dates before 1900 are written cell by cell as strings.
+        return None
+    return ConvertedColumn(serials, number_format=number_format)
+
+
+def _to_float(array: pa.Array) -> np.ndarray:
+    # The integers above 2**53 are rounded like in the other columns of floats.
+    return array.cast(pa.float64(), safe=False).fill_null(np.nan).to_numpy()
+
+
+class ArrowSource:
+    """
+    The record batches written by WorkSheet.write_arrow(), after the rows of
+    the sheet.
+
+    The batches are read when the workbook is exported, and every batch is
+    sent to the export session of the shared library as a batch of arrays, so
+    only one batch is held in memory at a time.
+    """
+
+    __slots__ = ('_schema', '_batches', '_styles', '_header')
+
+    def __init__(
+        self,
+        schema: pa.Schema,
+        batches: Iterable[pa.RecordBatch],
+        styles: list[str],
+        header: list | None = None,
+    ):
+        self._schema = schema
+        self._batches = batches
+        self._styles = styles
+        self._header = header
+
+    def _iter_batches(self) -> Iterator[tuple[list[list], list[ArrayBlock]]]:
+        """
+        Converts the record batches one by one.
+
+        Yields:
+            tuple[list[list], list[ArrayBlock]]: The rows and the arrays of a
+                batch, whose rows are relative to the first row of the batch.
+
+        Raises:
+            ValueError: If a record batch does not match the schema of the source.
+        """
+        if self._header is not None:
+            yield [self._header], []
+        for batch in self._batches:
+            if not batch.schema.equals(self._schema):
+                raise ValueError(
+                    f'The record batch {batch.schema.names} does not match the schema '
+                    f'{self._schema.names} of the source.',
+                )
+            if batch.num_rows:
+                yield self._convert_batch(batch)
+
+    def _convert_batch(self, batch: pa.RecordBatch) -> tuple[list[list], list[ArrayBlock]]:
+        rows = []
+        arrays = []
+        for j, (column, style) in enumerate(zip(batch.columns, self._styles)):
+            converted = convert_arrow_column(column)
+            if converted is None:
+                # The null values are kept as empty cells.
+                if not rows:
+                    rows = [[None] * batch.num_columns for _ in range(batch.num_rows)]
+                for i, value in enumerate(column.to_pylist()):
+                    if value is not None:
+                        rows[i][j] = (validate_and_format_value(value, False), style)
+            elif converted.strings is not None:
+                arrays.append(
+                    ArrayBlock.from_codes(converted.values, converted.strings, 0, j, style)
+                )
+            else:
+                arrays.append(ArrayBlock.from_array(converted.values.reshape(-1, 1), 0, j, style))
+        return rows, arrays
+
+
+def _chain(first: pa.RecordBatch, batches: Iterator[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+    yield first
+    yield from batches
@@ -0,0 +1,203 @@
+package core
+
+import (
+	"encoding/binary"
+	"fmt"
+	"math"
+	"sort"
+)
+
+// ArrayBlock is a rectangle of cells sent as the raw buffer of a NumPy array,
+// see WorkSheet.write_array in python.
+//
+// Notes:
+//   - Row and Col are the 0-based indexes of the top left cell.
+//   - Data holds Rows x Cols little-endian values in C order, of the NumPy
+//     dtype Dtype: f4, f8, i1, i2, i4, i8, u1, u2, u4, u8 or b1.
+//   - The dtype cat holds int32 indexes in Strings, -1 for an empty cell.
+//   - Style is the style id of every cell, -1 for an unknown style.
+//   - StyleRules are the style rules recorded after the block which overlap
+//     it, in the coordinates of Row and Col. They style the cells of the block
+//     over its Style, while the rules of the sheet are overridden by the block.
+type ArrayBlock struct {
+	Row     int      `json:"Row"`
+	Col     int      `json:"Col"`
+	Rows    int      `json:"Rows"`
+	Cols    int      `json:"Cols"`
+	Dtype   string   `json:"Dtype"`
+	Data    []byte   `json:"Data"`
+	Style   int      `json:"Style"`
+	Strings []string `json:"Strings"`
+	// StyleRules style the cells of the block, see the Notes.
+	StyleRules []StyleRule `json:"StyleRules"`
+}
+
+// arrayReaders reads the value at the index i of a buffer, by dtype.
+var arrayReaders = map[string]struct {
+	size int
+	read func(b []byte, i int) float64
+}{
+	"f4": {4, func(b []byte, i int) float64 {
+		return float64(math.Float32frombits(binary.LittleEndian.Uint32(b[4*i:])))
+	}},
+	"f8": {8, func(b []byte, i int) float64 { return math.Float64frombits(binary.LittleEndian.Uint64(b[8*i:])) }},
+	"i1": {1, func(b []byte, i int) float64 { return float64(int8(b[i])) }},
+	"i2": {2, func(b []byte, i int) float64 { return float64(int16(binary.LittleEndian.Uint16(b[2*i:]))) }},
+	"i4": {4, func(b []byte, i int) float64 { return float64(int32(binary.LittleEndian.Uint32(b[4*i:]))) }},
+	"i8": {8, func(b []byte, i int) float64 { return float64(int64(binary.LittleEndian.Uint64(b[8*i:]))) }},
+	"u1": {1, func(b []byte, i int) float64 { return float64(b[i]) }},
+	"u2": {2, func(b []byte, i int) float64 { return float64(binary.LittleEndian.Uint16(b[2*i:])) }},
+	"u4": {4, func(b []byte, i int) float64 { return float64(binary.LittleEndian.Uint32(b[4*i:])) }},
+	"u8": {8, func(b []byte, i int) float64 { return float64(binary.LittleEndian.Uint64(b[8*i:])) }},
+	"b1": {1, func(b []byte, i int) float64 { return float64(b[i]) }},
+}
+
+// arrayCodeReader reads the index in the strings of a cat block.
+var arrayCodeReader = arrayReaders["i4"]
+
+// cells decodes the cells of the block in C order.
+//
+// Panics:
+//   - panics if the dtype is not supported or the buffer does not match the shape.
+func (b *ArrayBlock) cells() []Cell {
+	reader, ok := arrayReaders[b.Dtype]
+	if b.Dtype == "cat" {
+		reader, ok = arrayCodeReader, true
+	}
+	if !ok {
+		panic(fmt.Sprintf("unsupported array dtype %q", b.Dtype))
+	}
+	if b.Row < 0 || b.Col < 0 || b.Rows < 0 || b.Cols < 0 || len(b.Data) != b.Rows*b.Cols*reader.size {
+		panic(fmt.Sprintf("malformed array of %d x %d %s values in %d bytes", b.Rows, b.Cols, b.Dtype, len(b.Data)))
+	}
+	style := b.Style
+	if style < 0 {
+		style = noStyle
+	}
+	cells := make([]Cell, b.Rows*b.Cols)
+	for i := range cells {
+		v := reader.read(b.Data, i)
+		switch {
+		case b.Dtype == "cat":
+			cells[i] = b.stringCell(int(v), style)
+		case b.Dtype == "b1":
+			cells[i] = Cell{Kind: cellBool, Num: v, Style: style}
+		case math.IsNaN(v) || math.IsInf(v, 0):
+			// msgspec encodes NaN and Inf as null, keep the same behavior.
+			cells[i] = Cell{Kind: cellNull, Style: style}
+		default:
+			cells[i] = Cell{Kind: cellNumber, Num: v, Style: style}
+		}
+	}
+	b.applyStyleRules(cells)
+	return cells
+}
+
+// applyStyleRules applies the style rules of the block to its cells in order.
+func (b *ArrayBlock) applyStyleRules(cells []Cell) {
+	for r := range b.StyleRules {
+		rule := &b.StyleRules[r]
+		for i := 0; i < b.Rows; i++ {
+			if b.Row+i < rule[0] || b.Row+i > rule[2] {
+				continue
+			}
+			for j := 0; j < b.Cols; j++ {
+				c := &cells[i*b.Cols+j]
+				if rule.contains(b.Row+i, b.Col+j) && styledByRule(c) {
+					c.Style = rule[4]
+				}
+			}
+		}
+	}
+}
+
+// stringCell returns the cell of the string at the given index of a cat block.
+//
+// Panics:
+//   - panics if the index is out of the strings.
+func (b *ArrayBlock) stringCell(index, style int) Cell {
+	if index < 0 {
+		return Cell{Kind: cellNull, Style: style}
+	}
+	if index >= len(b.Strings) {
+		panic(fmt.Sprintf("string index %d out of range", index))
+	}
+	s := b.Strings[index]
+	if len(s) != 0 && s[0] == '=' {
+		return Cell{Kind: cellFormula, Str: s, Style: style}
+	}
+	return Cell{Kind: cellString, Str: s, Style: style}
+}
+
+// applyArrays writes the cells of the arrays over the rows, and expands the
+// rows to include them.
+func applyArrays(rows []Row, arrays []ArrayBlock) []Row {
+	for a := range arrays {
+		b := &arrays[a]
+		cells := b.cells()
+		for len(rows) < b.Row+b.Rows {
+			rows = append(rows, nil)
+		}
+		width := b.Col + b.Cols
+		for i := 0; i < b.Rows; i++ {
+			row := rows[b.Row+i]
+			if len(row) < width {
+				grown := make(Row, width)
+				copy(grown, row)
+				// The gaps are skipped like the null values without style.
+				for j := len(row); j < b.Col; j++ {
+					grown[j] = Cell{Kind: cellNull, Style: noStyle}
+				}
+				row = grown
+			}
+			copy(row[b.Col:width], cells[i*b.Cols:(i+1)*b.Cols])
+			rows[b.Row+i] = row
+		}
+	}
+	return rows
+}
+
+// addArrays adds the cells of the arrays to the sparse cells, over the cells
+// of the same location, and keeps them sorted.
+func (s *SparseCells) addArrays(arrays []ArrayBlock) {
+	if len(arrays) == 0 {
+		return
+	}
+	s.check()
+	for a := range arrays {
+		b := &arrays[a]
+		for i, c := range b.cells() {
+			s.Rows = append(s.Rows, b.Row+i/b.Cols)
+			s.Cols = append(s.Cols, b.Col+i%b.Cols)
+			s.Cells = append(s.Cells, c)
+		}
+	}
+
+	order := make([]int, len(s.Cells))
+	for i := range order {
+		order[i] = i
+	}
+	sort.SliceStable(order, func(i, j int) bool {
+		a, b := order[i], order[j]
+		if s.Rows[a] != s.Rows[b] {
+			return s.Rows[a] < s.Rows[b]
+		}
+		return s.Cols[a] < s.Cols[b]
+	})
+	rows := make([]int, 0, len(order))
+	cols := make([]int, 0, len(order))
+	cells := make([]Cell, 0, len(order))
+	for k, i := range order {
+		// The last cell of a location is kept
+		if k+1 < len(order) {
+			next := order[k+1]
+			if s.Rows[next] == s.Rows[i] && s.Cols[next] == s.Cols[i] {
+				continue
+			}
+		}
+		rows = append(rows, s.Rows[i])
+		cols = append(cols, s.Cols[i])
+		cells = append(cells, s.Cells[i])
+	}
+	s.Rows, s.Cols, s.Cells = rows, cols, cells
+}
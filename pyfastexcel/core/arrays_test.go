@@ -0,0 +1,123 @@
+package core
+
+import (
+	"encoding/binary"
+	"math"
+	"reflect"
+	"testing"
+)
+
+func TestArrayBlockCells(t *testing.T) {
+	f8 := make([]byte, 16)
+	binary.LittleEndian.PutUint64(f8, math.Float64bits(1.5))
+	binary.LittleEndian.PutUint64(f8[8:], math.Float64bits(math.NaN()))
+	i2 := []byte{0xff, 0xff, 0x02, 0x00}
+
+	tests := []struct {
+		name   string
+		block  ArrayBlock
+		expect []Cell
+	}{
+		{
+			name:  "Float64",
+			block: ArrayBlock{Rows: 1, Cols: 2, Dtype: "f8", Data: f8, Style: 2},
+			expect: []Cell{
+				{Kind: cellNumber, Num: 1.5, Style: 2},
+				{Kind: cellNull, Style: 2},
+			},
+		},
+		{
+			name:  "Int16",
+			block: ArrayBlock{Rows: 2, Cols: 1, Dtype: "i2", Data: i2, Style: -1},
+			expect: []Cell{
+				{Kind: cellNumber, Num: -1, Style: noStyle},
+				{Kind: cellNumber, Num: 2, Style: noStyle},
+			},
+		},
+		{
+			name: "Categories",
+			block: ArrayBlock{
+				Rows: 3, Cols: 1, Dtype: "cat", Strings: []string{"a", "=A1"},
+				Data: []byte{1, 0, 0, 0, 0xff, 0xff, 0xff, 0xff, 0, 0, 0, 0},
+			},
+			expect: []Cell{
+				{Kind: cellFormula, Str: "=A1"},
+				{Kind: cellNull},
+				{Kind: cellString, Str: "a"},
+			},
+		},
+		{
+			name:   "Bool",
+			block:  ArrayBlock{Rows: 1, Cols: 2, Dtype: "b1", Data: []byte{1, 0}},
+			expect: []Cell{{Kind: cellBool, Num: 1}, {Kind: cellBool}},
+		},
+		{
+			// The later rule overrides the earlier one on the cells they share.
+			name: "StyleRules",
+			block: ArrayBlock{
+				Row: 1, Col: 1, Rows: 2, Cols: 1, Dtype: "i2", Data: i2, Style: 2,
+				StyleRules: []StyleRule{{0, 0, 1, 1, 3}, {2, 1, 5, 5, 4}},
+			},
+			expect: []Cell{
+				{Kind: cellNumber, Num: -1, Style: 3},
+				{Kind: cellNumber, Num: 2, Style: 4},
+			},
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if cells := tt.block.cells(); !reflect.DeepEqual(cells, tt.expect) {
+				t.Errorf("Expected %#v but got %#v", tt.expect, cells)
+			}
+		})
+	}
+}
+
+func TestArrayBlockCellsMalformed(t *testing.T) {
+	for _, block := range []ArrayBlock{
+		{Rows: 1, Cols: 1, Dtype: "U1", Data: []byte{'a'}},
+		{Rows: 2, Cols: 1, Dtype: "i4", Data: make([]byte, 4)},
+		{Rows: 1, Cols: 1, Dtype: "cat", Data: []byte{1, 0, 0, 0}, Strings: []string{"a"}},
+	} {
+		func() {
+			defer func() {
+				if r := recover(); r == nil {
+					t.Errorf("Expected panic on %#v", block)
+				}
+			}()
+			block.cells()
+		}()
+	}
+}
+
+func TestApplyArrays(t *testing.T) {
+	rows := []Row{{{Kind: cellString, Str: "a", Style: noStyle}}}
+	arrays := []ArrayBlock{{Row: 0, Col: 2, Rows: 2, Cols: 1, Dtype: "u1", Data: []byte{1, 2}}}
+
+	skip := Cell{Kind: cellNull, Style: noStyle}
+	expected := []Row{
+		{{Kind: cellString, Str: "a", Style: noStyle}, skip, {Kind: cellNumber, Num: 1}},
+		{skip, skip, {Kind: cellNumber, Num: 2}},
+	}
+	if actual := applyArrays(rows, arrays); !reflect.DeepEqual(actual, expected) {
+		t.Errorf("Expected %#v but got %#v", expected, actual)
+	}
+}
+
+func TestSparseCellsAddArrays(t *testing.T) {
+	sparse := &SparseCells{
+		Rows:  []int{0, 3},
+		Cols:  []int{1, 0},
+		Cells: []Cell{{Kind: cellString, Str: "a"}, {Kind: cellString, Str: "b"}},
+	}
+	sparse.addArrays([]ArrayBlock{{Row: 0, Col: 0, Rows: 1, Cols: 2, Dtype: "u1", Data: []byte{1, 2}}})
+
+	expected := &SparseCells{
+		Rows:  []int{0, 0, 3},
+		Cols:  []int{0, 1, 0},
+		Cells: []Cell{{Kind: cellNumber, Num: 1}, {Kind: cellNumber, Num: 2}, {Kind: cellString, Str: "b"}},
+	}
+	if !reflect.DeepEqual(sparse, expected) {
+		t.Errorf("Expected %#v but got %#v", expected, sparse)
+	}
+}
@@ -1,40 +1,217 @@
 package core
 
 import (
-	"strings"
+	"bytes"
+	"encoding/json"
+	"fmt"
+	"strconv"
 
 	"github.com/xuri/excelize/v2"
 )
 
-// createCell takes a slice of interface{} representing a cell data and returns an excelize.Cell object.
+// Row is a row of cells.
+type Row []Cell
+
+type cellKind uint8
+
+const (
+	// cellEmpty is a padding cell sent as an empty array.
+	cellEmpty cellKind = iota
+	// cellNull is a cell with a null value.
+	cellNull
+	cellString
+	cellFormula
+	cellNumber
+	cellBool
+	// cellPooled is a string cell sent as [index], the index of its value in
+	// the string pool of the payload, until it is resolved by resolveStrings.
+	cellPooled
+)
+
+// noStyle is the style id of a plain value, which is written with the style 0 of the file.
+const noStyle = -1
+
+// Cell is the compact form of a cell payload. A cell is sent either as a
+// [value, style id] array, a [value] array for a cell with the DEFAULT_STYLE,
+// an empty array for a padding cell or a plain value without style for the
+// sheets created from plain data. The value of a string repeated in the
+// payload may be sent as [index], its index in the string pool.
+type Cell struct {
+	Kind cellKind
+	// Str holds the value of a string or formula cell.
+	Str string
+	// Num holds the value of a number cell, and 1 or 0 for a boolean cell.
+	Num float64
+	// Style is the index of the style in the style list of the payload, the
+	// DEFAULT_STYLE always takes the index 0.
+	Style int
+}
+
+// value returns the value of the cell to be written by excelize.
+func (c *Cell) value() interface{} {
+	switch c.Kind {
+	case cellString:
+		return c.Str
+	case cellNumber:
+		return c.Num
+	case cellBool:
+		return c.Num != 0
+	case cellEmpty:
+		return ""
+	default:
+		return nil
+	}
+}
+
+// UnmarshalJSON decodes a cell without going through []interface{}, which
+// avoids boxing every value of the sheet.
+func (c *Cell) UnmarshalJSON(data []byte) error {
+	data = bytes.TrimSpace(data)
+	if len(data) == 0 || data[0] != '[' {
+		// Plain value without style
+		*c = Cell{Style: noStyle}
+		return c.setValue(data)
+	}
+
+	data = bytes.TrimSpace(data[1 : len(data)-1])
+	if len(data) == 0 {
+		*c = Cell{Kind: cellEmpty}
+		return nil
+	}
+	end, err := scalarEnd(data)
+	if err != nil {
+		return err
+	}
+	*c = Cell{}
+	if err := c.setValue(bytes.TrimSpace(data[:end])); err != nil {
+		return err
+	}
+
+	rest := bytes.TrimSpace(data[end:])
+	if len(rest) == 0 {
+		return nil
+	}
+	if rest[0] != ',' {
+		return fmt.Errorf("invalid cell %s", data)
+	}
+	rest = bytes.TrimSpace(rest[1:])
+	if string(rest) == "null" {
+		return nil
+	}
+	style, err := strconv.Atoi(string(rest))
+	if err != nil {
+		return fmt.Errorf("invalid style id %s", rest)
+	}
+	c.Style = style
+	return nil
+}
+
+// setValue decodes a JSON scalar into the value of the cell.
+func (c *Cell) setValue(raw []byte) error {
+	if len(raw) == 0 {
+		return fmt.Errorf("empty cell value")
+	}
+	switch raw[0] {
+	case '"':
+		if err := decodeString(raw, &c.Str); err != nil {
+			return err
+		}
+		c.Kind = cellString
+		if len(c.Str) != 0 && c.Str[0] == '=' {
+			c.Kind = cellFormula
+		}
+	case 't', 'f':
+		c.Kind = cellBool
+		if raw[0] == 't' {
+			c.Num = 1
+		}
+	case 'n':
+		c.Kind = cellNull
+	case '[':
+		index, err := strconv.Atoi(string(bytes.TrimSpace(raw[1 : len(raw)-1])))
+		if err != nil {
+			return fmt.Errorf("invalid string index %s", raw)
+		}
+		c.Kind = cellPooled
+		c.Num = float64(index)
+	default:
+		num, err := strconv.ParseFloat(string(raw), 64)
+		if err != nil {
+			return fmt.Errorf("invalid cell value %s", raw)
+		}
+		c.Kind = cellNumber
+		c.Num = num
+	}
+	return nil
+}
+
+// scalarEnd returns the length of the JSON scalar, or of the [index] of a
+// pooled string, at the beginning of data.
+func scalarEnd(data []byte) (int, error) {
+	if data[0] == '[' {
+		if i := bytes.IndexByte(data, ']'); i >= 0 {
+			return i + 1, nil
+		}
+		return 0, fmt.Errorf("unterminated string index %s", data)
+	}
+	if data[0] != '"' {
+		if i := bytes.IndexByte(data, ','); i >= 0 {
+			return i, nil
+		}
+		return len(data), nil
+	}
+	for i := 1; i < len(data); i++ {
+		switch data[i] {
+		case '\\':
+			i++
+		case '"':
+			return i + 1, nil
+		}
+	}
+	return 0, fmt.Errorf("unterminated string %s", data)
+}
+
+// decodeString decodes a JSON string, only falling back to encoding/json when
+// the string contains escape sequences.
+func decodeString(raw []byte, s *string) error {
+	if len(raw) < 2 || raw[0] != '"' || raw[len(raw)-1] != '"' {
+		return fmt.Errorf("invalid string %s", raw)
+	}
+	if bytes.IndexByte(raw, '\\') < 0 {
+		*s = string(raw[1 : len(raw)-1])
+		return nil
+	}
+	return json.Unmarshal(raw, s)
+}
+
+// styleID returns the style index in the File of a style id of the payload.
+//
+// Notes:
+//   - A plain value, or an id unknown to the writer, uses the style 0 of the file.
+func (ew *ExcelWriter) styleID(id int) int {
+	if id < 0 || id >= len(ew.styleIDs) {
+		return 0
+	}
+	return ew.styleIDs[id]
+}
+
+// createCell takes a decoded cell and returns an excelize.Cell object.
 //
 // Args:
 //
-//	v ([]interface{}): A slice containing cell data. The first element represents the value,
-//					   and the second element (optional) represents the style name.
+//	c (*Cell): The decoded cell with its value and style id.
 //
 // Returns:
 //
 //	excelize.Cell: An excelize.Cell object representing the cell with appropriate value and style.
 //
 // Notes:
-//   - The function checks the type of the first element in the slice (`v[0]`).
-//   - If it's a string:
-//   - If the string starts with "=" (formula): the cell is created with
-//     the formula and the style ID from the second element (`v[1]`).
-//   - Otherwise, the cell is created with the string value and the style ID.
-//   - For any other type, the cell is created with the value and the style ID.
-func createCell(v []interface{}) excelize.Cell {
-	if len(v) == 0 {
-		return excelize.Cell{StyleID: styleMap["DEFAULT_STYLE"], Value: ""}
-	}
-	switch value := v[0].(type) {
-	case string:
-		if strings.HasPrefix(value, "=") {
-			return excelize.Cell{StyleID: styleMap[v[1].(string)], Formula: value}
-		}
-		return excelize.Cell{StyleID: styleMap[v[1].(string)], Value: value}
-	default:
-		return excelize.Cell{StyleID: styleMap[v[1].(string)], Value: value}
+//   - A formula cell (a string starting with "=") is created with the formula.
+//   - An empty cell is created with an empty string and the DEFAULT_STYLE.
+//   - A cell without style, which comes from plain data, uses the style 0 of the file.
+func (ew *ExcelWriter) createCell(c *Cell) excelize.Cell {
+	if c.Kind == cellFormula {
+		return excelize.Cell{StyleID: ew.styleID(c.Style), Formula: c.Str}
 	}
+	return excelize.Cell{StyleID: ew.styleID(c.Style), Value: c.value()}
 }
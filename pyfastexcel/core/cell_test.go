@@ -1,6 +1,7 @@
 package core
 
 import (
+	"encoding/json"
 	"reflect"
 	"testing"
 
@@ -8,39 +9,118 @@ import (
 )
 
 func TestCreateCell(t *testing.T) {
+	ew := &ExcelWriter{styleIDs: []int{1, 2}}
 	tests := []struct {
 		name   string
-		input  []interface{}
+		input  string
 		expect excelize.Cell
 	}{
 		{
 			name:   "StringWithValue",
-			input:  []interface{}{"test", "styleID"},
-			expect: excelize.Cell{StyleID: styleMap["styleID"], Value: "test"},
+			input:  `["test", 1]`,
+			expect: excelize.Cell{StyleID: 2, Value: "test"},
 		},
 		{
 			name:   "StringWithFormula",
-			input:  []interface{}{"=SUM(A1:A10)", "styleID"},
-			expect: excelize.Cell{StyleID: styleMap["styleID"], Formula: "=SUM(A1:A10)"},
+			input:  `["=SUM(A1:A10)", 1]`,
+			expect: excelize.Cell{StyleID: 2, Formula: "=SUM(A1:A10)"},
 		},
 		{
 			name:   "NonString",
-			input:  []interface{}{123, "styleID"},
-			expect: excelize.Cell{StyleID: styleMap["styleID"], Value: 123},
+			input:  `[123, 1]`,
+			expect: excelize.Cell{StyleID: 2, Value: 123.0},
+		},
+		{
+			name:   "Bool",
+			input:  `[true,1]`,
+			expect: excelize.Cell{StyleID: 2, Value: true},
+		},
+		{
+			name:   "DefaultStyle",
+			input:  `[1.5]`,
+			expect: excelize.Cell{StyleID: 1, Value: 1.5},
+		},
+		{
+			name:   "UnknownStyle",
+			input:  `[1.5, 9]`,
+			expect: excelize.Cell{Value: 1.5},
 		},
 		{
 			name:   "EmptyInterface",
-			input:  []interface{}{},
-			expect: excelize.Cell{StyleID: styleMap["DEFAULT_STYLE"], Value: ""},
+			input:  `[]`,
+			expect: excelize.Cell{StyleID: 1, Value: ""},
+		},
+		{
+			name:   "PlainValue",
+			input:  `"plain"`,
+			expect: excelize.Cell{Value: "plain"},
 		},
 	}
 
 	for _, tt := range tests {
 		t.Run(tt.name, func(t *testing.T) {
-			actual := createCell(tt.input)
+			var c Cell
+			if err := json.Unmarshal([]byte(tt.input), &c); err != nil {
+				t.Fatalf("Failed to decode cell: %v", err)
+			}
+			actual := ew.createCell(&c)
 			if !reflect.DeepEqual(actual, tt.expect) {
 				t.Errorf("Expected %#v but got %#v", tt.expect, actual)
 			}
 		})
 	}
 }
+
+func TestCellUnmarshalJSON(t *testing.T) {
+	tests := []struct {
+		name   string
+		input  string
+		expect Cell
+	}{
+		{
+			name:   "EscapedString",
+			input:  `["a \"quoted\", [value]", 3]`,
+			expect: Cell{Kind: cellString, Str: `a "quoted", [value]`, Style: 3},
+		},
+		{
+			name:   "Float",
+			input:  `[ -1.5e3 , 12 ]`,
+			expect: Cell{Kind: cellNumber, Num: -1500, Style: 12},
+		},
+		{
+			name:   "NullWithStyle",
+			input:  `[null, 1]`,
+			expect: Cell{Kind: cellNull, Style: 1},
+		},
+		{
+			name:   "Null",
+			input:  `null`,
+			expect: Cell{Kind: cellNull, Style: noStyle},
+		},
+		{
+			name:   "ValueWithoutStyle",
+			input:  `[false]`,
+			expect: Cell{Kind: cellBool},
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var row Row
+			if err := json.Unmarshal([]byte("["+tt.input+"]"), &row); err != nil {
+				t.Fatalf("Failed to decode cell: %v", err)
+			}
+			if !reflect.DeepEqual(row[0], tt.expect) {
+				t.Errorf("Expected %#v but got %#v", tt.expect, row[0])
+			}
+		})
+	}
+
+	var c Cell
+	if err := json.Unmarshal([]byte(`["value" 1]`), &c); err == nil {
+		t.Error("Expected an error for an invalid cell")
+	}
+	if err := json.Unmarshal([]byte(`["value", "style1"]`), &c); err == nil {
+		t.Error("Expected an error for a style name")
+	}
+}
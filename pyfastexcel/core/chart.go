@@ -236,14 +236,10 @@ func getBorderStruct(border interface{}) excelize.ChartLine {
 	return chartBorder
 }
 
-func (ew *ExcelWriter) addChart(sheet string, charts []interface{}) {
+func (ew *ExcelWriter) addChart(sheet string, charts []ChartPayload) {
 	for _, chart := range charts {
-		chart := chart.(map[string]interface{})
-		chartData := chart["chart"].([]interface{})
-		cell := chart["cell"].(string)
 		comboCharts := []*excelize.Chart{}
-		for _, c := range chartData {
-			c := c.(map[string]interface{})
+		for _, c := range chart.Chart {
 			chartType := excelize.ChartType(uint8(c["Type"].(float64)))
 			series := getSeriesStruct(c["Series"].([]interface{}))
 			format := getFormatStruct(c["Format"])
@@ -271,7 +267,7 @@ func (ew *ExcelWriter) addChart(sheet string, charts []interface{}) {
 				HoleSize:   int(getFloat64Value(c, "HoleSize", 75.0)),
 			})
 		}
-		if err := ew.File.AddChart(sheet, cell, comboCharts[0], comboCharts[1:]...); err != nil {
+		if err := ew.File.AddChart(sheet, chart.Cell, comboCharts[0], comboCharts[1:]...); err != nil {
 			fmt.Println(err)
 		}
 	}
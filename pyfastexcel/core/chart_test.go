@@ -428,10 +428,10 @@ func TestGetTitleStruct(t *testing.T) {
 func TestAddChart(t *testing.T) {
 	file := excelize.NewFile()
 	sheet := "Sheet1"
-	charts := []interface{}{
-		map[string]interface{}{
-			"chart": []interface{}{
-				map[string]interface{}{
+	charts := []ChartPayload{
+		{
+			Chart: []map[string]interface{}{
+				{
 					"Type": 1.0,
 					"Series": []interface{}{
 						map[string]interface{}{
@@ -453,7 +453,7 @@ func TestAddChart(t *testing.T) {
 					"HoleSize":   nil,
 				},
 			},
-			"cell": "A1",
+			Cell: "A1",
 		},
 	}
 	ew := ExcelWriter{File: file}
@@ -0,0 +1,127 @@
+package core
+
+import (
+	"encoding/binary"
+	"fmt"
+	"math"
+)
+
+// The kinds of the cells of a column, see pyfastexcel/storage.py.
+const (
+	columnPad byte = iota
+	columnNone
+	columnFloat
+	columnInt
+	columnString
+	columnBool
+	columnOther
+)
+
+// Columns is the columnar form of the cells of a sheet, sent by the
+// ColumnarStorage of a WorkSheet instead of the rows.
+//
+// Notes:
+//   - Styles links the style index of the cells to the style ids of the payload,
+//     the index 0 is a plain value without style and -1 is an unknown style.
+//   - A column may be shorter than Rows, the missing cells are padding cells.
+type Columns struct {
+	Rows    int          `json:"Rows"`
+	Strings []string     `json:"Strings"`
+	Styles  []int        `json:"Styles"`
+	Cols    []ColumnData `json:"Cols"`
+}
+
+// ColumnData holds the cells of a column.
+//
+// Notes:
+//   - Kind holds a byte per cell, Num a little-endian float64 per cell and Style
+//     a little-endian uint16 per cell. Num is the value of a number or a boolean
+//     cell, and the index in Strings of a string cell.
+//   - Other holds the cells, keyed by their row index, whose value can not be
+//     kept in Num, e.g. the integers out of the float64 precision.
+type ColumnData struct {
+	Kind  []byte       `json:"Kind"`
+	Num   []byte       `json:"Num"`
+	Style []byte       `json:"Style"`
+	Other map[int]Cell `json:"Other"`
+}
+
+// rows expands the columns into the rows written by the ExcelWriter. The
+// padding cells at the end of a row are dropped.
+//
+// Panics:
+//   - panics if the buffers of a column do not have the same number of cells.
+func (c *Columns) rows() []Row {
+	width := len(c.Cols)
+	for j := range c.Cols {
+		col := &c.Cols[j]
+		n := len(col.Kind)
+		if n > c.Rows || len(col.Num) != 8*n || len(col.Style) != 2*n {
+			panic(fmt.Sprintf("malformed buffers of column %d", j))
+		}
+	}
+
+	cells := make([]Cell, c.Rows*width)
+	rows := make([]Row, c.Rows)
+	for i := range rows {
+		rows[i] = cells[i*width : (i+1)*width : (i+1)*width]
+	}
+	for j := range c.Cols {
+		col := &c.Cols[j]
+		for i, kind := range col.Kind {
+			rows[i][j] = c.cell(col, i, kind)
+		}
+	}
+	for i, row := range rows {
+		n := len(row)
+		for n > 0 && row[n-1].Kind == cellEmpty {
+			n--
+		}
+		rows[i] = row[:n]
+	}
+	return rows
+}
+
+// cell decodes the cell at the row i of a column.
+func (c *Columns) cell(col *ColumnData, i int, kind byte) Cell {
+	if kind == columnPad {
+		return Cell{Kind: cellEmpty}
+	}
+	style := c.styleID(binary.LittleEndian.Uint16(col.Style[2*i:]))
+	num := math.Float64frombits(binary.LittleEndian.Uint64(col.Num[8*i:]))
+	switch kind {
+	case columnNone:
+		return Cell{Kind: cellNull, Style: style}
+	case columnFloat, columnInt:
+		// msgspec encodes NaN and Inf as null, keep the same behavior.
+		if math.IsNaN(num) || math.IsInf(num, 0) {
+			return Cell{Kind: cellNull, Style: style}
+		}
+		return Cell{Kind: cellNumber, Num: num, Style: style}
+	case columnString:
+		index := int(num)
+		if index < 0 || index >= len(c.Strings) {
+			panic(fmt.Sprintf("string index %d out of range", index))
+		}
+		s := c.Strings[index]
+		if len(s) != 0 && s[0] == '=' {
+			return Cell{Kind: cellFormula, Str: s, Style: style}
+		}
+		return Cell{Kind: cellString, Str: s, Style: style}
+	case columnBool:
+		return Cell{Kind: cellBool, Num: num, Style: style}
+	case columnOther:
+		cell := col.Other[i]
+		cell.Style = style
+		return cell
+	}
+	panic(fmt.Sprintf("unknown cell kind %d", kind))
+}
+
+// styleID returns the style id of the payload of a style index of the columns.
+func (c *Columns) styleID(index uint16) int {
+	if index == 0 || int(index) >= len(c.Styles) || c.Styles[index] < 0 {
+		return noStyle
+	}
+	return c.Styles[index]
+}
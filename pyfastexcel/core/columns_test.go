@@ -0,0 +1,72 @@
+package core
+
+import (
+	"encoding/binary"
+	"encoding/json"
+	"math"
+	"reflect"
+	"testing"
+)
+
+// columnBuffers encodes the numbers and the style indexes of a column.
+func columnBuffers(nums []float64, styles []uint16) ([]byte, []byte) {
+	num := make([]byte, 8*len(nums))
+	for i, v := range nums {
+		binary.LittleEndian.PutUint64(num[8*i:], math.Float64bits(v))
+	}
+	style := make([]byte, 2*len(styles))
+	for i, v := range styles {
+		binary.LittleEndian.PutUint16(style[2*i:], v)
+	}
+	return num, style
+}
+
+func TestColumnsRows(t *testing.T) {
+	num0, style0 := columnBuffers([]float64{1.5, 0, 7, 1}, []uint16{1, 0, 2, 0})
+	num1, style1 := columnBuffers([]float64{0, 1, 0}, []uint16{0, 1, 2})
+	columns := map[string]interface{}{
+		"Rows":    4,
+		"Strings": []string{"a", "=SUM(A1:A2)"},
+		"Styles":  []int{-1, 3, -1},
+		"Cols": []map[string]interface{}{
+			{
+				"Kind":  []byte{columnFloat, columnNone, columnInt, columnBool},
+				"Num":   num0,
+				"Style": style0,
+				"Other": map[int]interface{}{},
+			},
+			{
+				"Kind":  []byte{columnString, columnString, columnOther},
+				"Num":   num1,
+				"Style": style1,
+				"Other": map[int]interface{}{2: 9007199254740993},
+			},
+		},
+	}
+	raw, _ := json.Marshal(map[string]interface{}{"Columns": columns})
+	var sheet Sheet
+	decodePayload(raw, &sheet)
+
+	expected := []Row{
+		{{Kind: cellNumber, Num: 1.5, Style: 3}, {Kind: cellString, Str: "a", Style: noStyle}},
+		{{Kind: cellNull, Style: noStyle}, {Kind: cellFormula, Str: "=SUM(A1:A2)", Style: 3}},
+		{{Kind: cellNumber, Num: 7, Style: noStyle}, {Kind: cellNumber, Num: 9007199254740993, Style: noStyle}},
+		{{Kind: cellBool, Num: 1, Style: noStyle}},
+	}
+	if rows := sheet.cells(); !reflect.DeepEqual(rows, expected) {
+		t.Errorf("Expected %#v but got %#v", expected, rows)
+	}
+	if sheet.Columns != nil {
+		t.Error("Expected the columns to be released")
+	}
+}
+
+func TestColumnsRowsMalformed(t *testing.T) {
+	defer func() {
+		if r := recover(); r == nil {
+			t.Error("Expected panic on malformed buffers")
+		}
+	}()
+	columns := &Columns{Rows: 1, Cols: []ColumnData{{Kind: []byte{columnFloat}}}}
+	columns.rows()
+}
@@ -0,0 +1,115 @@
+package core
+
+import (
+	"fmt"
+
+	"github.com/xuri/excelize/v2"
+)
+
+// lineStyle returns the style id of the row, or else of the column, of a cell,
+// see WorkSheet.set_row_style and WorkSheet.set_column_style in python.
+//
+// Args:
+//
+//	col (int): The 1-based column number.
+//	row (int): The 1-based row number.
+//
+// Returns:
+//
+//	int: The style id in the style list of the payload.
+//	bool: Whether the row or the column has a style.
+func (s *Sheet) lineStyle(col, row int) (int, bool) {
+	if id, ok := s.RowStyle[row]; ok {
+		return id, true
+	}
+	id, ok := s.ColStyle[col]
+	return id, ok
+}
+
+// inheritLineStyle gives the style of its row or column to a cell with the
+// DEFAULT_STYLE or without style. The cells skipped by the writers are kept.
+func (s *Sheet) inheritLineStyle(c *Cell, col, row int) {
+	if c.Style != 0 && c.Style != noStyle || c.Kind == cellNull && c.Style == noStyle {
+		return
+	}
+	if id, ok := s.lineStyle(col, row); ok {
+		c.Style = id
+	}
+}
+
+// applyLineStyles gives the styles of the rows and the columns to the cells
+// of the rows which do not have their own style.
+//
+// Args:
+//
+//	rows ([]Row): The rows to update in place.
+//	startedRow (int): The row number of the first row in rows.
+func (s *Sheet) applyLineStyles(rows []Row, startedRow int) {
+	if len(s.RowStyle) == 0 && len(s.ColStyle) == 0 {
+		return
+	}
+	for i, row := range rows {
+		for j := range row {
+			s.inheritLineStyle(&row[j], j+1, i+startedRow)
+		}
+	}
+}
+
+// applySparseLineStyles is applyLineStyles for the sparse cells.
+func (s *Sheet) applySparseLineStyles(sparse *SparseCells) {
+	if len(s.RowStyle) == 0 && len(s.ColStyle) == 0 {
+		return
+	}
+	sparse.check()
+	for i := range sparse.Cells {
+		s.inheritLineStyle(&sparse.Cells[i], sparse.Cols[i]+1, sparse.Rows[i]+1)
+	}
+}
+
+// streamLineStyles sets the styles of the columns with the StreamWriter, and
+// adds the styles of the rows to the row options.
+//
+// Args:
+//
+//	streamWriter (*excelize.StreamWriter): The StreamWriter of the sheet.
+//	sheetData (*Sheet): The settings of the sheet.
+//	rowHeightMap (map[int]excelize.RowOpts): The row options keyed by the row number.
+//
+// Notes:
+//   - The styles of the columns should be set before SetRow, like the widths.
+func (ew *ExcelWriter) streamLineStyles(
+	streamWriter *excelize.StreamWriter,
+	sheetData *Sheet,
+	rowHeightMap map[int]excelize.RowOpts,
+) {
+	for col, id := range sheetData.ColStyle {
+		if err := streamWriter.SetColStyle(col, col, ew.styleID(id)); err != nil {
+			fmt.Println(err)
+		}
+	}
+	for row, id := range sheetData.RowStyle {
+		opts := rowHeightMap[row]
+		opts.StyleID = ew.styleID(id)
+		rowHeightMap[row] = opts
+	}
+}
+
+// setLineStylesNormalWriter sets the styles of the columns and the rows with
+// the excelize.File setters.
+//
+// Notes:
+//   - The styles should be set before the cells, since excelize also applies
+//     them to the cells which exist in the columns or the rows.
+func (ew *ExcelWriter) setLineStylesNormalWriter(sheet string, sheetData *Sheet) {
+	for col, id := range sheetData.ColStyle {
+		name, _ := excelize.ColumnNumberToName(col)
+		if err := ew.File.SetColStyle(sheet, name, ew.styleID(id)); err != nil {
+			fmt.Println(err)
+		}
+	}
+	for row, id := range sheetData.RowStyle {
+		if err := ew.File.SetRowStyle(sheet, row, row, ew.styleID(id)); err != nil {
+			fmt.Println(err)
+		}
+	}
+}
@@ -0,0 +1,48 @@
+package core
+
+import (
+	"reflect"
+	"testing"
+
+	"github.com/xuri/excelize/v2"
+)
+
+func TestApplyLineStyles(t *testing.T) {
+	sheet := &Sheet{ColStyle: map[int]int{1: 2, 2: 2}, RowStyle: map[int]int{6: 3}}
+	rows := []Row{
+		{{Kind: cellNumber, Num: 1}, {Kind: cellNumber, Num: 2, Style: 1}, {Kind: cellNumber, Num: 3}},
+		{{Kind: cellNull, Style: noStyle}, {Kind: cellString, Str: "a", Style: noStyle}},
+	}
+	sheet.applyLineStyles(rows, 5)
+
+	expected := []Row{
+		{{Kind: cellNumber, Num: 1, Style: 2}, {Kind: cellNumber, Num: 2, Style: 1}, {Kind: cellNumber, Num: 3}},
+		{{Kind: cellNull, Style: noStyle}, {Kind: cellString, Str: "a", Style: 3}},
+	}
+	if !reflect.DeepEqual(rows, expected) {
+		t.Errorf("Expected %#v but got %#v", expected, rows)
+	}
+
+	sparse := &SparseCells{
+		Rows:  []int{0, 5},
+		Cols:  []int{0, 2},
+		Cells: []Cell{{Kind: cellNumber}, {Kind: cellNumber, Style: noStyle}},
+	}
+	sheet.applySparseLineStyles(sparse)
+	if sparse.Cells[0].Style != 2 || sparse.Cells[1].Style != 3 {
+		t.Errorf("Unexpected sparse styles %#v", sparse.Cells)
+	}
+}
+
+func TestStreamLineStyles(t *testing.T) {
+	ew := &ExcelWriter{File: excelize.NewFile(), styleIDs: []int{0, 5, 7}}
+	sheet := &Sheet{ColStyle: map[int]int{3: 1}, RowStyle: map[int]int{2: 2, 4: 1}}
+	streamWriter, _ := ew.File.NewStreamWriter("Sheet1")
+	rowHeightMap := getRowHeightMap(map[int]float64{2: 30})
+
+	ew.streamLineStyles(streamWriter, sheet, rowHeightMap)
+	expected := map[int]excelize.RowOpts{2: {Height: 30, StyleID: 7}, 4: {StyleID: 5}}
+	if !reflect.DeepEqual(rowHeightMap, expected) {
+		t.Errorf("Expected %v but got %v", expected, rowHeightMap)
+	}
+}
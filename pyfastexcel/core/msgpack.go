@@ -0,0 +1,790 @@
+package core
+
+import (
+	"encoding/binary"
+	"encoding/json"
+	"fmt"
+	"math"
+	"strconv"
+)
+
+// msgpackDecoder decodes the MessagePack payload sent by python.
+//
+// The cells of a sheet, its rows, sparse cells, columns and arrays, are decoded
+// directly into the typed structs, while the other parts of the payload are
+// decoded into generic values, the same as encoding/json does, and then
+// converted into the typed structs through JSON since they are tiny compared
+// to the data.
+//
+// Notes:
+//   - The raw buffers of the columns and the arrays are slices of the payload,
+//     so the decoded cells should not be kept after the call that sent it.
+type msgpackDecoder struct {
+	data []byte
+	pos  int
+}
+
+// decodeMsgpack decodes a MessagePack payload into a Payload, a Sheet or a RowBatch.
+//
+// Panics:
+//   - panics on malformed payload.
+func decodeMsgpack(data []byte, v interface{}) {
+	d := &msgpackDecoder{data: data}
+	var err error
+	switch v := v.(type) {
+	case *Payload:
+		err = d.decodePayload(v)
+	case *Sheet:
+		err = d.decodeSheet(v)
+	case *RowBatch:
+		err = d.decodeRowBatch(v)
+	default:
+		err = fmt.Errorf("unsupported msgpack target %T", v)
+	}
+	if err != nil {
+		panic(err)
+	}
+}
+
+func (d *msgpackDecoder) decodePayload(p *Payload) error {
+	n, err := d.readMapLen()
+	if err != nil {
+		return err
+	}
+	meta := make(map[string]interface{}, n)
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return err
+		}
+		if key != "content" {
+			if meta[key], err = d.readValue(); err != nil {
+				return err
+			}
+			continue
+		}
+		sheets, err := d.readMapLen()
+		if err != nil {
+			return err
+		}
+		p.Content = make(map[string]*Sheet, sheets)
+		for j := 0; j < sheets; j++ {
+			name, err := d.readKey()
+			if err != nil {
+				return err
+			}
+			sheet := &Sheet{}
+			if err := d.decodeSheet(sheet); err != nil {
+				return err
+			}
+			p.Content[name] = sheet
+		}
+	}
+	content := p.Content
+	if err := convertMeta(meta, p); err != nil {
+		return err
+	}
+	p.Content = content
+	return nil
+}
+
+func (d *msgpackDecoder) decodeSheet(s *Sheet) error {
+	n, err := d.readMapLen()
+	if err != nil {
+		return err
+	}
+	meta := make(map[string]interface{}, n)
+	var cells Sheet
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return err
+		}
+		switch key {
+		case "Data":
+			cells.Data, err = d.readRows()
+		case "Sparse":
+			cells.Sparse, err = d.readSparse()
+		case "Columns":
+			cells.Columns, err = d.readColumns()
+		case "Arrays":
+			cells.Arrays, err = d.readArrays()
+		default:
+			meta[key], err = d.readValue()
+		}
+		if err != nil {
+			return err
+		}
+	}
+	if err := convertMeta(meta, s); err != nil {
+		return err
+	}
+	s.Data, s.Sparse, s.Columns, s.Arrays = cells.Data, cells.Sparse, cells.Columns, cells.Arrays
+	return nil
+}
+
+func (d *msgpackDecoder) decodeRowBatch(b *RowBatch) error {
+	n, err := d.readMapLen()
+	if err != nil {
+		return err
+	}
+	meta := make(map[string]interface{}, n)
+	var cells RowBatch
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return err
+		}
+		switch key {
+		case "data":
+			cells.Data, err = d.readRows()
+		case "sparse":
+			cells.Sparse, err = d.readSparse()
+		case "columns":
+			cells.Columns, err = d.readColumns()
+		case "arrays":
+			cells.Arrays, err = d.readArrays()
+		default:
+			meta[key], err = d.readValue()
+		}
+		if err != nil {
+			return err
+		}
+	}
+	if err := convertMeta(meta, b); err != nil {
+		return err
+	}
+	b.Data, b.Sparse, b.Columns, b.Arrays = cells.Data, cells.Sparse, cells.Columns, cells.Arrays
+	return nil
+}
+
+// convertMeta converts the generic values decoded from MessagePack into a typed struct.
+func convertMeta(meta map[string]interface{}, v interface{}) error {
+	raw, err := json.Marshal(meta)
+	if err != nil {
+		return err
+	}
+	return json.Unmarshal(raw, v)
+}
+
+func (d *msgpackDecoder) readRows() ([]Row, error) {
+	if d.peekNil() {
+		return nil, nil
+	}
+	n, err := d.readArrayLen()
+	if err != nil {
+		return nil, err
+	}
+	rows := make([]Row, n)
+	for i := range rows {
+		if rows[i], err = d.readRow(); err != nil {
+			return nil, err
+		}
+	}
+	return rows, nil
+}
+
+func (d *msgpackDecoder) readRow() (Row, error) {
+	n, err := d.readArrayLen()
+	if err != nil {
+		return nil, err
+	}
+	row := make(Row, n)
+	for j := range row {
+		if err := d.readCell(&row[j]); err != nil {
+			return nil, err
+		}
+	}
+	return row, nil
+}
+
+// readInts reads an array of integers.
+func (d *msgpackDecoder) readInts() ([]int, error) {
+	n, err := d.readArrayLen()
+	if err != nil {
+		return nil, err
+	}
+	ints := make([]int, n)
+	for i := range ints {
+		if ints[i], err = d.readInt(); err != nil {
+			return nil, err
+		}
+	}
+	return ints, nil
+}
+
+// readInt reads an integer, or a float holding an integer like encoding/json
+// accepts for an int field.
+func (d *msgpackDecoder) readInt() (int, error) {
+	v, err := d.readNumber()
+	if err != nil {
+		return 0, err
+	}
+	if v != math.Trunc(v) {
+		return 0, fmt.Errorf("invalid integer %v", v)
+	}
+	return int(v), nil
+}
+
+// readSparse decodes the sparse cells of a sheet directly, like the rows, so
+// the cells are never converted through JSON, which rejects NaN and Inf.
+func (d *msgpackDecoder) readSparse() (*SparseCells, error) {
+	if d.peekNil() {
+		return nil, nil
+	}
+	n, err := d.readMapLen()
+	if err != nil {
+		return nil, err
+	}
+	sparse := &SparseCells{}
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return nil, err
+		}
+		switch key {
+		case "Rows":
+			sparse.Rows, err = d.readInts()
+		case "Cols":
+			sparse.Cols, err = d.readInts()
+		case "Length":
+			sparse.Length, err = d.readInt()
+		case "Cells":
+			sparse.Cells, err = d.readRow()
+		default:
+			_, err = d.readValue()
+		}
+		if err != nil {
+			return nil, err
+		}
+	}
+	return sparse, nil
+}
+
+// readArrays decodes the arrays of a sheet or a batch, see ArrayBlock. The
+// buffers are slices of the payload, neither copied nor converted through JSON.
+func (d *msgpackDecoder) readArrays() ([]ArrayBlock, error) {
+	if d.peekNil() {
+		return nil, nil
+	}
+	n, err := d.readArrayLen()
+	if err != nil {
+		return nil, err
+	}
+	arrays := make([]ArrayBlock, n)
+	for i := range arrays {
+		if err := d.readArrayBlock(&arrays[i]); err != nil {
+			return nil, err
+		}
+	}
+	return arrays, nil
+}
+
+func (d *msgpackDecoder) readArrayBlock(b *ArrayBlock) error {
+	n, err := d.readMapLen()
+	if err != nil {
+		return err
+	}
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return err
+		}
+		switch key {
+		case "Row":
+			b.Row, err = d.readInt()
+		case "Col":
+			b.Col, err = d.readInt()
+		case "Rows":
+			b.Rows, err = d.readInt()
+		case "Cols":
+			b.Cols, err = d.readInt()
+		case "Dtype":
+			var dtype []byte
+			dtype, err = d.readBytes()
+			b.Dtype = string(dtype)
+		case "Data":
+			b.Data, err = d.readBytes()
+		case "Style":
+			b.Style, err = d.readInt()
+		case "Strings":
+			b.Strings, err = d.readStrings()
+		case "StyleRules":
+			b.StyleRules, err = d.readStyleRules()
+		default:
+			_, err = d.readValue()
+		}
+		if err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// readStyleRules reads the style rules of an array, see StyleRule.
+func (d *msgpackDecoder) readStyleRules() ([]StyleRule, error) {
+	if d.peekNil() {
+		return nil, nil
+	}
+	n, err := d.readArrayLen()
+	if err != nil {
+		return nil, err
+	}
+	rules := make([]StyleRule, n)
+	for i := range rules {
+		ints, err := d.readInts()
+		if err != nil {
+			return nil, err
+		}
+		if len(ints) != len(rules[i]) {
+			return nil, fmt.Errorf("invalid style rule %v", ints)
+		}
+		copy(rules[i][:], ints)
+	}
+	return rules, nil
+}
+
+// readColumns decodes the columns of a sheet or a batch, see Columns. Like
+// the arrays, the buffers of the columns are slices of the payload.
+func (d *msgpackDecoder) readColumns() (*Columns, error) {
+	if d.peekNil() {
+		return nil, nil
+	}
+	n, err := d.readMapLen()
+	if err != nil {
+		return nil, err
+	}
+	columns := &Columns{}
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return nil, err
+		}
+		switch key {
+		case "Rows":
+			columns.Rows, err = d.readInt()
+		case "Strings":
+			columns.Strings, err = d.readStrings()
+		case "Styles":
+			columns.Styles, err = d.readInts()
+		case "Cols":
+			var cols int
+			if cols, err = d.readArrayLen(); err != nil {
+				return nil, err
+			}
+			columns.Cols = make([]ColumnData, cols)
+			for j := range columns.Cols {
+				if err = d.readColumnData(&columns.Cols[j]); err != nil {
+					break
+				}
+			}
+		default:
+			_, err = d.readValue()
+		}
+		if err != nil {
+			return nil, err
+		}
+	}
+	return columns, nil
+}
+
+func (d *msgpackDecoder) readColumnData(c *ColumnData) error {
+	n, err := d.readMapLen()
+	if err != nil {
+		return err
+	}
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return err
+		}
+		switch key {
+		case "Kind":
+			c.Kind, err = d.readBytes()
+		case "Num":
+			c.Num, err = d.readBytes()
+		case "Style":
+			c.Style, err = d.readBytes()
+		case "Other":
+			c.Other, err = d.readOther()
+		default:
+			_, err = d.readValue()
+		}
+		if err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// readOther decodes the cells of a column keyed by their row index.
+func (d *msgpackDecoder) readOther() (map[int]Cell, error) {
+	if d.peekNil() {
+		return nil, nil
+	}
+	n, err := d.readMapLen()
+	if err != nil {
+		return nil, err
+	}
+	other := make(map[int]Cell, n)
+	for i := 0; i < n; i++ {
+		row, err := d.readInt()
+		if err != nil {
+			return nil, err
+		}
+		var c Cell
+		if err := d.readCell(&c); err != nil {
+			return nil, err
+		}
+		other[row] = c
+	}
+	return other, nil
+}
+
+// readStrings reads an array of strings.
+func (d *msgpackDecoder) readStrings() ([]string, error) {
+	if d.peekNil() {
+		return nil, nil
+	}
+	n, err := d.readArrayLen()
+	if err != nil {
+		return nil, err
+	}
+	strings := make([]string, n)
+	for i := range strings {
+		s, err := d.readBytes()
+		if err != nil {
+			return nil, err
+		}
+		strings[i] = string(s)
+	}
+	return strings, nil
+}
+
+// readCell decodes a cell, see Cell.UnmarshalJSON for the accepted forms.
+func (d *msgpackDecoder) readCell(c *Cell) error {
+	if d.pos >= len(d.data) {
+		return errUnexpectedEnd
+	}
+	b := d.data[d.pos]
+	if !(b >= 0x90 && b <= 0x9f) && b != 0xdc && b != 0xdd {
+		// Plain value without style
+		if err := d.readCellValue(c); err != nil {
+			return err
+		}
+		c.Style = noStyle
+		return nil
+	}
+	n, err := d.readArrayLen()
+	if err != nil {
+		return err
+	}
+	if n == 0 {
+		*c = Cell{Kind: cellEmpty}
+		return nil
+	}
+	if err := d.readCellValue(c); err != nil {
+		return err
+	}
+	if n > 1 && !d.peekNil() {
+		style, err := d.readNumber()
+		if err != nil {
+			return fmt.Errorf("invalid style id: %w", err)
+		}
+		c.Style = int(style)
+	}
+	// Skip any unexpected trailing element
+	for i := 2; i < n; i++ {
+		if _, err := d.readValue(); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// readCellValue decodes the value of a cell by its type byte, without boxing
+// it, like Cell.setValue does for JSON.
+func (d *msgpackDecoder) readCellValue(c *Cell) error {
+	*c = Cell{}
+	if d.pos >= len(d.data) {
+		return errUnexpectedEnd
+	}
+	b := d.data[d.pos]
+	switch {
+	case b == 0x91:
+		// The [index] of a pooled string
+		d.pos++
+		index, err := d.readNumber()
+		if err != nil {
+			return fmt.Errorf("invalid string index: %w", err)
+		}
+		c.Kind = cellPooled
+		c.Num = index
+	case isNumber(b):
+		v, err := d.readNumber()
+		if err != nil {
+			return err
+		}
+		// msgspec encodes NaN and Inf as null in JSON, keep the same behavior.
+		if math.IsNaN(v) || math.IsInf(v, 0) {
+			c.Kind = cellNull
+			break
+		}
+		c.Kind = cellNumber
+		c.Num = v
+	case b >= 0xa0 && b <= 0xbf, b == 0xd9, b == 0xda, b == 0xdb:
+		v, err := d.readBytes()
+		if err != nil {
+			return err
+		}
+		c.Kind = cellString
+		c.Str = string(v)
+		if len(v) != 0 && v[0] == '=' {
+			c.Kind = cellFormula
+		}
+	case b == 0xc0:
+		d.pos++
+		c.Kind = cellNull
+	case b == 0xc2, b == 0xc3:
+		d.pos++
+		c.Kind = cellBool
+		if b == 0xc3 {
+			c.Num = 1
+		}
+	default:
+		return fmt.Errorf("unsupported cell value of msgpack type 0x%02x", b)
+	}
+	return nil
+}
+
+var errUnexpectedEnd = fmt.Errorf("unexpected end of msgpack payload")
+
+func (d *msgpackDecoder) next(n int) ([]byte, error) {
+	if n < 0 || d.pos+n > len(d.data) {
+		return nil, errUnexpectedEnd
+	}
+	b := d.data[d.pos : d.pos+n]
+	d.pos += n
+	return b, nil
+}
+
+func (d *msgpackDecoder) peekNil() bool {
+	if d.pos < len(d.data) && d.data[d.pos] == 0xc0 {
+		d.pos++
+		return true
+	}
+	return false
+}
+
+// readLen reads a big-endian length of the given size in bytes.
+func (d *msgpackDecoder) readLen(size int) (int, error) {
+	b, err := d.next(size)
+	if err != nil {
+		return 0, err
+	}
+	switch size {
+	case 1:
+		return int(b[0]), nil
+	case 2:
+		return int(binary.BigEndian.Uint16(b)), nil
+	default:
+		return int(binary.BigEndian.Uint32(b)), nil
+	}
+}
+
+func (d *msgpackDecoder) readArrayLen() (int, error) {
+	b, err := d.next(1)
+	if err != nil {
+		return 0, err
+	}
+	switch {
+	case b[0] >= 0x90 && b[0] <= 0x9f:
+		return int(b[0] & 0x0f), nil
+	case b[0] == 0xdc:
+		return d.readLen(2)
+	case b[0] == 0xdd:
+		return d.readLen(4)
+	}
+	return 0, fmt.Errorf("expected msgpack array, got 0x%02x", b[0])
+}
+
+func (d *msgpackDecoder) readMapLen() (int, error) {
+	b, err := d.next(1)
+	if err != nil {
+		return 0, err
+	}
+	switch {
+	case b[0] >= 0x80 && b[0] <= 0x8f:
+		return int(b[0] & 0x0f), nil
+	case b[0] == 0xde:
+		return d.readLen(2)
+	case b[0] == 0xdf:
+		return d.readLen(4)
+	}
+	return 0, fmt.Errorf("expected msgpack map, got 0x%02x", b[0])
+}
+
+// readBytes reads the content of a str or bin value without copying it.
+func (d *msgpackDecoder) readBytes() ([]byte, error) {
+	b, err := d.next(1)
+	if err != nil {
+		return nil, err
+	}
+	var n int
+	switch {
+	case b[0] >= 0xa0 && b[0] <= 0xbf:
+		n = int(b[0] & 0x1f)
+	case b[0] == 0xd9 || b[0] == 0xc4:
+		n, err = d.readLen(1)
+	case b[0] == 0xda || b[0] == 0xc5:
+		n, err = d.readLen(2)
+	case b[0] == 0xdb || b[0] == 0xc6:
+		n, err = d.readLen(4)
+	default:
+		return nil, fmt.Errorf("expected msgpack string, got 0x%02x", b[0])
+	}
+	if err != nil {
+		return nil, err
+	}
+	return d.next(n)
+}
+
+// readKey reads a map key. Python dict keys may be integers, e.g. the column
+// index of the widths, which are converted to strings like encoding/json does.
+func (d *msgpackDecoder) readKey() (string, error) {
+	v, err := d.readValue()
+	if err != nil {
+		return "", err
+	}
+	switch v := v.(type) {
+	case string:
+		return v, nil
+	case float64:
+		return strconv.FormatFloat(v, 'f', -1, 64), nil
+	}
+	return "", fmt.Errorf("unsupported msgpack map key %T", v)
+}
+
+// readValue reads any value into the same generic types as encoding/json:
+// nil, bool, float64, string, []interface{} and map[string]interface{}.
+// bin values are returned as []byte.
+func (d *msgpackDecoder) readValue() (interface{}, error) {
+	if d.pos >= len(d.data) {
+		return nil, errUnexpectedEnd
+	}
+	b := d.data[d.pos]
+	switch {
+	case isNumber(b):
+		return d.readNumber()
+	case b >= 0x80 && b <= 0x8f, b == 0xde, b == 0xdf:
+		return d.readMap()
+	case b >= 0x90 && b <= 0x9f, b == 0xdc, b == 0xdd:
+		return d.readArray()
+	case b >= 0xa0 && b <= 0xbf, b == 0xd9, b == 0xda, b == 0xdb:
+		s, err := d.readBytes()
+		return string(s), err
+	case b == 0xc4, b == 0xc5, b == 0xc6:
+		s, err := d.readBytes()
+		return append([]byte(nil), s...), err
+	}
+
+	d.pos++
+	switch b {
+	case 0xc0:
+		return nil, nil
+	case 0xc2:
+		return false, nil
+	case 0xc3:
+		return true, nil
+	}
+	return nil, fmt.Errorf("unsupported msgpack type 0x%02x", b)
+}
+
+// isNumber reports whether a type byte starts an integer or a float.
+func isNumber(b byte) bool {
+	return b <= 0x7f || b >= 0xe0 || b >= 0xca && b <= 0xd3
+}
+
+// readNumber reads an integer or a float into a float64, like encoding/json,
+// without boxing it.
+func (d *msgpackDecoder) readNumber() (float64, error) {
+	b, err := d.next(1)
+	if err != nil {
+		return 0, err
+	}
+	switch {
+	case b[0] <= 0x7f:
+		return float64(b[0]), nil
+	case b[0] >= 0xe0:
+		return float64(int8(b[0])), nil
+	case b[0] == 0xca:
+		v, err := d.next(4)
+		if err != nil {
+			return 0, err
+		}
+		return float64(math.Float32frombits(binary.BigEndian.Uint32(v))), nil
+	case b[0] == 0xcb:
+		v, err := d.next(8)
+		if err != nil {
+			return 0, err
+		}
+		return math.Float64frombits(binary.BigEndian.Uint64(v)), nil
+	case b[0] >= 0xcc && b[0] <= 0xcf:
+		v, err := d.next(1 << (b[0] - 0xcc))
+		if err != nil {
+			return 0, err
+		}
+		return float64(readUint(v)), nil
+	case b[0] >= 0xd0 && b[0] <= 0xd3:
+		size := 1 << (b[0] - 0xd0)
+		v, err := d.next(size)
+		if err != nil {
+			return 0, err
+		}
+		// Sign-extend the big-endian integer
+		shift := 64 - 8*uint(size)
+		return float64(int64(readUint(v)<<shift) >> shift), nil
+	}
+	d.pos--
+	return 0, fmt.Errorf("expected msgpack number, got 0x%02x", b[0])
+}
+
+func readUint(b []byte) uint64 {
+	var v uint64
+	for _, c := range b {
+		v = v<<8 | uint64(c)
+	}
+	return v
+}
+
+func (d *msgpackDecoder) readArray() ([]interface{}, error) {
+	n, err := d.readArrayLen()
+	if err != nil {
+		return nil, err
+	}
+	arr := make([]interface{}, n)
+	for i := range arr {
+		if arr[i], err = d.readValue(); err != nil {
+			return nil, err
+		}
+	}
+	return arr, nil
+}
+
+func (d *msgpackDecoder) readMap() (map[string]interface{}, error) {
+	n, err := d.readMapLen()
+	if err != nil {
+		return nil, err
+	}
+	m := make(map[string]interface{}, n)
+	for i := 0; i < n; i++ {
+		key, err := d.readKey()
+		if err != nil {
+			return nil, err
+		}
+		if m[key], err = d.readValue(); err != nil {
+			return nil, err
+		}
+	}
+	return m, nil
+}
@@ -0,0 +1,202 @@
+package core
+
+import (
+	"encoding/base64"
+	"reflect"
+	"testing"
+
+	"github.com/xuri/excelize/v2"
+)
+
+// msgpackFixtureJSON is the JSON payload encoded by msgspec.json.
+const msgpackFixtureJSON = `{"content":{"Sheet1":{"Data":[[[1,1],[-1,1],[200,1],[-100],[70000,1],[-70000,1],[1099511627776,1],[-1099511627776,1],[9223372036854775808,1]],[[1.5,1],[true],[false,1],[null,1],["=SUM(A1:A2)"],[],["xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx",1],["yyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyy"],["z",300]]],"MergeCells":[["A1","B2"]],"Width":{"1":25,"2":12.5},"Height":{"3":30},"AutoFilter":["A1:C1"],"Panes":{},"DataValidation":[],"NoStyle":false,"Comment":[],"GroupedRow":[],"GroupedCol":[],"Table":[{"range":"A1:B2","name":"T","style_name":"","show_first_column":true,"show_last_column":false,"show_row_stripes":true,"show_column_stripes":false}],"Chart":[],"PivotTable":[],"SheetVisible":true,"WriterEngine":"StreamWriter"},"Plain":{"Data":[["a",1,null,["b",1]]],"NoStyle":true,"SheetVisible":false,"WriterEngine":"NormalWriter"}},"file_props":{"Title":"t"},"style":[{"Font":{},"CustomNumFmt":"general"},{"Font":{"Bold":true,"Size":11},"CustomNumFmt":"general"}],"protection":{},"sheet_order":["Sheet1","Plain"]}`
+
+// msgpackFixture is the same payload encoded by msgspec.msgpack, in base64.
+const msgpackFixture = "" +
+	"hadjb250ZW50gqZTaGVldDHeABCkRGF0YZKZkgEBkv8BkszIAZHQnJLOAAERcAGS0v/+7pABks8AAAEAAAAAAAGS0////wAA" +
+	"AAAAAZLPgAAAAAAAAAABmZLLP/gAAAAAAAABkcOSwgGSwAGRqz1TVU0oQTE6QTIpkJLZKHh4eHh4eHh4eHh4eHh4eHh4eHh4" +
+	"eHh4eHh4eHh4eHh4eHh4eHh4eHgBkdoBLHl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5" +
+	"eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5" +
+	"eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5" +
+	"eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5" +
+	"eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eXl5eZKhes0BLKpNZXJnZUNlbGxzkZKiQTGiQjKlV2lkdGiCARkC" +
+	"y0ApAAAAAAAApkhlaWdodIEDHqpBdXRvRmlsdGVykaVBMTpDMaVQYW5lc4CuRGF0YVZhbGlkYXRpb26Qp05vU3R5bGXCp0Nv" +
+	"bW1lbnSQqkdyb3VwZWRSb3eQqkdyb3VwZWRDb2yQpVRhYmxlkYelcmFuZ2WlQTE6QjKkbmFtZaFUqnN0eWxlX25hbWWgsXNo" +
+	"b3dfZmlyc3RfY29sdW1uw7BzaG93X2xhc3RfY29sdW1uwrBzaG93X3Jvd19zdHJpcGVzw7NzaG93X2NvbHVtbl9zdHJpcGVz" +
+	"wqVDaGFydJCqUGl2b3RUYWJsZZCsU2hlZXRWaXNpYmxlw6xXcml0ZXJFbmdpbmWsU3RyZWFtV3JpdGVypVBsYWluhKREYXRh" +
+	"kZShYQHAkqFiAadOb1N0eWxlw6xTaGVldFZpc2libGXCrFdyaXRlckVuZ2luZaxOb3JtYWxXcml0ZXKqZmlsZV9wcm9wc4Gl" +
+	"VGl0bGWhdKVzdHlsZZKCpEZvbnSArEN1c3RvbU51bUZtdKdnZW5lcmFsgqRGb250gqRCb2xkw6RTaXplC6xDdXN0b21OdW1G" +
+	"bXSnZ2VuZXJhbKpwcm90ZWN0aW9ugKtzaGVldF9vcmRlcpKmU2hlZXQxpVBsYWlu"
+
+func TestDecodeMsgpackPayload(t *testing.T) {
+	raw, err := base64.StdEncoding.DecodeString(msgpackFixture)
+	if err != nil {
+		t.Fatalf("Failed to decode fixture: %v", err)
+	}
+
+	var expected, actual Payload
+	decodePayload([]byte(msgpackFixtureJSON), &expected)
+	decodePayload(raw, &actual)
+	if !reflect.DeepEqual(expected, actual) {
+		t.Errorf("Expected %#v but got %#v", expected, actual)
+	}
+	if actual.Content["Sheet1"].Width[2] != 12.5 {
+		t.Errorf("Expected width 12.5 but got %v", actual.Content["Sheet1"].Width[2])
+	}
+	if actual.Content["Sheet1"].Data[0][8].Num != 9223372036854775808 {
+		t.Errorf("Unexpected uint64 value %v", actual.Content["Sheet1"].Data[0][8].Num)
+	}
+	styles := []int{
+		actual.Content["Sheet1"].Data[0][0].Style,
+		actual.Content["Sheet1"].Data[0][3].Style,
+		actual.Content["Sheet1"].Data[1][8].Style,
+		actual.Content["Plain"].Data[0][0].Style,
+	}
+	if !reflect.DeepEqual(styles, []int{1, 0, 300, noStyle}) {
+		t.Errorf("Unexpected style ids %v", styles)
+	}
+}
+
+func TestDecodeMsgpackRowBatch(t *testing.T) {
+	// {"style": [], "data": [[[1.5, 2], [], nan, ["s"]]]}
+	raw := []byte{
+		0x82,
+		0xa5, 's', 't', 'y', 'l', 'e', 0x90,
+		0xa4, 'd', 'a', 't', 'a', 0x91, 0x94,
+		0x92, 0xcb, 0x3f, 0xf8, 0, 0, 0, 0, 0, 0, 0x02,
+		0x90,
+		0xcb, 0x7f, 0xf8, 0, 0, 0, 0, 0, 1,
+		0x91, 0xa1, 's',
+	}
+	var batch RowBatch
+	decodePayload(raw, &batch)
+	expected := Row{
+		{Kind: cellNumber, Num: 1.5, Style: 2},
+		{Kind: cellEmpty},
+		{Kind: cellNull, Style: noStyle},
+		{Kind: cellString, Str: "s"},
+	}
+	if len(batch.Data) != 1 || !reflect.DeepEqual(batch.Data[0], expected) {
+		t.Errorf("Expected %#v but got %#v", expected, batch.Data)
+	}
+}
+
+func TestDecodeMsgpackCellsWithoutBoxing(t *testing.T) {
+	// [[[1.5, 300], -70000, true, null, [[7]]]]
+	raw := []byte{
+		0x91, 0x95,
+		0x92, 0xcb, 0x3f, 0xf8, 0, 0, 0, 0, 0, 0, 0xcd, 0x01, 0x2c,
+		0xd2, 0xff, 0xfe, 0xee, 0x90,
+		0xc3,
+		0xc0,
+		0x91, 0x91, 0x07,
+	}
+	expected := Row{
+		{Kind: cellNumber, Num: 1.5, Style: 300},
+		{Kind: cellNumber, Num: -70000, Style: noStyle},
+		{Kind: cellBool, Num: 1, Style: noStyle},
+		{Kind: cellNull, Style: noStyle},
+		{Kind: cellPooled, Num: 7},
+	}
+	var rows []Row
+	// Only the slices of the rows and of the row are allocated.
+	allocs := testing.AllocsPerRun(10, func() {
+		var err error
+		if rows, err = (&msgpackDecoder{data: raw}).readRows(); err != nil {
+			t.Fatal(err)
+		}
+	})
+	if len(rows) != 1 || !reflect.DeepEqual(rows[0], expected) {
+		t.Errorf("Expected %#v but got %#v", expected, rows)
+	}
+	if allocs > 2 {
+		t.Errorf("Expected 2 allocations but got %v", allocs)
+	}
+}
+
+func TestDecodeMsgpackSparse(t *testing.T) {
+	// {"Sparse": {"Rows": [0, 2], "Cols": [1, 0], "Cells": [nan, [1.5, 2]], "Length": 4},
+	//  "WriterEngine": "StreamWriter"}
+	raw := []byte{
+		0x82,
+		0xa6, 'S', 'p', 'a', 'r', 's', 'e', 0x84,
+		0xa4, 'R', 'o', 'w', 's', 0x92, 0x00, 0x02,
+		0xa4, 'C', 'o', 'l', 's', 0x92, 0x01, 0x00,
+		0xa5, 'C', 'e', 'l', 'l', 's', 0x92,
+		0xcb, 0x7f, 0xf8, 0, 0, 0, 0, 0, 0,
+		0x92, 0xcb, 0x3f, 0xf8, 0, 0, 0, 0, 0, 0, 0x02,
+		0xa6, 'L', 'e', 'n', 'g', 't', 'h', 0x04,
+		0xac, 'W', 'r', 'i', 't', 'e', 'r', 'E', 'n', 'g', 'i', 'n', 'e',
+		0xac, 'S', 't', 'r', 'e', 'a', 'm', 'W', 'r', 'i', 't', 'e', 'r',
+	}
+	var sheet Sheet
+	decodePayload(raw, &sheet)
+	expected := &SparseCells{
+		Rows:   []int{0, 2},
+		Cols:   []int{1, 0},
+		Cells:  []Cell{{Kind: cellNull, Style: noStyle}, {Kind: cellNumber, Num: 1.5, Style: 2}},
+		Length: 4,
+	}
+	if !reflect.DeepEqual(sheet.Sparse, expected) || sheet.WriterEngine != "StreamWriter" {
+		t.Errorf("Expected %#v but got %#v", expected, sheet.Sparse)
+	}
+
+	// The NaN cell is written as an empty cell instead of failing the export.
+	ew := &ExcelWriter{File: excelize.NewFile()}
+	streamWriter, rowHeightMap := ew.prepareStreamWrite("Sheet1", &sheet)
+	ew.streamSparse(streamWriter, sheet.sparseCells(), rowHeightMap)
+
+	// The sparse cells of a RowBatch are decoded the same way.
+	batchRaw := append([]byte{0x81, 0xa6, 's', 'p', 'a', 'r', 's', 'e'}, raw[8:60]...)
+	var batch RowBatch
+	decodePayload(batchRaw, &batch)
+	if !reflect.DeepEqual(batch.Sparse, expected) {
+		t.Errorf("Expected %#v but got %#v", expected, batch.Sparse)
+	}
+}
+
+func TestDecodeMsgpackBuffers(t *testing.T) {
+	// A batch with columns and a cat array, encoded by msgspec.json and by
+	// msgspec.msgpack in base64.
+	const batchJSON = `{"style":[],"data":[[[1.5,2]]],"columns":{"Rows":2,"Strings":["s"],"Styles":[-1,3],` +
+		`"Cols":[{"Kind":"BAY=","Num":"AAAAAAAAAAAAAAAAAAAAAA==","Style":"AQAAAA==","Other":{"1":"o"}}]},` +
+		`"arrays":[{"Row":1,"Col":0,"Rows":1,"Cols":2,"Dtype":"cat","Data":"AAAAAP////8=","Style":-1,"Strings":["x"]}]}`
+	raw, err := base64.StdEncoding.DecodeString("" +
+		"hKVzdHlsZZCkZGF0YZGRkss/+AAAAAAAAAKnY29sdW1uc4SkUm93cwKnU3RyaW5nc5Ghc6ZTdHlsZXOS/wOkQ29sc5GEpEtp" +
+		"bmTEAgQGo051bcQQAAAAAAAAAAAAAAAAAAAAAKVTdHlsZcQEAQAAAKVPdGhlcoEBoW+mYXJyYXlzkYijUm93AaNDb2wApFJv" +
+		"d3MBpENvbHMCpUR0eXBlo2NhdKREYXRhxAgAAAAA/////6VTdHlsZf+nU3RyaW5nc5GheA==")
+	if err != nil {
+		t.Fatalf("Failed to decode fixture: %v", err)
+	}
+
+	var expected, actual RowBatch
+	decodePayload([]byte(batchJSON), &expected)
+	decodePayload(raw, &actual)
+	if !reflect.DeepEqual(expected, actual) {
+		t.Errorf("Expected %#v but got %#v", expected, actual)
+	}
+	// The buffers are slices of the payload instead of copies.
+	inPayload := func(b []byte) bool {
+		before := string(raw)
+		b[0]++
+		defer func() { b[0]-- }()
+		return string(raw) != before
+	}
+	col := actual.Columns.Cols[0]
+	for _, b := range [][]byte{col.Kind, col.Num, col.Style, actual.Arrays[0].Data} {
+		if !inPayload(b) {
+			t.Errorf("Expected the buffer %v to be a slice of the payload", b)
+		}
+	}
+}
+
+func TestDecodeMsgpackMalformed(t *testing.T) {
+	raw, _ := base64.StdEncoding.DecodeString(msgpackFixture)
+	defer func() {
+		if r := recover(); r == nil {
+			t.Error("Expected panic on a truncated payload")
+		}
+	}()
+	var payload Payload
+	decodePayload(raw[:len(raw)/2], &payload)
+}
@@ -0,0 +1,141 @@
+package core
+
+import (
+	"encoding/json"
+)
+
+// Payload is the typed form of the workbook payload sent by python.
+//
+// Notes:
+//   - Style is indexed by the style ids referenced by the cells, the DEFAULT_STYLE
+//     always takes the id 0.
+//   - Strings is the string pool indexed by the pooled string cells of every sheet.
+type Payload struct {
+	Style      []StyleSetting         `json:"style"`
+	Strings    []string               `json:"strings"`
+	Content    map[string]*Sheet      `json:"content"`
+	FileProps  map[string]interface{} `json:"file_props"`
+	Protection map[string]interface{} `json:"protection"`
+	SheetOrder []string               `json:"sheet_order"`
+	Parallel   bool                   `json:"parallel"`
+}
+
+// Sheet is the typed form of a sheet payload, see WorkSheet._transfer_to_dict in python.
+//
+// Notes:
+//   - The cells, the dimensions, the merged cells and the tables are decoded into
+//     concrete types. The settings that are written once per sheet (charts options,
+//     panes, data validations, comments, groups and pivot tables) keep their generic
+//     form, since they are tiny compared to the data.
+type Sheet struct {
+	Data           []Row                  `json:"Data"`
+	Columns        *Columns               `json:"Columns"`
+	Sparse         *SparseCells           `json:"Sparse"`
+	Arrays         []ArrayBlock           `json:"Arrays"`
+	MergeCells     [][2]string            `json:"MergeCells"`
+	Width          map[int]float64        `json:"Width"`
+	Height         map[int]float64        `json:"Height"`
+	ColStyle       map[int]int            `json:"ColStyle"`
+	RowStyle       map[int]int            `json:"RowStyle"`
+	StyleRules     []StyleRule            `json:"StyleRules"`
+	AutoFilter     []string               `json:"AutoFilter"`
+	Panes          map[string]interface{} `json:"Panes"`
+	DataValidation []interface{}          `json:"DataValidation"`
+	NoStyle        bool                   `json:"NoStyle"`
+	Comment        []interface{}          `json:"Comment"`
+	GroupedRow     []interface{}          `json:"GroupedRow"`
+	GroupedCol     []interface{}          `json:"GroupedCol"`
+	Table          []Table                `json:"Table"`
+	Chart          []ChartPayload         `json:"Chart"`
+	PivotTable     []interface{}          `json:"PivotTable"`
+	SheetVisible   bool                   `json:"SheetVisible"`
+	WriterEngine   string                 `json:"WriterEngine"`
+	// Style holds the new styles sent with the settings of a sheet opened in
+	// a Session, like the styles of a RowBatch.
+	Style []StyleSetting `json:"Style"`
+}
+
+// cells returns the rows of the sheet, expanded from the Columns if the sheet
+// was sent by a ColumnarStorage, styled by the StyleRules, with the cells of
+// the Arrays and the styles of the rows and the columns, and releases the
+// Columns and the Arrays.
+func (s *Sheet) cells() []Row {
+	if s.Columns != nil {
+		s.Data = s.Columns.rows()
+		s.Columns = nil
+	}
+	s.applyStyleRules(s.Data)
+	if len(s.Arrays) != 0 {
+		s.Data = applyArrays(s.Data, s.Arrays)
+		s.Arrays = nil
+	}
+	s.applyLineStyles(s.Data, 1)
+	return s.Data
+}
+
+// sparseCells returns the sparse cells of the sheet styled by the StyleRules,
+// with the cells of the Arrays and the styles of the rows and the columns, and
+// releases the Arrays.
+func (s *Sheet) sparseCells() *SparseCells {
+	s.applySparseStyleRules(s.Sparse)
+	s.Sparse.addArrays(s.Arrays)
+	s.Arrays = nil
+	s.applySparseLineStyles(s.Sparse)
+	return s.Sparse
+}
+
+// Table is the typed form of a table payload.
+type Table struct {
+	Range             string `json:"range"`
+	Name              string `json:"name"`
+	StyleName         string `json:"style_name"`
+	ShowFirstColumn   bool   `json:"show_first_column"`
+	ShowLastColumn    bool   `json:"show_last_column"`
+	ShowRowStripes    bool   `json:"show_row_stripes"`
+	ShowColumnStripes bool   `json:"show_column_stripes"`
+}
+
+// ChartPayload is a chart, or a combo chart, anchored at a cell.
+type ChartPayload struct {
+	Cell  string                   `json:"cell"`
+	Chart []map[string]interface{} `json:"chart"`
+}
+
+// RowBatch is a batch of rows appended to an opened sheet of a Session, with
+// the styles that are used by the rows for the first time. The new styles
+// continue the style ids of the styles sent previously.
+//
+// Notes:
+//   - The Row of the arrays is relative to the first row of the batch.
+//   - Columns or Sparse are sent instead of the Data by a ColumnarStorage or
+//     a SparseStorage, like in a Sheet, and are styled by the StyleRules of
+//     the sheet. Their rows are relative to the first row of the batch.
+//   - Strings holds the strings added to the string pool of the Session, which
+//     continue the indexes of the strings sent previously.
+type RowBatch struct {
+	Style   []StyleSetting `json:"style"`
+	Strings []string       `json:"strings"`
+	Data    []Row          `json:"data"`
+	Columns *Columns       `json:"columns"`
+	Sparse  *SparseCells   `json:"sparse"`
+	Arrays  []ArrayBlock   `json:"arrays"`
+}
+
+// decodePayload unmarshals a payload sent by python into v, which should be a
+// *Payload, a *Sheet or a *RowBatch.
+//
+// Notes:
+//   - The payload is either JSON or MessagePack. Since the payload is always a map,
+//     a JSON payload starts with "{" while a MessagePack one starts with a map header.
+//
+// Panics:
+//   - panics on errors during unmarshalling.
+func decodePayload(data []byte, v interface{}) {
+	if len(data) != 0 && data[0] != '{' && data[0] > ' ' {
+		decodeMsgpack(data, v)
+		return
+	}
+	if err := json.Unmarshal(data, v); err != nil {
+		panic(err)
+	}
+}
@@ -0,0 +1,277 @@
+package core
+
+import (
+	"fmt"
+	"sync"
+
+	"github.com/xuri/excelize/v2"
+)
+
+// Session keeps an Excel file open across several calls, so a workbook can be
+// sent sheet by sheet and batch by batch instead of in a single payload.
+//
+// A sheet is opened with its settings, receives any number of row batches and
+// is closed before the next sheet is opened. Only one sheet is written at a time
+// and a closed sheet can not be written again. A Session must not be used by
+// several goroutines at the same time.
+type Session struct {
+	writer       *ExcelWriter
+	sheetCount   int
+	sheet        string
+	sheetData    *Sheet
+	streamWriter *excelize.StreamWriter
+	rowHeightMap map[int]excelize.RowOpts
+	nextRow      int
+	writtenSheet map[string]bool
+	pivotTables  [][]interface{}
+	// strings is the string pool of the session, see RowBatch.
+	strings []string
+}
+
+var (
+	sessions      = make(map[int64]*Session)
+	sessionMutex  sync.Mutex
+	lastSessionID int64
+)
+
+// NewSession creates a session and registers it in the session registry.
+//
+// Args:
+//
+//	data ([]byte): JSON data containing the "style", "file_props" and "protection" of the workbook.
+//
+// Returns:
+//
+//	int64: The id of the session, which is used to retrieve it with GetSession.
+//
+// Panics:
+//   - panics on errors during JSON unmarshalling or style creation.
+func NewSession(data []byte) int64 {
+	var payload Payload
+	decodePayload(data, &payload)
+	writer := &ExcelWriter{
+		File:       excelize.NewFile(),
+		FileProps:  payload.FileProps,
+		Protection: payload.Protection,
+	}
+	writer.addStyles(payload.Style)
+	writer.setFileProps(writer.FileProps)
+	if len(writer.Protection) != 0 {
+		writer.setProtection(writer.Protection)
+	}
+
+	session := &Session{writer: writer, writtenSheet: make(map[string]bool)}
+	sessionMutex.Lock()
+	defer sessionMutex.Unlock()
+	lastSessionID++
+	sessions[lastSessionID] = session
+	return lastSessionID
+}
+
+// GetSession returns the session registered with the given id.
+//
+// Panics:
+//   - panics if the session does not exist or has been closed.
+func GetSession(id int64) *Session {
+	sessionMutex.Lock()
+	defer sessionMutex.Unlock()
+	session, ok := sessions[id]
+	if !ok {
+		panic(fmt.Sprintf("session %d does not exist", id))
+	}
+	return session
+}
+
+// CloseSession closes the Excel file of a session and removes it from the
+// session registry. Closing an unknown session is a no-op.
+func CloseSession(id int64) {
+	sessionMutex.Lock()
+	session, ok := sessions[id]
+	delete(sessions, id)
+	sessionMutex.Unlock()
+	if ok {
+		session.writer.File.Close()
+	}
+}
+
+// OpenSheet creates a sheet and applies the settings which should be written
+// before the rows. The sheet opened previously will be closed.
+//
+// Args:
+//
+//	sheet (string): The name of the sheet.
+//	data ([]byte): JSON data containing the sheet settings, in the same format as
+//	               the sheet content of WriteExcel, and the new "Style" list.
+//	               The cells are ignored.
+//
+// Panics:
+//   - panics on errors during JSON unmarshalling, or if the sheet has been written.
+func (s *Session) OpenSheet(sheet string, data []byte) {
+	s.CloseSheet()
+	if s.writtenSheet[sheet] {
+		panic(fmt.Sprintf("sheet %s has already been written", sheet))
+	}
+	sheetData := &Sheet{}
+	decodePayload(data, sheetData)
+	// The cells are sent by AppendRows, and the buffers decoded from the
+	// payload would not outlive the call.
+	sheetData.Data, sheetData.Sparse, sheetData.Columns, sheetData.Arrays = nil, nil, nil, nil
+	// The styles of the columns and the rows may be new to the session
+	s.writer.addStyles(sheetData.Style)
+
+	// The first sheet takes the place of the default Sheet1
+	if s.sheetCount == 0 && sheet != "Sheet1" {
+		s.writer.File.SetSheetName("Sheet1", sheet)
+	} else if s.sheetCount != 0 {
+		s.writer.File.NewSheet(sheet)
+	}
+	s.sheetCount++
+	s.writtenSheet[sheet] = true
+
+	s.sheet = sheet
+	s.sheetData = sheetData
+	s.nextRow = 1
+	if sheetData.WriterEngine == "NormalWriter" {
+		s.writer.prepareNormalWrite(sheet, sheetData)
+	} else {
+		s.streamWriter, s.rowHeightMap = s.writer.prepareStreamWrite(sheet, sheetData)
+	}
+}
+
+// AppendRows creates the new styles of a batch and writes its rows after the
+// rows written previously in the opened sheet.
+//
+// Args:
+//
+//	data ([]byte): JSON data containing the new "style" list, the new "strings"
+//	of the string pool, the "data" rows, or the "columns" or the "sparse" cells,
+//	and the "arrays" written over the rows, see RowBatch.
+//
+// Panics:
+//   - panics on errors during JSON unmarshalling, or if no sheet is opened.
+func (s *Session) AppendRows(data []byte) {
+	if s.sheetData == nil {
+		panic("no sheet is opened in the session")
+	}
+	var batch RowBatch
+	decodePayload(data, &batch)
+	s.writer.addStyles(batch.Style)
+	s.strings = append(s.strings, batch.Strings...)
+	if batch.Sparse != nil {
+		s.appendSparse(batch.Sparse, batch.Arrays)
+		return
+	}
+
+	rows := batch.Data
+	if batch.Columns != nil {
+		rows = batch.Columns.rows()
+		s.sheetData.applyStyleRules(rows)
+	}
+	resolveStrings(rows, s.strings)
+	rows = applyArrays(rows, batch.Arrays)
+	s.sheetData.applyLineStyles(rows, s.nextRow)
+	if s.streamWriter != nil {
+		s.writer.streamRows(s.streamWriter, rows, s.nextRow, s.rowHeightMap)
+	} else {
+		s.writer.writeRows(s.sheet, rows, s.nextRow)
+	}
+	s.nextRow += len(rows)
+}
+
+// appendSparse writes the sparse cells of a batch, with the cells of its
+// arrays, after the rows written previously in the opened sheet. Only the
+// written cells are visited, the rows between them are skipped.
+func (s *Session) appendSparse(sparse *SparseCells, arrays []ArrayBlock) {
+	for i := range sparse.Cells {
+		sparse.Cells[i].resolveString(s.strings)
+	}
+	s.sheetData.applySparseStyleRules(sparse)
+	sparse.addArrays(arrays)
+	length := sparse.Length
+	if n := len(sparse.Rows); n != 0 && sparse.Rows[n-1] >= length {
+		length = sparse.Rows[n-1] + 1
+	}
+	for i := range sparse.Rows {
+		sparse.Rows[i] += s.nextRow - 1
+	}
+	s.sheetData.applySparseLineStyles(sparse)
+
+	if s.streamWriter != nil {
+		// The StreamWriter writes the rows in ascending order, so only the
+		// options of the rows of the batch are written with its cells.
+		rowHeightMap := make(map[int]excelize.RowOpts)
+		for row, opts := range s.rowHeightMap {
+			if row >= s.nextRow && row < s.nextRow+length {
+				rowHeightMap[row] = opts
+			}
+		}
+		s.writer.streamSparse(s.streamWriter, sparse, rowHeightMap)
+	} else {
+		s.writer.writeSparse(s.sheet, sparse)
+	}
+	s.nextRow += length
+}
+
+// CloseSheet creates the tables of the opened sheet, flushes its rows and sets
+// its visibility. Closing without an opened sheet is a no-op.
+func (s *Session) CloseSheet() {
+	if s.sheetData == nil {
+		return
+	}
+	if s.streamWriter != nil {
+		// Excelize should create table with the existed row.
+		streamCreateTable(s.streamWriter, s.sheetData.Table)
+		if err := s.streamWriter.Flush(); err != nil {
+			fmt.Println(err)
+		}
+	} else {
+		s.writer.createTable(s.sheet, s.sheetData.Table)
+	}
+	// Pivot tables are created when the session is finished, since they may
+	// refer to the data of the sheets written later.
+	s.pivotTables = append(s.pivotTables, s.sheetData.PivotTable)
+
+	if err := s.writer.File.SetSheetVisible(s.sheet, s.sheetData.SheetVisible); err != nil {
+		fmt.Println(err)
+	}
+	s.sheet = ""
+	s.sheetData = nil
+	s.streamWriter = nil
+	s.rowHeightMap = nil
+}
+
+// finish closes the opened sheet and creates the pivot tables of the workbook.
+func (s *Session) finish() {
+	s.CloseSheet()
+	for _, pivot := range s.pivotTables {
+		s.writer.createPivotTable(pivot)
+	}
+	s.pivotTables = nil
+}
+
+// WriteToBuffer finishes the workbook and returns the raw bytes of the Excel file.
+//
+// Panics:
+//   - panics on errors while writing the Excel file.
+func (s *Session) WriteToBuffer() []byte {
+	s.finish()
+	buffer, err := s.writer.File.WriteToBuffer()
+	if err != nil {
+		panic(err)
+	}
+	return buffer.Bytes()
+}
+
+// SaveAs finishes the workbook and writes the Excel file to the given path.
+//
+// Args:
+//
+//	path (string): The destination path of the Excel file.
+//
+// Returns:
+//
+//	error: Any error encountered while saving the file.
+func (s *Session) SaveAs(path string) error {
+	s.finish()
+	return s.writer.File.SaveAs(path)
+}
@@ -0,0 +1,200 @@
+package core
+
+import (
+	"encoding/json"
+	"os"
+	"path/filepath"
+	"testing"
+)
+
+func marshalPayload(t *testing.T, v interface{}) []byte {
+	payload, err := json.Marshal(v)
+	if err != nil {
+		t.Fatalf("Failed to marshal data: %v", err)
+	}
+	return payload
+}
+
+func sessionSheetData(engine string) map[string]interface{} {
+	return map[string]interface{}{
+		"Height":         map[string]int{"3": 252},
+		"Width":          map[string]int{"1": 25, "2": 26, "3": 6},
+		"MergeCells":     [][]interface{}{{"A1", "A2"}},
+		"AutoFilter":     []interface{}{},
+		"Panes":          map[string]interface{}{},
+		"DataValidation": []interface{}{},
+		"Comment":        []interface{}{},
+		"NoStyle":        false,
+		"Table":          []interface{}{},
+		"Chart":          []interface{}{},
+		"PivotTable":     []interface{}{},
+		"SheetVisible":   true,
+		"WriterEngine":   engine,
+	}
+}
+
+func newTestSession(t *testing.T) int64 {
+	return NewSession(marshalPayload(t, map[string]interface{}{
+		"style":      data["style"],
+		"file_props": data["file_props"],
+		"protection": map[string]interface{}{},
+	}))
+}
+
+func TestSession(t *testing.T) {
+	id := newTestSession(t)
+	defer CloseSession(id)
+	session := GetSession(id)
+
+	batch := map[string]interface{}{
+		"style": []interface{}{},
+		"data": [][][]interface{}{
+			{{"Data1", 0}, {"Data2", 0}, {}},
+			{{"Data3", 0}, {"Data4"}, {}},
+		},
+	}
+	for _, engine := range []string{"StreamWriter", "NormalWriter"} {
+		session.OpenSheet(engine, marshalPayload(t, sessionSheetData(engine)))
+		session.AppendRows(marshalPayload(t, batch))
+		session.AppendRows(marshalPayload(t, batch))
+		if session.nextRow != 5 {
+			t.Errorf("Expected next row 5 but got %d", session.nextRow)
+		}
+	}
+	session.CloseSheet()
+
+	rawExcel := session.WriteToBuffer()
+	if len(rawExcel) == 0 || string(rawExcel[:2]) != "PK" {
+		t.Error("Excel data is not a zip archive")
+	}
+}
+
+func TestSessionNewStyle(t *testing.T) {
+	id := newTestSession(t)
+	defer CloseSession(id)
+	session := GetSession(id)
+
+	session.OpenSheet("Sheet1", marshalPayload(t, sessionSheetData("StreamWriter")))
+	session.AppendRows(marshalPayload(t, map[string]interface{}{
+		"style": data["style"],
+		"data":  [][][]interface{}{{{"Data1", 1}}},
+	}))
+	if len(session.writer.styleIDs) != 2 {
+		t.Errorf("Expected 2 styles in the session but got %d", len(session.writer.styleIDs))
+	}
+
+	// The styles of the columns are sent with the settings of the sheet.
+	sheetData := sessionSheetData("NormalWriter")
+	sheetData["Style"] = data["style"]
+	sheetData["ColStyle"] = map[string]int{"2": 2}
+	session.OpenSheet("Sheet2", marshalPayload(t, sheetData))
+	if len(session.writer.styleIDs) != 3 {
+		t.Errorf("Expected 3 styles in the session but got %d", len(session.writer.styleIDs))
+	}
+
+	path := filepath.Join(t.TempDir(), "session.xlsx")
+	if err := session.SaveAs(path); err != nil {
+		t.Fatalf("Failed to write Excel file: %v", err)
+	}
+	if _, err := os.Stat(path); err != nil {
+		t.Fatalf("Excel file was not created: %v", err)
+	}
+}
+
+func TestSessionArrays(t *testing.T) {
+	id := newTestSession(t)
+	defer CloseSession(id)
+	session := GetSession(id)
+
+	// Two int8 values under a header row, the rows grow with the array.
+	batch := map[string]interface{}{
+		"data": [][][]interface{}{{{"Header", 0}}},
+		"arrays": []map[string]interface{}{
+			{"Row": 1, "Col": 0, "Rows": 2, "Cols": 1, "Dtype": "i1", "Data": []byte{1, 2}, "Style": 0},
+		},
+	}
+	for _, engine := range []string{"StreamWriter", "NormalWriter"} {
+		session.OpenSheet(engine, marshalPayload(t, sessionSheetData(engine)))
+		session.AppendRows(marshalPayload(t, batch))
+		session.AppendRows(marshalPayload(t, batch))
+		if session.nextRow != 7 {
+			t.Errorf("Expected next row 7 but got %d", session.nextRow)
+		}
+	}
+	session.CloseSheet()
+}
+
+func TestSessionStorages(t *testing.T) {
+	id := newTestSession(t)
+	defer CloseSession(id)
+	session := GetSession(id)
+
+	// A1 and C4 of a sparse sheet of 6 rows, styled by a rule, and a row below.
+	sparse := map[string]interface{}{
+		"sparse": map[string]interface{}{
+			"Rows": []int{0, 3}, "Cols": []int{0, 2}, "Cells": [][]interface{}{{"A1"}, {2.5}},
+			"Length": 6,
+		},
+	}
+	rows := map[string]interface{}{"data": [][][]interface{}{{{"Data1", 0}}}}
+	columns := map[string]interface{}{
+		"columns": map[string]interface{}{
+			"Rows": 2, "Styles": []int{-1},
+			"Cols": []map[string]interface{}{
+				{"Kind": []byte{columnFloat, columnFloat}, "Num": make([]byte, 16), "Style": make([]byte, 4)},
+			},
+		},
+	}
+	for _, engine := range []string{"StreamWriter", "NormalWriter"} {
+		sheetData := sessionSheetData(engine)
+		sheetData["StyleRules"] = [][]int{{0, 0, 9, 9, 1}}
+		session.OpenSheet(engine+"Sparse", marshalPayload(t, sheetData))
+		session.AppendRows(marshalPayload(t, sparse))
+		if session.nextRow != 7 {
+			t.Errorf("Expected next row 7 but got %d", session.nextRow)
+		}
+		session.AppendRows(marshalPayload(t, rows))
+		if session.nextRow != 8 {
+			t.Errorf("Expected next row 8 but got %d", session.nextRow)
+		}
+
+		session.OpenSheet(engine+"Columns", marshalPayload(t, sheetData))
+		session.AppendRows(marshalPayload(t, columns))
+		session.AppendRows(marshalPayload(t, rows))
+		if session.nextRow != 4 {
+			t.Errorf("Expected next row 4 but got %d", session.nextRow)
+		}
+	}
+
+	// The sparse cells of a later batch follow the rows written previously.
+	cells := &SparseCells{Rows: []int{0}, Cols: []int{1}, Cells: []Cell{{Kind: cellNumber, Style: noStyle}}}
+	session.appendSparse(cells, nil)
+	if cells.Rows[0] != 3 || cells.Cells[0].Style != 1 || session.nextRow != 5 {
+		t.Errorf("Unexpected sparse cells %v at next row %d", cells, session.nextRow)
+	}
+	session.CloseSheet()
+}
+
+func TestSessionErrors(t *testing.T) {
+	id := newTestSession(t)
+	session := GetSession(id)
+
+	assertPanic := func(name string, f func()) {
+		defer func() {
+			if r := recover(); r == nil {
+				t.Errorf("%s: expected panic", name)
+			}
+		}()
+		f()
+	}
+	assertPanic("AppendWithoutSheet", func() {
+		session.AppendRows(marshalPayload(t, map[string]interface{}{"data": []interface{}{}}))
+	})
+	session.OpenSheet("Sheet1", marshalPayload(t, sessionSheetData("StreamWriter")))
+	assertPanic("ReopenSheet", func() {
+		session.OpenSheet("Sheet1", marshalPayload(t, sessionSheetData("StreamWriter")))
+	})
+
+	CloseSession(id)
+	assertPanic("ClosedSession", func() { GetSession(id) })
+}
@@ -0,0 +1,113 @@
+package core
+
+import (
+	"fmt"
+	"math"
+	"sort"
+
+	"github.com/xuri/excelize/v2"
+)
+
+// SparseCells is the sparse form of the cells of a sheet, sent by the
+// SparseStorage of a WorkSheet instead of the rows. Only the written cells
+// are sent, with their 0-based row and column indexes.
+//
+// Notes:
+//   - The cells are sorted by row and then by column.
+//   - Length is the number of rows of the storage, which may end with rows
+//     without cells. A Session writes the next rows after them.
+type SparseCells struct {
+	Rows   []int  `json:"Rows"`
+	Cols   []int  `json:"Cols"`
+	Cells  []Cell `json:"Cells"`
+	Length int    `json:"Length"`
+}
+
+// check validates the coordinates of the cells.
+//
+// Panics:
+//   - panics if the coordinates do not match the cells or are not sorted.
+func (s *SparseCells) check() {
+	if len(s.Rows) != len(s.Cells) || len(s.Cols) != len(s.Cells) {
+		panic(fmt.Sprintf(
+			"sparse cells have %d rows and %d columns for %d cells",
+			len(s.Rows), len(s.Cols), len(s.Cells),
+		))
+	}
+	for i := 1; i < len(s.Cells); i++ {
+		if s.Rows[i] < s.Rows[i-1] || (s.Rows[i] == s.Rows[i-1] && s.Cols[i] <= s.Cols[i-1]) {
+			panic(fmt.Sprintf("sparse cells are not sorted at index %d", i))
+		}
+	}
+}
+
+// writeSparse writes the sparse cells of a sheet with the excelize.File cell setters.
+//
+// Args:
+//
+//	sheet (string): The name of the sheet.
+//	sparse (*SparseCells): The cells to write.
+func (ew *ExcelWriter) writeSparse(sheet string, sparse *SparseCells) {
+	sparse.check()
+	for i := range sparse.Cells {
+		ew.writeCell(sheet, sparse.Cols[i]+1, sparse.Rows[i]+1, &sparse.Cells[i])
+	}
+}
+
+// streamSparse writes the sparse cells of a sheet with the excelize.StreamWriter.
+// A row is written from its first cell, and the gaps between its cells are
+// skipped by the StreamWriter.
+//
+// Args:
+//
+//	streamWriter (*excelize.StreamWriter): The stream writer of the sheet.
+//	sparse (*SparseCells): The cells to write.
+//	rowHeightMap (map[int]excelize.RowOpts): The row options keyed by the row number.
+//
+// Notes:
+//   - The rows with options but without cells are written as empty rows, so
+//     their height is kept.
+func (ew *ExcelWriter) streamSparse(
+	streamWriter *excelize.StreamWriter,
+	sparse *SparseCells,
+	rowHeightMap map[int]excelize.RowOpts,
+) {
+	sparse.check()
+	heights := make([]int, 0, len(rowHeightMap))
+	for row := range rowHeightMap {
+		heights = append(heights, row)
+	}
+	sort.Ints(heights)
+
+	h := 0
+	// streamEmptyRows writes the rows with options before the given row number.
+	streamEmptyRows := func(before int) {
+		for ; h < len(heights) && heights[h] < before; h++ {
+			streamSetRow(streamWriter, 1, heights[h], nil, rowHeightMap)
+		}
+	}
+
+	// SetRow does not keep the slice, so the same buffer is reused by every row.
+	var values []interface{}
+	for i := 0; i < len(sparse.Cells); {
+		row, first := sparse.Rows[i]+1, sparse.Cols[i]
+		streamEmptyRows(row)
+		if h < len(heights) && heights[h] == row {
+			h++
+		}
+		values = values[:0]
+		for ; i < len(sparse.Cells) && sparse.Rows[i]+1 == row; i++ {
+			for len(values) < sparse.Cols[i]-first {
+				values = append(values, nil)
+			}
+			c := &sparse.Cells[i]
+			if c.Kind == cellNull && c.Style == noStyle {
+				values = append(values, nil)
+				continue
+			}
+			values = append(values, ew.createCell(c))
+		}
+		streamSetRow(streamWriter, first+1, row, values, rowHeightMap)
+	}
+	streamEmptyRows(math.MaxInt32)
+}
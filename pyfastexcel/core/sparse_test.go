@@ -0,0 +1,83 @@
+package core
+
+import (
+	"encoding/json"
+	"reflect"
+	"testing"
+)
+
+// sparsePayload returns a workbook payload of a sheet with the given cells.
+func sparsePayload(engine string, cells map[string]interface{}) []byte {
+	sheet := map[string]interface{}{
+		"Height":       map[string]interface{}{"2": 30, "9": 15},
+		"SheetVisible": true,
+		"WriterEngine": engine,
+	}
+	for k, v := range cells {
+		sheet[k] = v
+	}
+	payload, _ := json.Marshal(map[string]interface{}{
+		"content":     map[string]interface{}{"Sheet1": sheet},
+		"style":       data["style"],
+		"file_props":  data["file_props"],
+		"protection":  map[string]interface{}{},
+		"sheet_order": []interface{}{"Sheet1"},
+	})
+	return payload
+}
+
+func TestWriteExcelSparse(t *testing.T) {
+	sparse := map[string]interface{}{
+		"Sparse": map[string]interface{}{
+			"Rows":  []int{0, 0, 4, 4},
+			"Cols":  []int{1, 5, 0, 2},
+			"Cells": []interface{}{[]interface{}{"a", 1}, "b", []interface{}{1.5}, "=SUM(A5)"},
+		},
+	}
+	dense := map[string]interface{}{
+		"Data": []interface{}{
+			[]interface{}{nil, []interface{}{"a", 1}, nil, nil, nil, "b"},
+			[]interface{}{},
+			[]interface{}{},
+			[]interface{}{},
+			[]interface{}{[]interface{}{1.5}, nil, "=SUM(A5)"},
+		},
+	}
+
+	expected := readZipEntries(t, WriteExcelBytes(sparsePayload("NormalWriter", dense)))
+	actual := readZipEntries(t, WriteExcelBytes(sparsePayload("NormalWriter", sparse)))
+	if !reflect.DeepEqual(expected, actual) {
+		t.Error("The sparse output differs from the dense output")
+	}
+	readZipEntries(t, WriteExcelBytes(sparsePayload("StreamWriter", sparse)))
+}
+
+func TestSparseCellsCheck(t *testing.T) {
+	tests := []struct {
+		name   string
+		sparse SparseCells
+	}{
+		{
+			name:   "MissingCoordinates",
+			sparse: SparseCells{Rows: []int{0}, Cols: []int{}, Cells: []Cell{{Kind: cellNull}}},
+		},
+		{
+			name:   "UnsortedRows",
+			sparse: SparseCells{Rows: []int{1, 0}, Cols: []int{0, 0}, Cells: make([]Cell, 2)},
+		},
+		{
+			name:   "UnsortedCols",
+			sparse: SparseCells{Rows: []int{0, 0}, Cols: []int{1, 1}, Cells: make([]Cell, 2)},
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			defer func() {
+				if r := recover(); r == nil {
+					t.Error("Expected panic on invalid sparse cells")
+				}
+			}()
+			tt.sparse.check()
+		})
+	}
+}
@@ -0,0 +1,54 @@
+package core
+
+import "fmt"
+
+// resolveString gives its value to a pooled string cell. Every cell of a
+// string of the pool shares the same string instead of a copy of it.
+//
+// Panics:
+//   - panics if the index is not in the pool.
+func (c *Cell) resolveString(strings []string) {
+	if c.Kind != cellPooled {
+		return
+	}
+	index := int(c.Num)
+	if index < 0 || index >= len(strings) {
+		panic(fmt.Sprintf("string index %d out of range of the %d pooled strings", index, len(strings)))
+	}
+	c.Str = strings[index]
+	c.Num = 0
+	c.Kind = cellString
+	if len(c.Str) != 0 && c.Str[0] == '=' {
+		c.Kind = cellFormula
+	}
+}
+
+// resolveStrings gives their value to the pooled string cells of the rows.
+//
+// Args:
+//
+//	rows ([]Row): The rows to update in place.
+//	strings ([]string): The string pool of the payload, see StringPool in python.
+func resolveStrings(rows []Row, strings []string) {
+	if len(strings) == 0 {
+		return
+	}
+	for _, row := range rows {
+		for j := range row {
+			row[j].resolveString(strings)
+		}
+	}
+}
+
+// resolveStrings gives their value to the pooled string cells of the sheet.
+func (s *Sheet) resolveStrings(strings []string) {
+	if len(strings) == 0 {
+		return
+	}
+	resolveStrings(s.Data, strings)
+	if s.Sparse != nil {
+		for i := range s.Sparse.Cells {
+			s.Sparse.Cells[i].resolveString(strings)
+		}
+	}
+}
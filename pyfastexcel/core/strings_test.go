@@ -0,0 +1,49 @@
+package core
+
+import (
+	"reflect"
+	"testing"
+)
+
+func TestResolveStrings(t *testing.T) {
+	data := `{"content":{"Sheet1":{"Data":[[[[0],1],[[1]],[[0],-1],["b"]]],` +
+		`"Sparse":{"Rows":[0],"Cols":[2],"Cells":[[[1],2]]}}},"strings":["a","=B1"]}`
+	ew := newExcelWriter([]byte(data))
+
+	sheet := ew.Content["Sheet1"]
+	expected := Row{
+		{Kind: cellString, Str: "a", Style: 1},
+		{Kind: cellFormula, Str: "=B1"},
+		{Kind: cellString, Str: "a", Style: noStyle},
+		{Kind: cellString, Str: "b"},
+	}
+	if !reflect.DeepEqual(sheet.Data[0], expected) {
+		t.Errorf("Expected %#v but got %#v", expected, sheet.Data[0])
+	}
+	if c := sheet.Sparse.Cells[0]; c.Kind != cellFormula || c.Str != "=B1" || c.Style != 2 {
+		t.Errorf("Unexpected sparse cell %#v", c)
+	}
+
+	// {"strings": ["s"], "data": [[[[0], 2], [[0]]]]}
+	raw := []byte{
+		0x82,
+		0xa7, 's', 't', 'r', 'i', 'n', 'g', 's', 0x91, 0xa1, 's',
+		0xa4, 'd', 'a', 't', 'a', 0x91, 0x92,
+		0x92, 0x91, 0x00, 0x02,
+		0x91, 0x91, 0x00,
+	}
+	var batch RowBatch
+	decodePayload(raw, &batch)
+	resolveStrings(batch.Data, batch.Strings)
+	expected = Row{{Kind: cellString, Str: "s", Style: 2}, {Kind: cellString, Str: "s"}}
+	if len(batch.Data) != 1 || !reflect.DeepEqual(batch.Data[0], expected) {
+		t.Errorf("Expected %#v but got %#v", expected, batch.Data)
+	}
+
+	defer func() {
+		if recover() == nil {
+			t.Error("Expected a panic for an index out of the pool")
+		}
+	}()
+	resolveStrings([]Row{{{Kind: cellPooled, Num: 1}}}, []string{"a"})
+}
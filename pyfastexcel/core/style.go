@@ -1,6 +1,7 @@
 package core
 
 import (
+	"encoding/json"
 	"errors"
 	"reflect"
 
@@ -135,116 +136,182 @@ func getFillStyle(fillMap map[string]interface{}) excelize.Fill {
 	return fillStyle
 }
 
-// getBorderStyle extracts border style information from a map and returns a slice of excelize.Border objects.
-//
-// Args:
-//
-//	borderMap (map[string]interface{}): A map containing key-value pairs for border styles.
-//
-// Returns:
-//
-//	[]excelize.Border: A slice of excelize.Border objects representing the extracted styles for each direction.
-func getBorderStyle(borderMap map[string]interface{}) []excelize.Border {
-	var borderStyle []excelize.Border
-
-	direction := []string{"left", "top", "bottom", "right"}
-
-	for _, dir := range direction {
-		if bd, ok := borderMap[dir].(map[string]interface{}); ok {
-			border := excelize.Border{Type: dir}
-			mappings := []fieldMapping{
-				{Name: "Color", Type: "string"},
-				{Name: "Style", Type: "int"},
-			}
-			setField(&border, bd, mappings)
-			borderStyle = append(borderStyle, border)
-		}
-	}
+// FontSetting is the typed form of the "Font" of a style, see Font in python.
+type FontSetting struct {
+	Bold      bool    `json:"Bold"`
+	Italic    bool    `json:"Italic"`
+	Underline string  `json:"Underline"`
+	Family    string  `json:"Family"`
+	Size      float64 `json:"Size"`
+	Strike    bool    `json:"Strike"`
+	Color     string  `json:"Color"`
+}
 
-	return borderStyle
+// FillSetting is the typed form of the "Fill" of a style, see Fill in python.
+type FillSetting struct {
+	Type    string  `json:"Type"`
+	Color   *string `json:"Color"`
+	Pattern int     `json:"Pattern"`
+	Shading int     `json:"Shading"`
 }
 
-// getAlignmentStyle extracts alignment style information from a map and returns an excelize.Alignment object.
-//
-// Args:
-//
-//	alignmentMap (map[string]interface{}): A map containing key-value pairs for alignment styles.
-//
-// Returns:
-//
-//	*excelize.Alignment: A pointer to an excelize.Alignment object representing the extracted style.
-func getAlignmentStyle(alignmentMap map[string]interface{}) *excelize.Alignment {
-	var alignmentStyle excelize.Alignment
+// BorderSetting is the typed form of a side of the "Border" of a style.
+type BorderSetting struct {
+	Color string `json:"Color"`
+	Style int    `json:"Style"`
+}
 
-	mappings := []fieldMapping{
-		{Name: "Horizontal", Type: "string"},
-		{Name: "Indent", Type: "int"},
-		{Name: "JustifyLastLine", Type: "bool"},
-		{Name: "ReadingOrder", Type: "uint64"},
-		{Name: "RelativeIndent", Type: "int"},
-		{Name: "ShrinkToFit", Type: "bool"},
-		{Name: "TextRotation", Type: "int"},
-		{Name: "Vertical", Type: "string"},
-		{Name: "WrapText", Type: "bool"},
-	}
+// BordersSetting is the typed form of the "Border" of a style, see Border in python.
+type BordersSetting struct {
+	Left   *BorderSetting `json:"left"`
+	Top    *BorderSetting `json:"top"`
+	Bottom *BorderSetting `json:"bottom"`
+	Right  *BorderSetting `json:"right"`
+}
 
-	setField(&alignmentStyle, alignmentMap, mappings)
+// AlignmentSetting is the typed form of the "Alignment" of a style, see Alignment in python.
+type AlignmentSetting struct {
+	Horizontal      string `json:"Horizontal"`
+	Indent          int    `json:"Indent"`
+	JustifyLastLine bool   `json:"JustifyLastLine"`
+	ReadingOrder    uint64 `json:"ReadingOrder"`
+	RelativeIndent  int    `json:"RelativeIndent"`
+	ShrinkToFit     bool   `json:"ShrinkToFit"`
+	TextRotation    int    `json:"TextRotation"`
+	Vertical        string `json:"Vertical"`
+	WrapText        bool   `json:"WrapText"`
+}
 
-	return &alignmentStyle
+// ProtectionSetting is the typed form of the "Protection" of a style, see Protection in python.
+type ProtectionSetting struct {
+	Hidden bool `json:"Hidden"`
+	Locked bool `json:"Locked"`
 }
 
-// getProtectionStyle extracts protection style information from a map and returns an excelize.Protection object.
-//
-// Args:
-//
-//	protectionMap (map[string]interface{}): A map containing key-value pairs for protection styles.
-//
-// Returns:
-//
-//	*excelize.Protection: A pointer to an excelize.Protection object representing the extracted style.
-func getProtectionStyle(protectionMap map[string]interface{}) *excelize.Protection {
-	var protectionStyle excelize.Protection
+// StyleSetting is the typed form of a style of the style map sent by python, see
+// StyleManager._update_style_map. The settings are decoded directly into their
+// fields, and the null values of python are left as the zero values.
+type StyleSetting struct {
+	Font         FontSetting       `json:"Font"`
+	Fill         FillSetting       `json:"Fill"`
+	Border       BordersSetting    `json:"Border"`
+	Alignment    AlignmentSetting  `json:"Alignment"`
+	Protection   ProtectionSetting `json:"Protection"`
+	CustomNumFmt string            `json:"CustomNumFmt"`
+}
 
-	mappings := []fieldMapping{
-		{Name: "Hidden", Type: "bool"},
-		{Name: "Locked", Type: "bool"},
+// excelizeStyle converts the setting into the excelize.Style of a new style.
+func (s *StyleSetting) excelizeStyle() *excelize.Style {
+	fill := excelize.Fill{Type: s.Fill.Type, Pattern: s.Fill.Pattern, Shading: s.Fill.Shading}
+	if s.Fill.Color != nil {
+		fill.Color = []string{*s.Fill.Color}
 	}
 
-	setField(&protectionStyle, protectionMap, mappings)
+	var borders []excelize.Border
+	for _, side := range []struct {
+		name    string
+		setting *BorderSetting
+	}{
+		{"left", s.Border.Left},
+		{"top", s.Border.Top},
+		{"bottom", s.Border.Bottom},
+		{"right", s.Border.Right},
+	} {
+		if side.setting != nil {
+			borders = append(borders, excelize.Border{
+				Type:  side.name,
+				Color: side.setting.Color,
+				Style: side.setting.Style,
+			})
+		}
+	}
 
-	return &protectionStyle
+	customNumFmt := s.CustomNumFmt
+	return &excelize.Style{
+		Font: &excelize.Font{
+			Bold:      s.Font.Bold,
+			Italic:    s.Font.Italic,
+			Underline: s.Font.Underline,
+			Family:    s.Font.Family,
+			Size:      s.Font.Size,
+			Strike:    s.Font.Strike,
+			Color:     s.Font.Color,
+		},
+		Fill:   fill,
+		Border: borders,
+		Alignment: &excelize.Alignment{
+			Horizontal:      s.Alignment.Horizontal,
+			Indent:          s.Alignment.Indent,
+			JustifyLastLine: s.Alignment.JustifyLastLine,
+			ReadingOrder:    s.Alignment.ReadingOrder,
+			RelativeIndent:  s.Alignment.RelativeIndent,
+			ShrinkToFit:     s.Alignment.ShrinkToFit,
+			TextRotation:    s.Alignment.TextRotation,
+			Vertical:        s.Alignment.Vertical,
+			WrapText:        s.Alignment.WrapText,
+		},
+		Protection: &excelize.Protection{
+			Hidden: s.Protection.Hidden,
+			Locked: s.Protection.Locked,
+		},
+		CustomNumFmt: &customNumFmt,
+	}
 }
 
-// CreateStyle creates styles in an Excel file based on a map of style settings.
+// CreateStyle creates styles in an Excel file based on a list of style settings.
 //
 // Args:
 //
 //	file (*excelize.File): The Excel file object.
-//	styleSettings (map[string]map[string]interface{}): A map containing key-value pairs for
-//													   style names and their individual settings.
+//	styleSettings ([]StyleSetting): The style settings, indexed by the style ids
+//									assigned by the StyleManager in python.
+//	cache (map[string]int): The style index of the styles already created in the
+//							file, keyed by their canonical JSON. It is updated with
+//							the new styles, and may be nil to create every style.
 //
 // Returns:
 //
-//	map[string]int: A map linking style names to their corresponding style index in the Excel file.
-func CreateStyle(file *excelize.File, styleSettings map[string]interface{}) map[string]int {
-	styleMap := make(map[string]int)
-
-	for key, style := range styleSettings {
-		customNumFmt := style.(map[string]interface{})["CustomNumFmt"].(string)
-		customStyle, err := file.NewStyle(&excelize.Style{
-			Font:         getFontStyle(style.(map[string]interface{})["Font"].(map[string]interface{})),
-			Fill:         getFillStyle(style.(map[string]interface{})["Fill"].(map[string]interface{})),
-			Border:       getBorderStyle(style.(map[string]interface{})["Border"].(map[string]interface{})),
-			Alignment:    getAlignmentStyle(style.(map[string]interface{})["Alignment"].(map[string]interface{})),
-			Protection:   getProtectionStyle(style.(map[string]interface{})["Protection"].(map[string]interface{})),
-			CustomNumFmt: &customNumFmt,
-		})
+//	[]int: The style index in the Excel file of each style, in the same order as styleSettings.
+//
+// Notes:
+//   - The styles are created in the order of their ids, so the style index in the Excel
+//     file does not depend on the map iteration order.
+//   - The equivalent settings share the same style index, so file.NewStyle, which
+//     compares a new style with every style of the file, is called once per style.
+//
+// Panics:
+//   - panics on errors during style creation.
+func CreateStyle(file *excelize.File, styleSettings []StyleSetting, cache map[string]int) []int {
+	styleIDs := make([]int, 0, len(styleSettings))
+
+	for i := range styleSettings {
+		// The fields of a struct are encoded in a fixed order, so the JSON is canonical.
+		key, err := json.Marshal(&styleSettings[i])
 		if err != nil {
 			panic(err)
 		}
-
-		styleMap[key] = customStyle
+		if styleID, ok := cache[string(key)]; ok {
+			styleIDs = append(styleIDs, styleID)
+			continue
+		}
+		styleID, err := file.NewStyle(styleSettings[i].excelizeStyle())
+		if err != nil {
+			panic(err)
+		}
+		if cache != nil {
+			cache[string(key)] = styleID
+		}
+		styleIDs = append(styleIDs, styleID)
 	}
 
-	return styleMap
+	return styleIDs
+}
+
+// addStyles creates the new styles of the payload in the File and links their
+// style ids to the created style index.
+func (ew *ExcelWriter) addStyles(styleSettings []StyleSetting) {
+	if ew.styleCache == nil {
+		ew.styleCache = make(map[string]int, len(styleSettings))
+	}
+	ew.styleIDs = append(ew.styleIDs, CreateStyle(ew.File, styleSettings, ew.styleCache)...)
 }
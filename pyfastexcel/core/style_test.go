@@ -1,100 +1,103 @@
 package core
 
 import (
+	"encoding/json"
+	"reflect"
 	"testing"
 
 	"github.com/xuri/excelize/v2"
 )
 
 func TestCreateStyle(t *testing.T) {
-	// Mock styleSettings map
-	styleSettings := map[string]interface{}{
-		"style1": map[string]interface{}{
-			"Font": map[string]interface{}{
-				"Bold": true,
+	// The style map sent by python, with a duplicate of the first style
+	data := `[
+		{
+			"Font": {"Bold": true, "Family": null},
+			"Fill": {"Type": "pattern", "Color": "#FFFFFF", "Pattern": 1, "Shading": 100},
+			"Border": {
+				"left": {"Color": "FF0000", "Style": 1},
+				"top": {"Color": "00FF00", "Style": 2}
 			},
-			"Fill": map[string]interface{}{
-				"Type":    "pattern",
-				"Color":   "#FFFFFF",
-				"Pattern": float64(1),
-				"Shading": float64(100),
+			"Alignment": {
+				"Horizontal": "center", "Vertical": "middle", "Indent": 0,
+				"JustifyLastLine": false, "ReadingOrder": 0, "RelativeIndent": 0,
+				"ShrinkToFit": false, "TextRotation": 0, "WrapText": false
 			},
-			"Border": map[string]interface{}{
-				"left": map[string]interface{}{
-					"Color": "FF0000",
-					"Style": float64(1),
-				},
-				"top": map[string]interface{}{
-					"Color": "00FF00",
-					"Style": float64(2),
-				},
-			},
-			"Alignment": map[string]interface{}{
-				"Horizontal":      "center",
-				"Vertical":        "middle",
-				"Indent":          float64(0),
-				"JustifyLastLine": false,
-				"ReadingOrder":    float64(0),
-				"RelativeIndent":  float64(0),
-				"ShrinkToFit":     false,
-				"TextRotation":    float64(0),
-				"WrapText":        false,
-			},
-			"Protection": map[string]interface{}{
-				"Hidden": true,
-				"Locked": false,
-			},
-			"CustomNumFmt": "0.00",
+			"Protection": {"Hidden": true, "Locked": false},
+			"CustomNumFmt": "0.00"
 		},
-		"style2": map[string]interface{}{
-			"Font": map[string]interface{}{
-				"Bold": true,
-				"Size": float64(12),
-			},
-			"Fill": map[string]interface{}{
-				"Type":    "gradient",
-				"Color":   "#FFFFFF",
-				"Pattern": float64(2),
-				"Shading": float64(50),
-			},
-			"Border": map[string]interface{}{
-				"left": map[string]interface{}{
-					"Color": "0000FF",
-					"Style": float64(3),
-				},
-				"bottom": map[string]interface{}{
-					"Color": "FFFF00",
-					"Style": float64(4),
-				},
+		{
+			"Font": {"Bold": true, "Size": 12},
+			"Fill": {"Type": "gradient", "Color": null, "Pattern": 2, "Shading": 50},
+			"Border": {
+				"left": {"Color": "0000FF", "Style": 3},
+				"bottom": {"Color": "FFFF00", "Style": 4}
 			},
-			"Alignment": map[string]interface{}{
-				"Horizontal": "right",
-				"Vertical":   "top",
-			},
-			"Protection": map[string]interface{}{
-				"Hidden": false,
-				"Locked": true,
-			},
-			"CustomNumFmt": "0.000",
+			"Alignment": {"Horizontal": "right", "Vertical": "top"},
+			"Protection": {"Hidden": false, "Locked": true},
+			"CustomNumFmt": "0.000"
 		},
+		{
+			"CustomNumFmt": "0.00",
+			"Protection": {"Locked": false, "Hidden": true},
+			"Alignment": {"Vertical": "middle", "Horizontal": "center"},
+			"Border": {
+				"top": {"Style": 2, "Color": "00FF00"},
+				"left": {"Style": 1, "Color": "FF0000"}
+			},
+			"Fill": {"Color": "#FFFFFF", "Type": "pattern", "Shading": 100, "Pattern": 1},
+			"Font": {"Bold": true}
+		}
+	]`
+	var styleSettings []StyleSetting
+	if err := json.Unmarshal([]byte(data), &styleSettings); err != nil {
+		t.Fatal(err)
+	}
+
+	style := styleSettings[0].excelizeStyle()
+	expectedBorder := []excelize.Border{
+		{Type: "left", Color: "FF0000", Style: 1},
+		{Type: "top", Color: "00FF00", Style: 2},
+	}
+	if !reflect.DeepEqual(style.Border, expectedBorder) {
+		t.Errorf("Expected the borders %#v but got %#v", expectedBorder, style.Border)
+	}
+	expectedFill := excelize.Fill{Type: "pattern", Color: []string{"#FFFFFF"}, Pattern: 1, Shading: 100}
+	if !reflect.DeepEqual(style.Fill, expectedFill) {
+		t.Errorf("Expected the fill %#v but got %#v", expectedFill, style.Fill)
+	}
+	if !style.Font.Bold || style.Alignment.Horizontal != "center" || !style.Protection.Hidden ||
+		*style.CustomNumFmt != "0.00" {
+		t.Errorf("Unexpected style %#v", style)
+	}
+	if fill := styleSettings[1].excelizeStyle().Fill; fill.Color != nil {
+		t.Errorf("Expected no fill color but got %#v", fill.Color)
 	}
 
 	// Mock excelize.File
 	file := excelize.NewFile()
+	cache := make(map[string]int)
 
 	// Call the function to be tested
-	styleMap := CreateStyle(file, styleSettings)
+	styleIDs := CreateStyle(file, styleSettings, cache)
 
-	// Verify the created styles
-	expectedStyles := map[string]int{
-		"style1": 1,
-		"style2": 2,
+	// Verify the created styles are in the order of the settings, and the
+	// equivalent settings share their style index
+	if len(styleIDs) != 3 || styleIDs[0] >= styleIDs[1] || styleIDs[2] != styleIDs[0] {
+		t.Errorf("Expected 2 styles in the order of the settings, but got %#v", styleIDs)
 	}
-
-	for key, _ := range expectedStyles {
-		if _, ok := styleMap[key]; !ok {
-			t.Errorf("Expected style map %#v, but got %#v", expectedStyles, styleMap)
-		}
+	if len(cache) != 2 {
+		t.Errorf("Expected 2 cached styles but got %d", len(cache))
+	}
+	// The styles created by a previous call are reused
+	if styleIDs := CreateStyle(file, styleSettings[1:2], cache); styleIDs[0] != 2 {
+		t.Errorf("Expected the cached style index 2 but got %#v", styleIDs)
 	}
 
+	ew := &ExcelWriter{File: excelize.NewFile()}
+	ew.addStyles(styleSettings[:2])
+	ew.addStyles(styleSettings[2:])
+	if !reflect.DeepEqual(ew.styleIDs, []int{1, 2, 1}) {
+		t.Errorf("Expected the style ids [1 2 1] but got %#v", ew.styleIDs)
+	}
 }
@@ -0,0 +1,60 @@
+package core
+
+import "sort"
+
+// StyleRule is a style applied to a range of cells, see WorkSheet.set_style
+// in python. It holds the 0-based [row, col, end row, end col] of the range,
+// both ends included, and the style id.
+type StyleRule [5]int
+
+// contains reports whether the range of the rule contains the 0-based cell.
+func (r *StyleRule) contains(row, col int) bool {
+	return row >= r[0] && row <= r[2] && col >= r[1] && col <= r[3]
+}
+
+// styledByRule reports whether a cell takes the styles of the rules. The
+// padding cells and the cells skipped by the writers are not written by
+// python, so they are kept.
+func styledByRule(c *Cell) bool {
+	return c.Kind != cellEmpty && !(c.Kind == cellNull && c.Style == noStyle)
+}
+
+// applyStyleRules applies the style rules of the sheet to the cells of the
+// rows, in order, so the later rules override the earlier ones.
+//
+// Args:
+//
+//	rows ([]Row): The rows of the sheet from the first row, updated in place.
+func (s *Sheet) applyStyleRules(rows []Row) {
+	for _, rule := range s.StyleRules {
+		for i := rule[0]; i <= rule[2] && i < len(rows); i++ {
+			row := rows[i]
+			for j := rule[1]; j <= rule[3] && j < len(row); j++ {
+				if styledByRule(&row[j]) {
+					row[j].Style = rule[4]
+				}
+			}
+		}
+	}
+}
+
+// applySparseStyleRules is applyStyleRules for the sparse cells.
+//
+// Notes:
+//   - Only the cells in the rows of a rule are visited, found by binary search
+//     since the cells are sorted by row.
+func (s *Sheet) applySparseStyleRules(sparse *SparseCells) {
+	if len(s.StyleRules) == 0 {
+		return
+	}
+	sparse.check()
+	for r := range s.StyleRules {
+		rule := &s.StyleRules[r]
+		start := sort.SearchInts(sparse.Rows, rule[0])
+		for i := start; i < len(sparse.Cells) && sparse.Rows[i] <= rule[2]; i++ {
+			if rule.contains(sparse.Rows[i], sparse.Cols[i]) && styledByRule(&sparse.Cells[i]) {
+				sparse.Cells[i].Style = rule[4]
+			}
+		}
+	}
+}
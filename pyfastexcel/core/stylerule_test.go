@@ -0,0 +1,34 @@
+package core
+
+import (
+	"reflect"
+	"testing"
+)
+
+func TestApplyStyleRules(t *testing.T) {
+	sheet := &Sheet{StyleRules: []StyleRule{{0, 0, 9, 1, 1}, {1, 1, 1, 5, 2}}}
+	rows := []Row{
+		{{Kind: cellNumber, Style: 3}, {Kind: cellEmpty}},
+		{{Kind: cellString, Style: noStyle}, {Kind: cellNumber}, {Kind: cellNull, Style: noStyle}},
+	}
+	sheet.applyStyleRules(rows)
+
+	expected := []Row{
+		{{Kind: cellNumber, Style: 1}, {Kind: cellEmpty}},
+		{{Kind: cellString, Style: 1}, {Kind: cellNumber, Style: 2}, {Kind: cellNull, Style: noStyle}},
+	}
+	if !reflect.DeepEqual(rows, expected) {
+		t.Errorf("Expected %#v but got %#v", expected, rows)
+	}
+
+	sparse := &SparseCells{
+		Rows:  []int{0, 1, 1, 4},
+		Cols:  []int{3, 0, 1, 1},
+		Cells: []Cell{{Kind: cellNumber}, {Kind: cellNumber}, {Kind: cellNumber}, {Kind: cellNumber}},
+	}
+	sheet.applySparseStyleRules(sparse)
+	styles := []int{sparse.Cells[0].Style, sparse.Cells[1].Style, sparse.Cells[2].Style, sparse.Cells[3].Style}
+	if !reflect.DeepEqual(styles, []int{0, 1, 2, 1}) {
+		t.Errorf("Unexpected sparse styles %v", styles)
+	}
+}
@@ -6,55 +6,42 @@ import (
 )
 import (
 	"fmt"
-	"strconv"
 
 	"github.com/xuri/excelize/v2"
 )
 
 // streamCreateTable adds multiple tables to an Excel sheet using a StreamWriter.
 //
-// This function takes a StreamWriter and a list of tables, each represented by a map of key-value pairs.
+// This function takes a StreamWriter and a list of tables.
 // It iterates over the list of tables and adds each one to the sheet using the StreamWriter's AddTable method.
 // If an error occurs while adding a table, it prints the error.
 //
 // Args:
 //
 //	sw (*excelize.StreamWriter): The StreamWriter object used to write data to the Excel sheet.
-//	tables ([]interface{}): A slice of maps where each map represents a table's properties.
-//	  The map should contain the following keys:
-//	  - "range" (string): The cell range for the table (e.g., "A1:C10").
-//	  - "name" (string): The name of the table.
-//	  - "style_name" (string): The style name for the table.
-//	  - "show_first_column" (bool): Whether to highlight the first column.
-//	  - "show_last_column" (bool): Whether to highlight the last column.
-//	  - "show_row_stripes" (bool): Whether to display row stripes for better readability.
-//	  - "show_column_stripes" (bool): Whether to display column stripes for better readability.
+//	tables ([]Table): A slice of tables decoded from the sheet payload, with the following fields:
+//	  - Range (string): The cell range for the table (e.g., "A1:C10").
+//	  - Name (string): The name of the table.
+//	  - StyleName (string): The style name for the table.
+//	  - ShowFirstColumn (bool): Whether to highlight the first column.
+//	  - ShowLastColumn (bool): Whether to highlight the last column.
+//	  - ShowRowStripes (bool): Whether to display row stripes for better readability.
+//	  - ShowColumnStripes (bool): Whether to display column stripes for better readability.
 //
 // Example:
 //
-//	tables := []interface{}{
-//	  map[string]interface{}{
-//	    "range": "A1:C10", "name": "Table1", "style_name": "TableStyleMedium9",
-//	    "show_first_column": true, "show_last_column": false,
-//	    "show_row_stripes": true, "show_column_stripes": false,
+//	tables := []Table{
+//	  {
+//	    Range: "A1:C10", Name: "Table1", StyleName: "TableStyleMedium9",
+//	    ShowFirstColumn: true, ShowLastColumn: false,
+//	    ShowRowStripes: true, ShowColumnStripes: false,
 //	  },
 //	  // Add more tables as needed
 //	}
 //	streamCreateTable(sw, tables)
-func streamCreateTable(sw *excelize.StreamWriter, tables []interface{}) {
-	for _, table := range tables {
-		t := table.(map[string]interface{})
-		showRowStripes := t["show_row_stripes"].(bool)
-		err := sw.AddTable(&excelize.Table{
-			Range:             t["range"].(string),
-			Name:              t["name"].(string),
-			StyleName:         t["style_name"].(string),
-			ShowFirstColumn:   t["show_first_column"].(bool),
-			ShowLastColumn:    t["show_last_column"].(bool),
-			ShowRowStripes:    &showRowStripes,
-			ShowColumnStripes: t["show_column_stripes"].(bool),
-		})
-
+func streamCreateTable(sw *excelize.StreamWriter, tables []Table) {
+	for _, t := range tables {
+		err := sw.AddTable(t.excelizeTable())
 		if err != nil {
 			fmt.Println(err)
 		}
@@ -63,56 +50,49 @@ func streamCreateTable(sw *excelize.StreamWriter, tables []interface{}) {
 
 // createTable adds multiple tables to a specified sheet in an Excel file.
 //
-// This function takes an Excel file object, a sheet name, and a list of tables.
-// Each table is represented by a map of key-value pairs defining its properties.
+// This function takes a sheet name and a list of tables.
 // It iterates over the list of tables and adds each one to the specified sheet using the file's AddTable method.
 // If an error occurs while adding a table, the function prints the error.
 //
 // Args:
 //
-//	file (*excelize.File): The Excel file object to which tables will be added.
 //	sheet (string): The name of the sheet in which to create the tables.
-//	tables ([]interface{}): A slice of maps where each map represents a table's properties.
-//	  The map should contain the following keys:
-//	  - "range" (string): The cell range for the table (e.g., "A1:C10").
-//	  - "name" (string): The name of the table.
-//	  - "style_name" (string): The style name for the table.
-//	  - "show_first_column" (bool): Whether to highlight the first column.
-//	  - "show_last_column" (bool): Whether to highlight the last column.
-//	  - "show_row_stripes" (bool): Whether to display row stripes for better readability.
-//	  - "show_column_stripes" (bool): Whether to display column stripes for better readability.
+//	tables ([]Table): A slice of tables decoded from the sheet payload, see streamCreateTable.
 //
 // Example:
 //
-//	tables := []interface{}{
-//	  map[string]interface{}{
-//	    "range": "A1:C10", "name": "Table1", "style_name": "TableStyleMedium9",
-//	    "show_first_column": true, "show_last_column": false,
-//	    "show_row_stripes": true, "show_column_stripes": false,
+//	tables := []Table{
+//	  {
+//	    Range: "A1:C10", Name: "Table1", StyleName: "TableStyleMedium9",
+//	    ShowFirstColumn: true, ShowLastColumn: false,
+//	    ShowRowStripes: true, ShowColumnStripes: false,
 //	  },
 //	  // Add more tables as needed
 //	}
-//	createTable(file, "Sheet1", tables)
-func (ew *ExcelWriter) createTable(sheet string, tables []interface{}) {
-	for _, table := range tables {
-		t := table.(map[string]interface{})
-		showRowStripes := t["show_row_stripes"].(bool)
-		err := ew.File.AddTable(sheet, &excelize.Table{
-			Range:             t["range"].(string),
-			Name:              t["name"].(string),
-			StyleName:         t["style_name"].(string),
-			ShowFirstColumn:   t["show_first_column"].(bool),
-			ShowLastColumn:    t["show_last_column"].(bool),
-			ShowRowStripes:    &showRowStripes,
-			ShowColumnStripes: t["show_column_stripes"].(bool),
-		})
-
+//	ew.createTable("Sheet1", tables)
+func (ew *ExcelWriter) createTable(sheet string, tables []Table) {
+	for _, t := range tables {
+		err := ew.File.AddTable(sheet, t.excelizeTable())
 		if err != nil {
 			fmt.Println(err)
 		}
 	}
 }
 
+// excelizeTable converts the table payload to an excelize.Table.
+func (t Table) excelizeTable() *excelize.Table {
+	showRowStripes := t.ShowRowStripes
+	return &excelize.Table{
+		Range:             t.Range,
+		Name:              t.Name,
+		StyleName:         t.StyleName,
+		ShowFirstColumn:   t.ShowFirstColumn,
+		ShowLastColumn:    t.ShowLastColumn,
+		ShowRowStripes:    &showRowStripes,
+		ShowColumnStripes: t.ShowColumnStripes,
+	}
+}
+
 // setFileProps sets document properties of the Excel file based on a map of key-value pairs.
 //
 // Args:
@@ -160,41 +140,31 @@ func (ew *ExcelWriter) setProtection(config map[string]interface{}) {
 	}
 }
 
-// setCellWidthAndHeight sets the width and height of cells in the Excel file based on a map of key-value pairs.
+// setCellWidth sets the width of columns in an Excel worksheet using the provided StreamWriter.
 //
 // Args:
 //
-//	file (*excelize.File): The Excel file object.
-//	config (map[string]interface{}): Map containing key-value pairs for cell width and height.
-func setCellWidth(streamWriter *excelize.StreamWriter, config map[string]interface{}) {
-	if config["Width"] == nil {
-		return
-	}
-	width := config["Width"].(map[string]interface{})
-	for col := range width {
-		cidx, _ := strconv.Atoi(col)
-		streamWriter.SetColWidth(cidx, cidx, width[col].(float64))
+//	streamWriter (*excelize.StreamWriter): The StreamWriter of the sheet.
+//	width (map[int]float64): A map of the column index to the column width.
+func setCellWidth(streamWriter *excelize.StreamWriter, width map[int]float64) {
+	for col, value := range width {
+		streamWriter.SetColWidth(col, col, value)
 	}
 }
 
-// getRowHeightMap returns a map of row heights based on a map of key-value pairs.
+// getRowHeightMap returns a map of row heights.
 //
 // Args:
 //
-//	config (map[string]interface{}): Map containing key-value pairs for row heights.
+//	height (map[int]float64): A map of the row index to the row height.
 //
 // Returns:
 //
-//	map[string]excelize.RowOpts: Map of row heights.
-func getRowHeightMap(config map[string]interface{}) map[string]excelize.RowOpts {
-	rowHeightMap := make(map[string]excelize.RowOpts)
-
-	if config["Height"] == nil {
-		return rowHeightMap
-	}
-	height := config["Height"].(map[string]interface{})
-	for row := range height {
-		rowHeightMap[row] = excelize.RowOpts{Height: height[row].(float64), Hidden: false}
+//	map[int]excelize.RowOpts: Map of row heights.
+func getRowHeightMap(height map[int]float64) map[int]excelize.RowOpts {
+	rowHeightMap := make(map[int]excelize.RowOpts, len(height))
+	for row, value := range height {
+		rowHeightMap[row] = excelize.RowOpts{Height: value, Hidden: false}
 	}
 	return rowHeightMap
 }
@@ -204,14 +174,11 @@ func getRowHeightMap(config map[string]interface{}) map[string]excelize.RowOpts
 // Args:
 //
 //	sw (excelize.StreamWriter): The StreamWriter to use for merging cells.
-//	cell ([]interface{}): A slice of cell ranges to merge, where each cell range is
+//	cell ([][2]string): A slice of cell ranges to merge, where each cell range is
 //	    represented as a pair of strings (top-left and bottom-right cells).
-func mergeCell(sw *excelize.StreamWriter, cell []interface{}) {
-	for _, col := range cell {
-		cellRange := col.([]interface{})
-		topLeft := cellRange[0].(string)
-		bottomRight := cellRange[1].(string)
-		sw.MergeCell(topLeft, bottomRight)
+func mergeCell(sw *excelize.StreamWriter, cell [][2]string) {
+	for _, cellRange := range cell {
+		sw.MergeCell(cellRange[0], cellRange[1])
 	}
 }
 
@@ -221,10 +188,10 @@ func mergeCell(sw *excelize.StreamWriter, cell []interface{}) {
 //
 //	file (*excelize.File): The Excelize file.
 //	sheet (string): The name of the sheet to apply the auto filter.
-//	autoFilters ([]interface{}): A slice of cell ranges where the auto filter will be applied.
-func (ew *ExcelWriter) setAutoFilter(sheet string, autoFilters []interface{}) {
+//	autoFilters ([]string): A slice of cell ranges where the auto filter will be applied.
+func (ew *ExcelWriter) setAutoFilter(sheet string, autoFilters []string) {
 	for _, filter := range autoFilters {
-		ew.File.AutoFilter(sheet, filter.(string), []excelize.AutoFilterOptions{})
+		ew.File.AutoFilter(sheet, filter, []excelize.AutoFilterOptions{})
 	}
 }
 
@@ -411,14 +378,11 @@ func (ew *ExcelWriter) groupCol(sheet string, group []interface{}) {
 // Args:
 //
 //	file (*excelize.File): The excelize file.
-//	cell ([]interface{}): A slice of cell ranges to merge, where each cell range is
+//	cell ([][2]string): A slice of cell ranges to merge, where each cell range is
 //	    represented as a pair of strings (top-left and bottom-right cells).
-func (ew *ExcelWriter) mergeCellNormalWriter(sheet string, cell []interface{}) {
-	for _, col := range cell {
-		cellRange := col.([]interface{})
-		topLeft := cellRange[0].(string)
-		bottomRight := cellRange[1].(string)
-		ew.File.MergeCell(sheet, topLeft, bottomRight)
+func (ew *ExcelWriter) mergeCellNormalWriter(sheet string, cell [][2]string) {
+	for _, cellRange := range cell {
+		ew.File.MergeCell(sheet, cellRange[0], cellRange[1])
 	}
 }
 
@@ -428,18 +392,11 @@ func (ew *ExcelWriter) mergeCellNormalWriter(sheet string, cell []interface{}) {
 //
 //	file (*excelize.File): The excelize file.
 //	sheet (string): The name of the worksheet.
-//	config (map[string]interface{}): A map containing column width configurations, where the key is the column
-//	    index as a string and the value is the width as a float64.
-func (ew *ExcelWriter) setCellWidthNormalWriter(sheet string, config map[string]interface{}) {
-	if config["Width"] == nil {
-		return
-	}
-	if width := config["Width"].(map[string]interface{}); width != nil {
-		for col := range width {
-			colIndex, _ := strconv.Atoi(col)
-			colName, _ := excelize.ColumnNumberToName(colIndex)
-			ew.File.SetColWidth(sheet, colName, colName, width[col].(float64))
-		}
+//	width (map[int]float64): A map of the column index to the column width.
+func (ew *ExcelWriter) setCellWidthNormalWriter(sheet string, width map[int]float64) {
+	for col, value := range width {
+		colName, _ := excelize.ColumnNumberToName(col)
+		ew.File.SetColWidth(sheet, colName, colName, value)
 	}
 }
 
@@ -449,16 +406,9 @@ func (ew *ExcelWriter) setCellWidthNormalWriter(sheet string, config map[string]
 //
 //	file (*excelize.File): The excelize file.
 //	sheet (string): The name of the worksheet.
-//	config (map[string]interface{}): A map containing row height configurations, where the key is the row
-//	    index as a string and the value is the height as a float64.
-func (ew *ExcelWriter) setCellHeightNormalWriter(sheet string, config map[string]interface{}) {
-	if config["Height"] == nil {
-		return
-	}
-	if height := config["Height"].(map[string]interface{}); height != nil {
-		for row := range height {
-			rowIndex, _ := strconv.Atoi(row)
-			ew.File.SetRowHeight(sheet, rowIndex, height[row].(float64))
-		}
+//	height (map[int]float64): A map of the row index to the row height.
+func (ew *ExcelWriter) setCellHeightNormalWriter(sheet string, height map[int]float64) {
+	for row, value := range height {
+		ew.File.SetRowHeight(sheet, row, value)
 	}
 }
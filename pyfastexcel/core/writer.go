@@ -7,29 +7,31 @@ import (
 import (
 	"encoding/base64"
 	"fmt"
-	"strconv"
-	"strings"
+	"runtime"
+	"sync"
 
-	"github.com/perimeterx/marshmallow"
 	"github.com/xuri/excelize/v2"
 )
 
-var styleMap map[string]int
-
-type (
-	StyleWrapper struct {
-		Style map[string]map[string]interface{} `json:"Style" binding:"required"`
-	}
-)
-
+// ExcelWriter holds every state of an export. Each export creates its own
+// ExcelWriter and the package keeps no state shared between exports, so the
+// exported functions can be called by several goroutines, or several python
+// threads through the shared library, at the same time.
 type ExcelWriter struct {
 	File       *excelize.File
-	StyleMap   map[string]interface{}
-	Content    map[string]interface{}
+	StyleMap   []StyleSetting
+	Content    map[string]*Sheet
 	FileProps  map[string]interface{}
 	Protection map[string]interface{}
-	SheetOrder []interface{}
+	SheetOrder []string
 	Engine     interface{}
+	// Parallel writes the rows of the stream sheets concurrently.
+	Parallel bool
+	// styleIDs links the style ids of the payload to the style index created in File.
+	styleIDs []int
+	// styleCache holds the style index of the styles created in File, keyed by
+	// their canonical JSON, see CreateStyle.
+	styleCache map[string]int
 }
 
 // WriteExcel takes a JSON string containing file properties, styles,
@@ -46,27 +48,135 @@ type ExcelWriter struct {
 // Panics:
 //   - panics on errors during JSON unmarshalling or cell conversion.
 func WriteExcel(data string) string {
-	var StyleStruct StyleWrapper
-	byteJson := []byte(data)
+	return base64.StdEncoding.EncodeToString(WriteExcelBytes([]byte(data)))
+}
+
+// WriteExcelBytes takes a JSON payload containing file properties, styles,
+// and content and returns the raw bytes of the generated Excel file.
+//
+// Args:
+//
+//	data ([]byte): JSON data representing the Excel file information.
+//
+// Returns:
+//
+//	[]byte: The zip bytes of the generated Excel file.
+//
+// Panics:
+//   - panics on errors during JSON unmarshalling or cell conversion.
+func WriteExcelBytes(data []byte) []byte {
+	writer := newExcelWriter(data)
+	defer writer.File.Close()
+	writer.writeExcel()
 
-	strJson, err := marshmallow.Unmarshal(byteJson, &StyleStruct)
+	buffer, err := writer.File.WriteToBuffer()
 	if err != nil {
 		panic(err)
 	}
-	writer := ExcelWriter{
+	return buffer.Bytes()
+}
+
+// WriteExcelToFile takes a JSON payload containing file properties, styles,
+// and content and writes the generated Excel file directly to the given path,
+// so the zip archive never has to be held in memory by the caller.
+//
+// Args:
+//
+//	data ([]byte): JSON data representing the Excel file information.
+//	path (string): The destination path of the Excel file.
+//
+// Returns:
+//
+//	error: Any error encountered while saving the file.
+//
+// Panics:
+//   - panics on errors during JSON unmarshalling or cell conversion.
+func WriteExcelToFile(data []byte, path string) error {
+	writer := newExcelWriter(data)
+	defer writer.File.Close()
+	writer.writeExcel()
+
+	return writer.File.SaveAs(path)
+}
+
+// WriteExcelFiles writes several Excel files concurrently on a pool of
+// goroutines, each payload to the path with the same index.
+//
+// Args:
+//
+//	payloads ([][]byte): The JSON or MessagePack payloads of the Excel files.
+//	paths ([]string): The destination paths of the Excel files.
+//	workers (int): The maximum number of files written at the same time,
+//	               GOMAXPROCS if it is not positive.
+//
+// Returns:
+//
+//	[]error: The error of each file, nil if the file was written.
+//
+// Notes:
+//   - A panic while writing a file is recovered and returned as its error, so
+//     it does not stop the other files.
+func WriteExcelFiles(payloads [][]byte, paths []string, workers int) []error {
+	errs := make([]error, len(payloads))
+	if workers <= 0 {
+		workers = runtime.GOMAXPROCS(0)
+	}
+	if workers > len(payloads) {
+		workers = len(payloads)
+	}
+
+	jobs := make(chan int)
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for i := range jobs {
+				errs[i] = writeExcelFile(payloads[i], paths[i])
+			}
+		}()
+	}
+	for i := range payloads {
+		jobs <- i
+	}
+	close(jobs)
+	wg.Wait()
+	return errs
+}
+
+// writeExcelFile writes an Excel file and converts a panic into an error.
+func writeExcelFile(data []byte, path string) (err error) {
+	defer func() {
+		if r := recover(); r != nil {
+			err = fmt.Errorf("Recovered from panic: %v", r)
+		}
+	}()
+	return WriteExcelToFile(data, path)
+}
+
+// newExcelWriter decodes the JSON payload, resolves the pooled strings of the
+// cells and returns an ExcelWriter with a new excelize.File ready to be written.
+func newExcelWriter(data []byte) *ExcelWriter {
+	var payload Payload
+	decodePayload(data, &payload)
+	for _, sheet := range payload.Content {
+		if sheet != nil {
+			sheet.resolveStrings(payload.Strings)
+		}
+	}
+	return &ExcelWriter{
 		File:       excelize.NewFile(),
-		StyleMap:   strJson["style"].(map[string]interface{}),
-		Content:    strJson["content"].(map[string]interface{}),
-		FileProps:  strJson["file_props"].(map[string]interface{}),
-		Protection: strJson["protection"].(map[string]interface{}),
-		SheetOrder: strJson["sheet_order"].([]interface{}),
-		// Engine:     strJson["engine"],
+		StyleMap:   payload.Style,
+		Content:    payload.Content,
+		FileProps:  payload.FileProps,
+		Protection: payload.Protection,
+		SheetOrder: payload.SheetOrder,
+		Parallel:   payload.Parallel,
 	}
-	return writer.writeExcel()
 }
 
-func (ew *ExcelWriter) writeExcel() string {
-	styleMap = CreateStyle(ew.File, ew.StyleMap)
+func (ew *ExcelWriter) writeExcel() {
+	ew.addStyles(ew.StyleMap)
 	ew.setFileProps(ew.FileProps)
 	if len(ew.Protection) != 0 {
 		ew.setProtection(ew.Protection)
@@ -74,15 +184,18 @@ func (ew *ExcelWriter) writeExcel() string {
 
 	sheetCount := 1
 	hasSheet1 := false
-	var pivotTableList [][]interface{}
 	for s := range ew.Content {
 		if s == "Sheet1" {
 			hasSheet1 = true
 		}
 	}
+	// Every sheet is created and prepared before the rows of the stream sheets
+	// are generated, and finished afterwards, so the operations on the shared
+	// File happen in the same order in the sequential and the parallel mode.
+	streamSheets := make(map[string]*streamSheet)
+	jobs := make([]*streamSheet, 0, len(ew.SheetOrder))
 	for _, sheet := range ew.SheetOrder {
-		sheet := sheet.(string)
-		sheetData := ew.Content[sheet].(map[string]interface{})
+		sheetData := ew.Content[sheet]
 
 		if !hasSheet1 && sheetCount == 1 {
 			ew.File.SetSheetName("Sheet1", sheet)
@@ -91,26 +204,38 @@ func (ew *ExcelWriter) writeExcel() string {
 			ew.File.NewSheet(sheet)
 			sheetCount++
 		}
-		if sheetData["WriterEngine"] == "NormalWriter" {
+		if sheetData.WriterEngine == "NormalWriter" {
 			ew.performNormalWrite(sheet, sheetData)
 			// Excelize should create table with the existed row.
-			ew.createTable(sheet, sheetData["Table"].([]interface{}))
+			ew.createTable(sheet, sheetData.Table)
 		} else {
-			streamWriter := ew.performStreamWrite(sheet, sheetData)
+			streamWriter, rowHeightMap := ew.prepareStreamWrite(sheet, sheetData)
+			job := &streamSheet{data: sheetData, streamWriter: streamWriter, rowHeightMap: rowHeightMap}
+			streamSheets[sheet] = job
+			jobs = append(jobs, job)
+		}
+	}
+
+	ew.writeStreamSheets(jobs)
+
+	var pivotTableList [][]interface{}
+	for _, sheet := range ew.SheetOrder {
+		sheetData := ew.Content[sheet]
+		if job, ok := streamSheets[sheet]; ok {
 			// Create Stream Table
 			// Excelize should create table with the existed row.
-			streamCreateTable(streamWriter, sheetData["Table"].([]interface{}))
+			streamCreateTable(job.streamWriter, sheetData.Table)
 
-			if err := streamWriter.Flush(); err != nil {
+			if err := job.streamWriter.Flush(); err != nil {
 				fmt.Println(err)
 			}
 		}
 		// To prevent the pivot table from being created before the data is written
 		// we store the pivot table data in a list and create it after the data is written
-		pivotTableList = append(pivotTableList, sheetData["PivotTable"].([]interface{}))
+		pivotTableList = append(pivotTableList, sheetData.PivotTable)
 
 		// Set Sheet Visible
-		if err := ew.File.SetSheetVisible(sheet, sheetData["SheetVisible"].(bool)); err != nil {
+		if err := ew.File.SetSheetVisible(sheet, sheetData.SheetVisible); err != nil {
 			fmt.Println(err)
 		}
 
@@ -119,157 +244,271 @@ func (ew *ExcelWriter) writeExcel() string {
 			ew.createPivotTable(pivot)
 		}
 	}
+}
 
-	// Save data in buffer and encode binary data to base64
-	buffer, _ := ew.File.WriteToBuffer()
-	byteResults := []byte(buffer.Bytes())
-	encodedString := base64.StdEncoding.EncodeToString(byteResults)
+// streamSheet is a sheet written by the excelize.StreamWriter, with the
+// settings returned by prepareStreamWrite.
+type streamSheet struct {
+	data         *Sheet
+	streamWriter *excelize.StreamWriter
+	rowHeightMap map[int]excelize.RowOpts
+}
 
-	return encodedString
+// writeStreamSheets writes the rows of the stream sheets. In the parallel mode
+// every sheet is written in its own goroutine, at most GOMAXPROCS at a time.
+//
+// Args:
+//
+//	sheets ([]*streamSheet): The prepared stream sheets.
+//
+// Notes:
+//   - Generating the rows of a sheet only touches its own StreamWriter, the
+//     styles are created before and the shared strings table is not used by
+//     the StreamWriter, so the output does not depend on the mode.
+//
+// Panics:
+//   - re-panics on the calling goroutine if writing any sheet panicked.
+func (ew *ExcelWriter) writeStreamSheets(sheets []*streamSheet) {
+	if !ew.Parallel || len(sheets) < 2 {
+		for _, s := range sheets {
+			ew.writeStreamSheet(s)
+		}
+		return
+	}
+
+	var (
+		wg         sync.WaitGroup
+		once       sync.Once
+		panicValue interface{}
+	)
+	limit := make(chan struct{}, runtime.GOMAXPROCS(0))
+	for _, s := range sheets {
+		wg.Add(1)
+		limit <- struct{}{}
+		go func(s *streamSheet) {
+			defer func() {
+				// A panic can not be recovered by the caller from another goroutine
+				if r := recover(); r != nil {
+					once.Do(func() { panicValue = r })
+				}
+				<-limit
+				wg.Done()
+			}()
+			ew.writeStreamSheet(s)
+		}(s)
+	}
+	wg.Wait()
+	if panicValue != nil {
+		panic(panicValue)
+	}
+}
+
+// writeStreamSheet writes the rows of a stream sheet and releases them.
+func (ew *ExcelWriter) writeStreamSheet(s *streamSheet) {
+	if s.data.Sparse != nil {
+		ew.streamSparse(s.streamWriter, s.data.sparseCells(), s.rowHeightMap)
+		s.data.Sparse = nil
+		return
+	}
+	ew.streamRows(s.streamWriter, s.data.cells(), 1, s.rowHeightMap)
+	// The rows are no longer needed once written
+	s.data.Data = nil
 }
 
-// streamWriter writes content to different sheets in the Excel file based on provided data.
+// prepareStreamWrite applies the sheet settings that have to be written before
+// the rows and creates the excelize.StreamWriter of the sheet.
 //
 // Args:
 //
-//	file (*excelize.File): The Excel file object.
-//	data (map[string]interface{}): Map containing data for each sheet.
-func (ew *ExcelWriter) performStreamWrite(sheet string, sheetData map[string]interface{}) *excelize.StreamWriter {
+//	sheet (string): The name of the sheet.
+//	sheetData (*Sheet): The settings of the sheet.
+//
+// Returns:
+//
+//	*excelize.StreamWriter: The stream writer of the sheet.
+//	map[int]excelize.RowOpts: The row options keyed by the row number.
+func (ew *ExcelWriter) prepareStreamWrite(sheet string, sheetData *Sheet) (*excelize.StreamWriter, map[int]excelize.RowOpts) {
 	// Add Chart
-	ew.addChart(sheet, sheetData["Chart"].([]interface{}))
+	ew.addChart(sheet, sheetData.Chart)
 
 	// Set DataValidations
-	ew.setDataValidation(sheet, sheetData["DataValidation"].([]interface{}))
+	ew.setDataValidation(sheet, sheetData.DataValidation)
 
 	// Add Comment
-	ew.addComment(sheet, sheetData["Comment"].([]interface{}))
+	ew.addComment(sheet, sheetData.Comment)
 
 	// Set Panes
-	panes := ew.Content[sheet].(map[string]interface{})["Panes"].(map[string]interface{})
-	ew.setPanes(sheet, panes)
+	ew.setPanes(sheet, sheetData.Panes)
 
 	// Set AutoFilters
-	autoFilters := ew.Content[sheet].(map[string]interface{})["AutoFilter"].([]interface{})
-	ew.setAutoFilter(sheet, autoFilters)
+	ew.setAutoFilter(sheet, sheetData.AutoFilter)
 
 	streamWriter, _ := ew.File.NewStreamWriter(sheet)
 
 	// CellWidtrh should be set before SetRow
 	// Height should be set with SetRow in StreamWriter
-	setCellWidth(streamWriter, sheetData)
-	rowHeightMap := getRowHeightMap(sheetData)
-
-	mergeCell(streamWriter, sheetData["MergeCells"].([]interface{}))
-
-	// Write Data
-	startedRow := 1
-	excelData := sheetData["Data"].([]interface{})
-	if sheetData["NoStyle"] == false {
-		for i, rowData := range excelData {
-			for j, cellData := range rowData.([]interface{}) {
-				if cellData == nil {
-					continue
-				}
-				excelData[i].([]interface{})[j] = createCell(cellData.([]interface{}))
+	setCellWidth(streamWriter, sheetData.Width)
+	rowHeightMap := getRowHeightMap(sheetData.Height)
+	ew.streamLineStyles(streamWriter, sheetData, rowHeightMap)
+
+	mergeCell(streamWriter, sheetData.MergeCells)
+	return streamWriter, rowHeightMap
+}
+
+// streamRows writes rows with the excelize.StreamWriter.
+//
+// Args:
+//
+//	streamWriter (*excelize.StreamWriter): The stream writer of the sheet.
+//	excelData ([]Row): The rows to write.
+//	startedRow (int): The row number of the first row in excelData.
+//	rowHeightMap (map[int]excelize.RowOpts): The row options keyed by the row number.
+//
+// Notes:
+//   - Rows should be written in ascending order, as required by the StreamWriter.
+func (ew *ExcelWriter) streamRows(
+	streamWriter *excelize.StreamWriter,
+	excelData []Row,
+	startedRow int,
+	rowHeightMap map[int]excelize.RowOpts,
+) {
+	// SetRow does not keep the slice, so the same buffer is reused by every row.
+	var row []interface{}
+	for i, rowData := range excelData {
+		row = row[:0]
+		for j := range rowData {
+			c := &rowData[j]
+			if c.Kind == cellNull && c.Style == noStyle {
+				row = append(row, nil)
+				continue
 			}
+			row = append(row, ew.createCell(c))
 		}
+		streamSetRow(streamWriter, 1, i+startedRow, row, rowHeightMap)
 	}
+}
 
-	for i, rowData := range excelData {
-		row := rowData.([]interface{})
-		cell, _ := excelize.CoordinatesToCellName(1, i+startedRow)
-
-		// Write cell with Height if rowHeightMap key found
-		if rowHeight, ok := rowHeightMap[strconv.Itoa(i+startedRow)]; ok {
-			if err := streamWriter.SetRow(cell, row, rowHeight); err != nil {
-				fmt.Println(err)
-			}
-		} else {
-			if err := streamWriter.SetRow(cell, row); err != nil {
-				fmt.Println(err)
-			}
+// streamSetRow writes the values of a row from the given column with the
+// excelize.StreamWriter, and the row options if the row is in rowHeightMap.
+func streamSetRow(
+	streamWriter *excelize.StreamWriter,
+	col, row int,
+	values []interface{},
+	rowHeightMap map[int]excelize.RowOpts,
+) {
+	cell, _ := excelize.CoordinatesToCellName(col, row)
+
+	// Write cell with Height if rowHeightMap key found
+	if rowHeight, ok := rowHeightMap[row]; ok {
+		if err := streamWriter.SetRow(cell, values, rowHeight); err != nil {
+			fmt.Println(err)
 		}
+	} else {
+		if err := streamWriter.SetRow(cell, values); err != nil {
+			fmt.Println(err)
+		}
+	}
+}
+
+// performNormalWrite writes the content of a sheet with the excelize.File cell setters.
+//
+// Args:
+//
+//	sheet (string): The name of the sheet.
+//	sheetData (*Sheet): The settings and data of the sheet.
+func (ew *ExcelWriter) performNormalWrite(sheet string, sheetData *Sheet) {
+	ew.prepareNormalWrite(sheet, sheetData)
+	if sheetData.Sparse != nil {
+		ew.writeSparse(sheet, sheetData.sparseCells())
+		sheetData.Sparse = nil
+		return
 	}
-	return streamWriter
+	ew.writeRows(sheet, sheetData.cells(), 1)
+	sheetData.Data = nil
 }
 
-// normalWriter writes content to different sheets in the Excel file based on provided data.
+// prepareNormalWrite applies the sheet settings of a sheet written by the NormalWriter.
 //
 // Args:
 //
-//	file (*excelize.File): The Excel file object.
-//	data (map[string]interface{}): Map containing data for each sheet.
-func (ew *ExcelWriter) performNormalWrite(sheet string, sheetData map[string]interface{}) {
+//	sheet (string): The name of the sheet.
+//	sheetData (*Sheet): The settings of the sheet.
+func (ew *ExcelWriter) prepareNormalWrite(sheet string, sheetData *Sheet) {
 
 	// Add Chart
-	ew.addChart(sheet, sheetData["Chart"].([]interface{}))
+	ew.addChart(sheet, sheetData.Chart)
 
 	// Set DataValidations
-	ew.setDataValidation(sheet, sheetData["DataValidation"].([]interface{}))
+	ew.setDataValidation(sheet, sheetData.DataValidation)
 
 	// Add Comment
-	ew.addComment(sheet, sheetData["Comment"].([]interface{}))
+	ew.addComment(sheet, sheetData.Comment)
 
 	// Set Panes
-	panes := ew.Content[sheet].(map[string]interface{})["Panes"].(map[string]interface{})
-	ew.setPanes(sheet, panes)
+	ew.setPanes(sheet, sheetData.Panes)
 
 	// Set AutoFilters
-	autoFilters := ew.Content[sheet].(map[string]interface{})["AutoFilter"].([]interface{})
-	ew.setAutoFilter(sheet, autoFilters)
+	ew.setAutoFilter(sheet, sheetData.AutoFilter)
 
 	// Set Cell Width and Height
-	ew.setCellWidthNormalWriter(sheet, sheetData)
-	ew.setCellHeightNormalWriter(sheet, sheetData)
+	ew.setCellWidthNormalWriter(sheet, sheetData.Width)
+	ew.setCellHeightNormalWriter(sheet, sheetData.Height)
 
 	// Merge Cell
-	ew.mergeCellNormalWriter(sheet, sheetData["MergeCells"].([]interface{}))
+	ew.mergeCellNormalWriter(sheet, sheetData.MergeCells)
+
+	// Styles of the columns and the rows, before the styles of the cells
+	ew.setLineStylesNormalWriter(sheet, sheetData)
 
 	// Group col and row
-	if sheetData["GroupedRow"] != nil {
-		ew.groupRow(sheet, sheetData["GroupedRow"].([]interface{}))
+	if sheetData.GroupedRow != nil {
+		ew.groupRow(sheet, sheetData.GroupedRow)
 	}
-	if sheetData["GroupedCol"] != nil {
-		ew.groupCol(sheet, sheetData["GroupedCol"].([]interface{}))
+	if sheetData.GroupedCol != nil {
+		ew.groupCol(sheet, sheetData.GroupedCol)
 	}
+}
 
-	// Write Data
-	startedRow := 1
-	excelData := sheetData["Data"].([]interface{})
-	for i, rowData := range excelData {
-		row := rowData.([]interface{})
-
-		for col, item := range row {
-			colCell, _ := excelize.CoordinatesToCellName(col+startedRow, i+startedRow)
-			v := item.([]interface{})
-			if len(v) == 0 {
-				if err := ew.File.SetCellValue(sheet, colCell, ""); err != nil {
-					fmt.Println(err)
-				}
-				if err := ew.File.SetCellStyle(sheet, colCell, colCell, styleMap["DEFAULT_STYLE"]); err != nil {
-					fmt.Println(err)
-				}
-			} else {
-				switch value := v[0].(type) {
-				case string:
-					if strings.HasPrefix(value, "=") {
-						if err := ew.File.SetCellFormula(sheet, colCell, value); err != nil {
-							fmt.Println(err)
-						}
-					} else {
-						if err := ew.File.SetCellValue(sheet, colCell, value); err != nil {
-							fmt.Println(err)
-						}
-					}
-				default:
-					if err := ew.File.SetCellValue(sheet, colCell, value); err != nil {
-						fmt.Println(err)
-					}
-				}
-				if err := ew.File.SetCellStyle(sheet, colCell, colCell, styleMap[item.([]interface{})[1].(string)]); err != nil {
-					fmt.Println(err)
-				}
-			}
+// writeRows writes rows cell by cell with the excelize.File cell setters.
+//
+// Args:
+//
+//	sheet (string): The name of the sheet.
+//	excelData ([]Row): The rows to write.
+//	startedRow (int): The row number of the first row in excelData.
+func (ew *ExcelWriter) writeRows(sheet string, excelData []Row, startedRow int) {
+	for i, row := range excelData {
+		for col := range row {
+			ew.writeCell(sheet, col+1, i+startedRow, &row[col])
 		}
 	}
 }
+
+// writeCell writes a cell with the excelize.File cell setters.
+//
+// Args:
+//
+//	sheet (string): The name of the sheet.
+//	col (int): The column number of the cell.
+//	row (int): The row number of the cell.
+//	c (*Cell): The cell to write.
+func (ew *ExcelWriter) writeCell(sheet string, col, row int, c *Cell) {
+	if c.Kind == cellNull && c.Style == noStyle {
+		return
+	}
+	colCell, _ := excelize.CoordinatesToCellName(col, row)
+	switch c.Kind {
+	case cellFormula:
+		if err := ew.File.SetCellFormula(sheet, colCell, c.Str); err != nil {
+			fmt.Println(err)
+		}
+	case cellNull:
+	default:
+		if err := ew.File.SetCellValue(sheet, colCell, c.value()); err != nil {
+			fmt.Println(err)
+		}
+	}
+	if err := ew.File.SetCellStyle(sheet, colCell, colCell, ew.styleID(c.Style)); err != nil {
+		fmt.Println(err)
+	}
+}
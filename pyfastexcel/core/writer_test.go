@@ -1,9 +1,16 @@
 package core
 
 import (
+	"archive/zip"
+	"bytes"
 	"encoding/base64"
 	"encoding/json"
 	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"reflect"
+	"sync"
 	"testing"
 )
 
@@ -12,8 +19,8 @@ var dataNormalWriter map[string]interface{}
 
 func init() {
 	data = map[string]interface{}{
-		"style": map[string]interface{}{
-			"style1": map[string]interface{}{
+		"style": []interface{}{
+			map[string]interface{}{
 				"Font": map[string]interface{}{
 					"Bold": true,
 				},
@@ -79,9 +86,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 				},
 				"Height":         map[string]int{"3": 252},
 				"Width":          map[string]int{"1": 25, "2": 26, "3": 6},
@@ -104,9 +111,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}, {}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}, {}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}, {}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}, {}},
 				},
 				"Height":     map[string]int{"3": 252},
 				"MergeCells": [][]interface{}{{"A1", "A2"}, {"B2", "C3"}},
@@ -128,9 +135,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 				},
 				"Width":          map[string]int{"1": 25, "2": 26, "3": 6},
 				"MergeCells":     []interface{}{},
@@ -149,9 +156,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 				},
 				"MergeCells": [][]interface{}{{"A1", "A2"}, {"B2", "C3"}},
 				"AutoFilter": []interface{}{"A1:C1"},
@@ -173,8 +180,8 @@ func init() {
 		},
 	}
 	dataNormalWriter = map[string]interface{}{
-		"style": map[string]interface{}{
-			"style1": map[string]interface{}{
+		"style": []interface{}{
+			map[string]interface{}{
 				"Font": map[string]interface{}{
 					"Bold": true,
 				},
@@ -241,9 +248,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}, {}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}, {}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}, {}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}, {}},
 				},
 				"Height":         map[string]int{"3": 252},
 				"Width":          map[string]int{"1": 25, "2": 26, "3": 6},
@@ -268,9 +275,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 				},
 				"Height":     map[string]int{"3": 252},
 				"MergeCells": [][]interface{}{{"A1", "A2"}, {"B2", "C3"}},
@@ -294,9 +301,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 				},
 				"Width":          map[string]int{"1": 25, "2": 26, "3": 6},
 				"MergeCells":     []interface{}{},
@@ -317,9 +324,9 @@ func init() {
 				"Header": [][]string{
 					{"Column1", "Column2", "Column3"},
 				},
-				"Data": [][][]string{
-					{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-					{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+				"Data": [][][]interface{}{
+					{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+					{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 				},
 				"MergeCells": [][]interface{}{{"A1", "A2"}, {"B2", "C3"}},
 				"AutoFilter": []interface{}{"A1:C1"},
@@ -371,9 +378,9 @@ func TestWriteExcel2(t *testing.T) {
 			"Header": [][]string{
 				{"Column1", "Column2", "Column3"},
 			},
-			"Data": [][][]string{
-				{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-				{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+			"Data": [][][]interface{}{
+				{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+				{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 			},
 			"MergeCells":     [][]interface{}{{"A1", "A2"}, {"B2", "C3"}},
 			"AutoFilter":     []interface{}{"A1:C1"},
@@ -435,9 +442,9 @@ func TestWriteExcel2NormalWriter(t *testing.T) {
 			"Header": [][]string{
 				{"Column1", "Column2", "Column3"},
 			},
-			"Data": [][][]string{
-				{{"Data1", "style1"}, {"Data2", "style1"}, {"Data3", "style1"}},
-				{{"Data4", "style1"}, {"Data5", "style1"}, {"Data6", "style1"}},
+			"Data": [][][]interface{}{
+				{{"Data1", 0}, {"Data2", 0}, {"Data3", 0}},
+				{{"Data4", 0}, {"Data5", 0}, {"Data6", 0}},
 			},
 			"MergeCells":     [][]interface{}{{"A1", "A2"}, {"B2", "C3"}},
 			"AutoFilter":     []interface{}{"A1:C1"},
@@ -471,3 +478,187 @@ func TestWriteExcel2NormalWriter(t *testing.T) {
 	}
 
 }
+
+func TestWriteExcelBytes(t *testing.T) {
+	jsonData, err := json.Marshal(data)
+	if err != nil {
+		t.Fatalf("Failed to marshal data: %v", err)
+	}
+
+	rawExcel := WriteExcelBytes(jsonData)
+	encodedExcel := WriteExcel(string(jsonData))
+	decodedExcel, err := base64.StdEncoding.DecodeString(encodedExcel)
+	if err != nil {
+		t.Fatalf("Failed to decode encoded Excel data: %v", err)
+	}
+
+	if len(rawExcel) == 0 {
+		t.Fatal("Raw Excel data is empty")
+	}
+	if string(rawExcel[:2]) != "PK" || string(decodedExcel[:2]) != "PK" {
+		t.Error("Excel data is not a zip archive")
+	}
+}
+
+func TestWriteExcelToFile(t *testing.T) {
+	jsonData, err := json.Marshal(data)
+	if err != nil {
+		t.Fatalf("Failed to marshal data: %v", err)
+	}
+
+	path := filepath.Join(t.TempDir(), "test.xlsx")
+	if err := WriteExcelToFile(jsonData, path); err != nil {
+		t.Fatalf("Failed to write Excel file: %v", err)
+	}
+
+	info, err := os.Stat(path)
+	if err != nil {
+		t.Fatalf("Excel file was not created: %v", err)
+	}
+	if info.Size() == 0 {
+		t.Error("Excel file is empty")
+	}
+}
+
+// readZipEntries returns the content of every entry of a zip archive. The
+// order of the entries is not compared, since excelize writes the stream
+// sheets in the order of a map.
+func readZipEntries(t *testing.T, raw []byte) map[string]string {
+	t.Helper()
+	reader, err := zip.NewReader(bytes.NewReader(raw), int64(len(raw)))
+	if err != nil {
+		t.Fatalf("Failed to read zip archive: %v", err)
+	}
+	entries := make(map[string]string, len(reader.File))
+	for _, file := range reader.File {
+		rc, err := file.Open()
+		if err != nil {
+			t.Fatalf("Failed to open %s: %v", file.Name, err)
+		}
+		content, err := io.ReadAll(rc)
+		rc.Close()
+		if err != nil {
+			t.Fatalf("Failed to read %s: %v", file.Name, err)
+		}
+		entries[file.Name] = string(content)
+	}
+	return entries
+}
+
+func TestWriteExcelParallel(t *testing.T) {
+	content := map[string]interface{}{}
+	order := []interface{}{}
+	for i, engine := range []string{"StreamWriter", "NormalWriter", "StreamWriter", "StreamWriter"} {
+		rows := [][]interface{}{{"Column1", "Column2"}}
+		for r := 0; r < 200; r++ {
+			rows = append(rows, []interface{}{[]interface{}{fmt.Sprintf("Data%d", r), 0}, r * i})
+		}
+		sheet := fmt.Sprintf("Sheet%d", i+1)
+		content[sheet] = map[string]interface{}{
+			"Data":         rows,
+			"MergeCells":   [][]interface{}{{"A202", "B203"}},
+			"Width":        map[string]interface{}{"1": 20},
+			"Height":       map[string]interface{}{"2": 30},
+			"Table":        []interface{}{map[string]interface{}{"range": "A1:B201", "name": fmt.Sprintf("Table%d", i)}},
+			"SheetVisible": true,
+			"WriterEngine": engine,
+		}
+		order = append(order, sheet)
+	}
+	payload := map[string]interface{}{
+		"content":     content,
+		"style":       data["style"],
+		"file_props":  data["file_props"],
+		"protection":  map[string]interface{}{},
+		"sheet_order": order,
+	}
+
+	sequentialData, _ := json.Marshal(payload)
+	payload["parallel"] = true
+	parallelData, _ := json.Marshal(payload)
+
+	sequential := readZipEntries(t, WriteExcelBytes(sequentialData))
+	parallel := readZipEntries(t, WriteExcelBytes(parallelData))
+	if !reflect.DeepEqual(sequential, parallel) {
+		t.Error("The parallel output differs from the sequential output")
+	}
+}
+
+func TestWriteExcelFiles(t *testing.T) {
+	jsonData, err := json.Marshal(data)
+	if err != nil {
+		t.Fatalf("Failed to marshal data: %v", err)
+	}
+
+	dir := t.TempDir()
+	payloads := [][]byte{jsonData, []byte(`{"style": [`), jsonData}
+	paths := []string{
+		filepath.Join(dir, "a.xlsx"),
+		filepath.Join(dir, "b.xlsx"),
+		filepath.Join(dir, "c.xlsx"),
+	}
+	errs := WriteExcelFiles(payloads, paths, 2)
+	if len(errs) != 3 {
+		t.Fatalf("Expected 3 results but got %d", len(errs))
+	}
+	if errs[1] == nil {
+		t.Error("Expected an error for the invalid payload")
+	}
+	for _, i := range []int{0, 2} {
+		if errs[i] != nil {
+			t.Errorf("Failed to write Excel file: %v", errs[i])
+		}
+		if info, err := os.Stat(paths[i]); err != nil || info.Size() == 0 {
+			t.Errorf("Excel file %s was not created", paths[i])
+		}
+	}
+	if len(WriteExcelFiles(nil, nil, 0)) != 0 {
+		t.Error("Expected no result without payload")
+	}
+}
+
+func TestWriteExcelConcurrent(t *testing.T) {
+	// Each payload uses a different number of styles, so a style id shared
+	// between the exports would end up in the wrong file.
+	payloads := make([][]byte, 8)
+	for i := range payloads {
+		styles := []interface{}{}
+		for j := 0; j <= i; j++ {
+			styles = append(styles, data["style"].([]interface{})[0])
+		}
+		payloads[i], _ = json.Marshal(map[string]interface{}{
+			"content": map[string]interface{}{
+				"Sheet1": map[string]interface{}{
+					"Data":         [][]interface{}{{[]interface{}{"Data", i}}},
+					"SheetVisible": true,
+					"WriterEngine": "StreamWriter",
+				},
+			},
+			"style":       styles,
+			"file_props":  data["file_props"],
+			"protection":  map[string]interface{}{},
+			"sheet_order": []interface{}{"Sheet1"},
+		})
+	}
+
+	expected := make([]map[string]string, len(payloads))
+	for i, payload := range payloads {
+		expected[i] = readZipEntries(t, WriteExcelBytes(payload))
+	}
+
+	results := make([][]byte, len(payloads))
+	var wg sync.WaitGroup
+	for i := range payloads {
+		wg.Add(1)
+		go func(i int) {
+			defer wg.Done()
+			results[i] = WriteExcelBytes(payloads[i])
+		}(i)
+	}
+	wg.Wait()
+	for i, result := range results {
+		if !reflect.DeepEqual(readZipEntries(t, result), expected[i]) {
+			t.Errorf("Concurrent export %d differs from the sequential export", i)
+		}
+	}
+}
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .storage import DATE_FORMAT, DATETIME_FORMAT, TIMEDELTA_FORMAT, ConvertedColumn
+from .utils import excel_serial
+
+# The day 0 of the Excel serial numbers, see utils.excel_serial().
+_EXCEL_EPOCH = np.datetime64('1899-12-30', 'ns')
+_ONE_DAY = np.timedelta64(1, 'D')
+
+
+def convert_column(series: pd.Series) -> ConvertedColumn | None:
+    """
+    Converts a column of a DataFrame into values that can be sent as a raw
+    buffer to the shared library.
+
+    Args:
+        series (pandas.Series): The column.
+
+    Returns:
+        ConvertedColumn | None: The converted column, or None if the column
+            should be written cell by cell, e.g. a column of mixed objects.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return _convert_categorical(series)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return _convert_datetime(series)
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        days = series.to_numpy(dtype='timedelta64[ns]') / _ONE_DAY
+        return ConvertedColumn(days, number_format=TIMEDELTA_FORMAT)
+    if pd.api.types.is_bool_dtype(dtype):
+        if series.hasnans:
+            return None
+        return ConvertedColumn(series.to_numpy(dtype=bool))
+    if pd.api.types.is_numeric_dtype(dtype):
+        if isinstance(dtype, np.dtype):
+            return ConvertedColumn(series.to_numpy())
+        # The nullable dtypes, e.g. Int64 and Float64.
+        return ConvertedColumn(series.to_numpy(dtype='float64', na_value=np.nan))
+    return _convert_object(series)
+
+
+def _convert_datetime(series: pd.Series) -> ConvertedColumn | None:
+    if getattr(series.dtype, 'tz', None) is not None:
+        # Excel has no time zone, the local time is written.
+        series = series.dt.tz_localize(None)
+    values = series.to_numpy(dtype='datetime64[ns]')
+    serials = excel_serial((values - _EXCEL_EPOCH) / _ONE_DAY)
+    if (serials < 1).any():
+        # The dates before 1900 are written cell by cell as strings.
+        return None
+    times = values[~np.isnat(values)].astype('int64') % (24 * 3600 * 10**9)
+    number_format = DATETIME_FORMAT if times.any() else DATE_FORMAT
+    return ConvertedColumn(serials, number_format=number_format)
+
+
+def _convert_categorical(series: pd.Series) -> ConvertedColumn | None:
+    categories = series.cat.categories
+    if pd.api.types.infer_dtype(categories, skipna=True) == 'string':
+        # Every category is sent once, and the cells are sent as codes.
+        return ConvertedColumn(series.cat.codes.to_numpy(), strings=list(categories))
+    return convert_column(pd.Series(np.asarray(series), name=series.name))
+
+
+def _convert_object(series: pd.Series) -> ConvertedColumn | None:
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ('string', 'empty'):
+        codes, uniques = pd.factorize(series)
+        return ConvertedColumn(codes, strings=[str(value) for value in uniques])
+    if inferred in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+        return ConvertedColumn(series.to_numpy(dtype='float64', na_value=np.nan))
+    if inferred == 'boolean' and not series.hasnans:
+        return ConvertedColumn(series.to_numpy(dtype=bool))
+    if inferred in ('datetime', 'datetime64', 'date'):
+        try:
+            return _convert_datetime(pd.Series(pd.to_datetime(series)))
+        except (TypeError, ValueError):
+            # e.g. the datetimes of several time zones
+            return None
+    return None
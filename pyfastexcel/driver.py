@@ -1,19 +1,20 @@
 from __future__ import annotations
 
-import base64
 import ctypes
 import logging
+import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import overload
-
-import msgspec
+from typing import Any, Literal, overload
 
 from ._typing import Writable
 from .logformatter import formatter
 from .manager import StyleManager
+from .session import ExportSession
+from .storage import ColumnarStorage, SparseStorage, StringPool
 from .style import CustomStyle
+from .utils import encode_payload
 from .validators import TableFinalValidation
 from .worksheet import WorkSheet
 
@@ -35,6 +36,11 @@ class ExcelDriver:
         _FILE_PROPS (dict[str, str]): Default file properties for the Excel
         file.
         _PROTECT_ALGORITHM (tuple[str]): Algorithm for the workbook protection
+        WIRE_FORMAT (str): The encoding of the payload sent to the shared
+        library, 'json' or 'msgpack'.
+        PARALLEL_SHEETS (bool): Writes the rows of the sheets using the
+        StreamWriter concurrently in the shared library. The output is the
+        same as the sequential export.
     """
 
     _FILE_PROPS = {
@@ -63,8 +69,15 @@ class ExcelDriver:
         'SHA-512',
     )
     DEBUG = False
-
-    def __init__(self, pre_allocate: dict[str, int] = None, plain_data: list[list[str]] = None):
+    WIRE_FORMAT = 'json'
+    PARALLEL_SHEETS = False
+
+    def __init__(
+        self,
+        pre_allocate: dict[str, int] = None,
+        plain_data: list[list[str]] = None,
+        storage: Literal['list', 'columnar', 'sparse'] = 'list',
+    ):
         """
         Initializes the Workbook with default settings and initializes Sheet1.
 
@@ -77,16 +90,23 @@ class ExcelDriver:
                 keys specifying the dimensions for pre-allocating data in Sheet1.
             plain_data (list[list[str]], optional): A 2D list of strings representing initial data
                 to populate Sheet1.
+            storage (Literal['list', 'columnar', 'sparse']): The storage of the cells of Sheet1,
+                see WorkSheet.
         """
+        self.style = StyleManager()
         self.workbook = {
-            'Sheet1': WorkSheet(pre_allocate=pre_allocate, plain_data=plain_data),
+            'Sheet1': WorkSheet(
+                pre_allocate=pre_allocate,
+                plain_data=plain_data,
+                style_manager=self.style,
+                storage=storage,
+            ),
         }
         self.file_props = self._get_default_file_props()
         self.sheet = 'Sheet1'
         self._sheet_list = tuple(['Sheet1'])
         self._dict_wb = {}
         self.protection = {}
-        self.style = StyleManager()
 
     @property
     def sheet_list(self):
@@ -114,6 +134,13 @@ class ExcelDriver:
 
     def save(self, file_or_path: Writable | str) -> None:
         if not hasattr(self, 'decoded_bytes'):
+            if isinstance(file_or_path, str):
+                # Let the shared library write the file to disk directly, so
+                # the whole Excel file is never materialized in Python. Every
+                # save to a path builds the file again, instead of reading
+                # back a previous output that may have been moved or changed.
+                self.export_to_file(file_or_path)
+                return
             self.read_lib_and_create_excel()
 
         if isinstance(file_or_path, str):
@@ -130,7 +157,7 @@ class ExcelDriver:
             raise KeyError(f'{sheet_name} Sheet Does Not Exist.')
 
     def read_lib_and_create_excel(
-        self, lib_path: str = None, ignore_go_panic: bool = True
+        self, lib_path: str = None, ignore_go_panic: bool = True, wire_format: str = None
     ) -> bytes:
         """
         Reads the library and creates the Excel file.
@@ -138,42 +165,249 @@ class ExcelDriver:
         Args:
             lib_path (str, optional): The path to the library. Defaults to None.
             ignore_go_panic (bool): The flag to determine should trigger panic in go.
+            wire_format (str, optional): The encoding of the payload, 'json' or
+                'msgpack'. Defaults to WIRE_FORMAT.
 
         Returns:
             bytes: The byte data of the created Excel file.
         """
+        if self._has_row_sources():
+            with self._export_session(lib_path, ignore_go_panic, wire_format) as session:
+                self.decoded_bytes = session.save_to_bytes()
+            return self.decoded_bytes
+
+        ignore_go_panic = 0 if ignore_go_panic is False else 1
+        pyfastexcel = self._read_lib(lib_path)
+        json_data = self._encode_workbook(wire_format)
+
+        create_excel = pyfastexcel.ExportBytes
+        free_pointer = pyfastexcel.FreeCPointer
+        free_pointer.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+        create_excel.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_int64,
+            ctypes.POINTER(ctypes.c_int64),
+            ctypes.c_int64,
+        ]
+        create_excel.restype = ctypes.c_void_p
+        # The shared library returns a pointer to the raw zip bytes and writes
+        # its length to `size`, so the file is copied only once into Python.
+        size = ctypes.c_int64(0)
+        byte_data = create_excel(json_data, len(json_data), ctypes.byref(size), ignore_go_panic)
+        if not byte_data:
+            raise RuntimeError('Failed to create the Excel file in the shared library.')
+        self.decoded_bytes = ctypes.string_at(byte_data, size.value)
+        free_pointer(byte_data, 1 if self.DEBUG else 0)
+
+        return self.decoded_bytes
+
+    def export_to_file(
+        self,
+        path: str,
+        lib_path: str = None,
+        ignore_go_panic: bool = True,
+        wire_format: str = None,
+    ) -> None:
+        """
+        Reads the library and writes the Excel file directly to the given path.
+
+        Unlike `read_lib_and_create_excel`, the Excel file is written to disk
+        by the shared library, so its content is never copied into Python.
+
+        Args:
+            path (str): The path to save the file.
+            lib_path (str, optional): The path to the library. Defaults to None.
+            ignore_go_panic (bool): The flag to determine should trigger panic in go.
+            wire_format (str, optional): The encoding of the payload, 'json' or
+                'msgpack'. Defaults to WIRE_FORMAT.
+
+        Raises:
+            RuntimeError: If the shared library failed to write the file.
+        """
+        if self._has_row_sources():
+            with self._export_session(lib_path, ignore_go_panic, wire_format) as session:
+                session.save_to_file(path)
+            return
+
         ignore_go_panic = 0 if ignore_go_panic is False else 1
         pyfastexcel = self._read_lib(lib_path)
+        json_data = self._encode_workbook(wire_format)
+
+        export_file = pyfastexcel.ExportFile
+        free_pointer = pyfastexcel.FreeCPointer
+        free_pointer.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+        export_file.argtypes = [ctypes.c_char_p, ctypes.c_int64, ctypes.c_char_p, ctypes.c_int64]
+        export_file.restype = ctypes.c_void_p
+        err_msg = export_file(json_data, len(json_data), os.fsencode(path), ignore_go_panic)
+        if err_msg:
+            msg = ctypes.string_at(err_msg).decode()
+            free_pointer(err_msg, 1 if self.DEBUG else 0)
+            raise RuntimeError(f'Failed to write the Excel file: {msg}')
+
+    def _encode_workbook(self, wire_format: str = None) -> bytes:
+        """
+        Creates the styles and encodes every sheet of the workbook into the
+        payload consumed by the shared library.
+
+        Args:
+            wire_format (str, optional): The encoding of the payload, 'json' or
+                'msgpack'. Defaults to WIRE_FORMAT.
+
+        Returns:
+            bytes: The payload of the workbook.
+        """
         self._create_style()
+        styles = self.style._assign_style_ids(reset=True)
 
         # Transfer all WorkSheet Object to the sheet dictionary in the workbook.
+        content = {}
+        # The strings repeated in the cells of every sheet are sent once.
+        string_pool = StringPool()
         for sheet in self._sheet_list:
-            self._dict_wb[sheet] = self.workbook[sheet]._transfer_to_dict()
+            self._dict_wb[sheet] = self._get_sheet_settings(sheet)
             if len(self.workbook[sheet]._table_list) != 0:
                 TableFinalValidation(
                     data=self.workbook[sheet]._data,
                     table_list=self.workbook[sheet]._table_list,
                 )
+            # The cells reference their style by id instead of by name.
+            data = self._dict_wb[sheet]['Data']
+            if isinstance(data, ColumnarStorage):
+                cells = {'Data': [], 'Columns': data._encode_columns(self.style._style_ids)}
+            elif isinstance(data, SparseStorage):
+                cells = {'Data': [], 'Sparse': data._encode_cells(self.style, string_pool)}
+            else:
+                cells = {'Data': self.style._encode_rows(data, string_pool)}
+            arrays = self.workbook[sheet]._array_list
+            if arrays:
+                cells['Arrays'] = [
+                    block._encode(self.style._style_ids, self.workbook[sheet]._style_rules)
+                    for block in arrays
+                ]
+            content[sheet] = {**self._dict_wb[sheet], **cells}
 
         results = {
-            'content': self._dict_wb,
+            'content': content,
             'file_props': self.file_props,
-            'style': self.style._style_map,
+            'style': styles,
+            'strings': string_pool.strings,
             'protection': self.protection,
             'sheet_order': self._sheet_list,
+            'parallel': self.PARALLEL_SHEETS,
         }
-        json_data = msgspec.json.encode(results)
-        create_excel = pyfastexcel.Export
-        free_pointer = pyfastexcel.FreeCPointer
-        free_pointer.argtypes = [ctypes.c_void_p, ctypes.c_int64]
-        create_excel.argtypes = [ctypes.c_char_p, ctypes.c_int64]
-        create_excel.restype = ctypes.c_void_p
-        byte_data = create_excel(json_data, ignore_go_panic)
-        self.decoded_bytes = base64.b64decode(ctypes.cast(byte_data, ctypes.c_char_p).value)
-        free_pointer(byte_data, 1 if self.DEBUG else 0)
-        StyleManager.reset_style_configs()
+        return encode_payload(results, wire_format or self.WIRE_FORMAT)
 
-        return self.decoded_bytes
+    def _has_row_sources(self) -> bool:
+        return any(self.workbook[sheet]._source_list for sheet in self._sheet_list)
+
+    def _get_sheet_settings(self, sheet: str) -> dict[str, Any]:
+        """
+        Gets the settings of a sheet from WorkSheet._transfer_to_dict(), with
+        the styles of the columns, the rows and the style rules referenced by
+        their ids.
+        """
+        sheet_data = dict(self.workbook[sheet]._transfer_to_dict())
+        get_id = self.style._style_ids.get
+        for key in ('ColStyle', 'RowStyle'):
+            sheet_data[key] = {line: get_id(name, -1) for line, name in sheet_data[key].items()}
+        sheet_data['StyleRules'] = [
+            (*rule[:4], get_id(rule[4], -1)) for rule in sheet_data['StyleRules']
+        ]
+        return sheet_data
+
+    def _get_session_styles(self, reset: bool = False) -> list[dict[str, Any]]:
+        """
+        Gets the styles that have not been sent to the export session. The new
+        styles continue the style ids of the styles sent previously.
+
+        Args:
+            reset (bool): Whether the styles are sent to a new export session.
+
+        Returns:
+            list[dict[str, Any]]: The settings of the new styles, in id order.
+        """
+        if reset:
+            self.style._style_ids.clear()
+        style_collections = self._get_style_collections()
+        self.style._set_style_names(style_collections)
+        style_collections.update(self.style._get_registered_styles())
+
+        for key, val in style_collections.items():
+            if key not in self.style._style_ids:
+                self.style._update_style_map(key, val)
+        return self.style._assign_style_ids()
+
+    def _export_session(
+        self, lib_path: str = None, ignore_go_panic: bool = True, wire_format: str = None
+    ) -> ExportSession:
+        """
+        Writes every sheet of the workbook through an export session, so the
+        row sources of the sheets, e.g. the record batches of write_arrow(), are
+        sent batch by batch instead of being encoded into a single payload.
+
+        Args:
+            lib_path (str, optional): The path to the library. Defaults to None.
+            ignore_go_panic (bool): The flag to determine should trigger panic in go.
+            wire_format (str, optional): The encoding of the payloads, 'json' or
+                'msgpack'. Defaults to WIRE_FORMAT.
+
+        Returns:
+            ExportSession: The session with every sheet written, which should be
+                saved by the caller.
+        """
+        session = ExportSession(
+            self._read_lib(lib_path),
+            self._get_session_styles(reset=True),
+            self.file_props,
+            self.protection,
+            ignore_go_panic=ignore_go_panic,
+            wire_format=wire_format or self.WIRE_FORMAT,
+        )
+        style_ids = self.style._style_ids
+        string_pool = StringPool()
+        try:
+            for sheet in self._sheet_list:
+                ws = self.workbook[sheet]
+                data = ws._data
+                if not isinstance(data, (ColumnarStorage, SparseStorage)):
+                    # The style rules only style the cells of the sheet, not the
+                    # rows of the sources. The shared library applies them to
+                    # the cells of the other storages, like in _encode_workbook.
+                    ws._resolve_style_rules()
+                if len(ws._table_list) != 0:
+                    TableFinalValidation(data=data, table_list=ws._table_list)
+                sheet_data = self._get_sheet_settings(sheet)
+                session.open_sheet(sheet, {k: v for k, v in sheet_data.items() if k != 'Data'})
+                if len(data) != 0 or ws._array_list:
+                    # The storages send their cells as they are kept, so the
+                    # empty cells of a sparse sheet are never expanded.
+                    cells = {}
+                    if isinstance(data, ColumnarStorage):
+                        cells['columns'] = data._encode_columns(style_ids)
+                    elif isinstance(data, SparseStorage):
+                        cells['sparse'] = data._encode_cells(self.style, string_pool)
+                    session.append_rows(
+                        [] if cells else self.style._encode_rows(data, string_pool),
+                        arrays=[
+                            block._encode(style_ids, ws._style_rules) for block in ws._array_list
+                        ],
+                        strings=string_pool.pop_new_strings(),
+                        **cells,
+                    )
+                for source in ws._source_list:
+                    for rows, arrays in source._iter_batches():
+                        # The rows pulled from a source may register new styles.
+                        styles = self._get_session_styles()
+                        session.append_rows(
+                            self.style._encode_rows(rows, string_pool),
+                            styles,
+                            [block._encode(style_ids) for block in arrays],
+                            string_pool.pop_new_strings(),
+                        )
+        except BaseException:
+            session.close()
+            raise
+        return session
 
     def _read_lib(self, lib_path: str) -> ctypes.CDLL:  # pragma: no cover
         """
@@ -229,11 +463,11 @@ class ExcelDriver:
         predefined attributes.
         """
         style_collections = self._get_style_collections()
-        self.style._STYLE_NAME_MAP.update({val: key for key, val in style_collections.items()})
+        self.style._set_style_names(style_collections)
         # Set the CustomStyle from the pre-defined class attributes.
         for key, val in style_collections.items():
             self.style._update_style_map(key, val)
 
         # Set the CustomStyle from the REGISTERED method.
-        for key, val in self.style.REGISTERED_STYLES.items():
+        for key, val in self.style._get_registered_styles().items():
             self.style._update_style_map(key, val)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import copy
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
 
 from pyfastexcel import CustomStyle
 
 from .logformatter import formatter, log_warning
 
+if TYPE_CHECKING:
+    from .storage import StringPool
+
 BASE_DIR = Path(__file__).resolve().parent
 
 logger = logging.getLogger(__name__)
@@ -18,34 +24,77 @@ logger.addHandler(style_formatter)
 logger.propagate = False
 
 
+class StyleCacheInfo(NamedTuple):
+    """
+    The statistics of the process-wide cache of the compiled styles.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
 class StyleManager:
     """
     A class to set custom styles for Excel files.
 
+    Every workbook owns a StyleManager, which holds the styles of the workbook
+    and their ids, so workbooks can be built independently in different threads.
+    The styles registered with `set_custom_style` form a process-wide catalog
+    shared by every workbook, which the workbooks only read.
+
     ### Methods:
         set_custom_style(cls, name: str, custom_style: CustomStyle): Set custom style
         by register method.
+        reset_style_configs(cls): Clears the process-wide style catalog.
+        style_cache_info(cls): Gets the statistics of the compiled style cache.
+        clear_style_cache(cls): Clears the compiled style cache.
+        _register_style(style: CustomStyle): Registers a style in the workbook.
+        _get_style_name(style: CustomStyle): Gets the name of a registered style.
+        _set_style_names(styles: dict): Names the styles in the workbook.
+        _get_registered_style(name: str): Gets a registered style by name.
+        _get_registered_styles(): Gets every style registered for the workbook.
         _get_style_collections(): Gets collections of custom styles.
         _get_default_style(): Gets the default style.
         _update_style_map(style_name: str, custom_style: CustomStyle): Updates
             the style map.
-        _get_font_style(style: CustomStyle): Gets the font style.
-        _get_fill_style(style: CustomStyle): Gets the fill style.
-        _get_border_style(style: CustomStyle): Gets the border style.
-        _get_alignment_style(style: CustomStyle): Gets the alignment style.
-        _get_protection_style(style: CustomStyle): Gets the protection style.
+        _compile_style(custom_style: CustomStyle): Gets the settings of a style
+            from the compiled style cache.
+        _assign_style_ids(reset: bool): Assigns integer ids to the styles.
+        _encode_rows(rows: list): Replaces the style names of the cells with
+            their style ids.
     """
 
-    # The style retrieved from set_custom_style will be stored in
-    # REGISTERED_STYLES temporarily. It will be created after any
-    # Writer is initialized and calls the self._create_style() method.
+    # The styles retrieved from set_custom_style are stored in the process-wide
+    # catalog. Every workbook can use them, and they are created after any
+    # Writer calls the self._create_style() method. The names of the styles
+    # are keyed by their fingerprint.
     DEFAULT_STYLE = CustomStyle()
     REGISTERED_STYLES = {'DEFAULT_STYLE': DEFAULT_STYLE}
-    _STYLE_NAME_MAP = {}
-    _STYLE_ID = 0
-    # The shared memory in the parent class that stores every CustomStyle
-    # from different Writer classes.
-    _style_map = {}
+    _STYLE_NAME_MAP: dict[bytes, str] = {}
+
+    # The settings of the styles compiled by any workbook, keyed by the
+    # content key of the style and evicted in least recently used order. They
+    # are kept after reset_style_configs, so a long running process compiles
+    # its styles once.
+    STYLE_CACHE_SIZE = 4096
+    _STYLE_CACHE: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+    _STYLE_CACHE_LOCK = threading.Lock()
+    _style_cache_hits = 0
+    _style_cache_misses = 0
+
+    def __init__(self):
+        # The CustomStyle assigned to the cells directly are registered in the
+        # workbook with an auto increment id, instead of in the catalog.
+        self._registered_styles: dict[str, CustomStyle] = {}
+        self._style_name_map: dict[bytes, str] = {}
+        self._style_id = 0
+        # The settings of every style of the workbook, created at export time.
+        self._style_map: dict[str, dict[str, Any]] = {}
+        # The dense integer ids of the styles sent to the shared library. They
+        # are assigned at export time and the cells reference their style by id.
+        self._style_ids: dict[str, int] = {}
 
     @classmethod
     def set_custom_style(cls, name: str, custom_style: CustomStyle):
@@ -54,15 +103,91 @@ class StyleManager:
                 logger,
                 f'{name} has already existed. Overiding the style settings.',
             )
+        custom_style = copy.deepcopy(custom_style)
         cls.REGISTERED_STYLES[name] = custom_style
-        cls._STYLE_NAME_MAP[custom_style] = name
+        cls._STYLE_NAME_MAP[custom_style.fingerprint] = name
 
     @classmethod
     def reset_style_configs(cls):
         cls.REGISTERED_STYLES = {'DEFAULT_STYLE': cls.DEFAULT_STYLE}
         cls._STYLE_NAME_MAP = {}
-        cls._STYLE_ID = 0
-        cls._style_map = {}
+
+    @classmethod
+    def style_cache_info(cls) -> StyleCacheInfo:
+        """
+        Gets the statistics of the process-wide cache of the compiled styles.
+
+        Returns:
+            StyleCacheInfo: The hits, misses, maximum size and current size of
+                the cache.
+        """
+        with cls._STYLE_CACHE_LOCK:
+            return StyleCacheInfo(
+                cls._style_cache_hits,
+                cls._style_cache_misses,
+                cls.STYLE_CACHE_SIZE,
+                len(cls._STYLE_CACHE),
+            )
+
+    @classmethod
+    def clear_style_cache(cls) -> None:
+        """
+        Clears the process-wide cache of the compiled styles and its statistics.
+        """
+        with cls._STYLE_CACHE_LOCK:
+            cls._STYLE_CACHE.clear()
+            cls._style_cache_hits = 0
+            cls._style_cache_misses = 0
+
+    def _register_style(self, style: CustomStyle) -> str:
+        """
+        Registers a CustomStyle in the workbook with an auto increment name, if
+        no style with the same fingerprint is registered in the workbook or in
+        the catalog. A copy of the style is registered, so the cells keep the
+        settings the style had when it was assigned to them.
+
+        Args:
+            style (CustomStyle): The style to register.
+
+        Returns:
+            str: The name of the style.
+
+        Raises:
+            TypeError: If the style is not a CustomStyle object.
+        """
+        if not isinstance(style, CustomStyle):
+            raise TypeError(
+                f'Invalid type ({type(style)}). Style should be a CustomStyle object.',
+            )
+        fingerprint = style.fingerprint
+        name = self._style_name_map.get(fingerprint)
+        if name is None:
+            name = self._STYLE_NAME_MAP.get(fingerprint)
+        if name is None:
+            name = f'Custom Style {self._style_id}'
+            self._style_id += 1
+            self._registered_styles[name] = copy.deepcopy(style)
+            self._style_name_map[fingerprint] = name
+        return name
+
+    def _get_style_name(self, style: CustomStyle) -> str | None:
+        fingerprint = style.fingerprint
+        name = self._style_name_map.get(fingerprint)
+        return self._STYLE_NAME_MAP.get(fingerprint) if name is None else name
+
+    def _set_style_names(self, styles: dict[str, CustomStyle]) -> None:
+        """
+        Names the styles in the workbook, e.g. the styles defined as the class
+        attributes of a Writer, keyed by their fingerprint.
+        """
+        self._style_name_map.update({style.fingerprint: name for name, style in styles.items()})
+
+    def _get_registered_style(self, name: str) -> CustomStyle | None:
+        style = self._registered_styles.get(name)
+        return self.REGISTERED_STYLES.get(name) if style is None else style
+
+    def _get_registered_styles(self) -> dict[str, CustomStyle]:
+        return {**self.REGISTERED_STYLES, **self._registered_styles}
 
     def _get_default_style(self) -> dict[str, dict[str, Any] | str]:
         """
@@ -87,25 +212,117 @@ class StyleManager:
                 logger,
                 f'{style_name} has already existed. Overriding the style settings.',
             )
-        self._style_map[style_name] = self._get_default_style()
-        self._style_map[style_name]['Font'] = self._get_font_style(custom_style)
-        self._style_map[style_name]['Fill'] = self._get_fill_style(custom_style)
-        self._style_map[style_name]['Border'] = self._get_border_style(custom_style)
-        self._style_map[style_name]['Alignment'] = self._get_alignment_style(custom_style)
-        self._style_map[style_name]['Protection'] = self._get_protection_style(custom_style)
-        self._style_map[style_name]['CustomNumFmt'] = custom_style.number_format
+        self._style_map[style_name] = self._compile_style(custom_style)
+
+    @classmethod
+    def _compile_style(cls, custom_style: CustomStyle) -> dict[str, Any]:
+        """
+        Gets the settings of a style in the style map, from the process-wide
+        cache if a style with the same content key has already been compiled.
+
+        The cache is keyed by CustomStyle._get_content_key(), which is built
+        from the arguments of the parts of the style, so a new style instance
+        equal to a cached one is neither validated nor serialized again. The
+        settings are shared by the styles and the workbooks and should not be
+        modified. The styles whose models have been read or set through their
+        attributes, e.g. style.font, are compiled without the cache, since
+        their models can be modified in place.
+
+        Args:
+            custom_style (CustomStyle): The style to compile.
 
-    def _get_font_style(self, style: CustomStyle) -> dict[str, str | int | bool | None]:
-        return style.font.model_dump(by_alias=True)
+        Returns:
+            dict[str, Any]: The settings of the style.
+        """
+        if custom_style._models or cls.STYLE_CACHE_SIZE <= 0:
+            return custom_style._compile_settings()
 
-    def _get_fill_style(self, style: CustomStyle) -> dict[str, str]:
-        return style.fill.model_dump(by_alias=True)
+        key = custom_style._get_content_key()
+        with cls._STYLE_CACHE_LOCK:
+            settings = cls._STYLE_CACHE.get(key)
+            if settings is not None:
+                cls._STYLE_CACHE.move_to_end(key)
+                cls._style_cache_hits += 1
+                return settings
+            cls._style_cache_misses += 1
 
-    def _get_border_style(self, style: CustomStyle) -> dict[str, str]:
-        return style.border.model_dump(by_alias=True)
+        settings = custom_style._compile_settings()
+        with cls._STYLE_CACHE_LOCK:
+            cls._STYLE_CACHE[key] = settings
+            while len(cls._STYLE_CACHE) > cls.STYLE_CACHE_SIZE:
+                cls._STYLE_CACHE.popitem(last=False)
+        return settings
+
+    def _assign_style_ids(self, reset: bool = False) -> list[dict[str, Any]]:
+        """
+        Assigns dense integer ids to the styles of the style map that have not
+        got one yet. The DEFAULT_STYLE takes the id 0, so the cells with the
+        default style can omit their style id.
 
-    def _get_alignment_style(self, style: CustomStyle) -> dict[str, str]:
-        return style.ali.model_dump(by_alias=True)
+        Args:
+            reset (bool): Whether to number every style again from 0.
+
+        Returns:
+            list[dict[str, Any]]: The settings of the newly numbered styles, in
+                the order of their ids.
+        """
+        if reset:
+            self._style_ids.clear()
+        new_styles = [name for name in self._style_map if name not in self._style_ids]
+        new_styles.sort(key=lambda name: name != 'DEFAULT_STYLE')
+        for name in new_styles:
+            self._style_ids[name] = len(self._style_ids)
+        return [self._style_map[name] for name in new_styles]
 
-    def _get_protection_style(self, style: CustomStyle) -> dict[str, str]:
-        return style.protection.model_dump(by_alias=True)
+    def _encode_rows(
+        self, rows: list[list], string_pool: Optional[StringPool] = None
+    ) -> list[list]:
+        """
+        Replaces the style names of the cells with the ids assigned by
+        `_assign_style_ids`.
+
+        A (value, style) cell becomes (value, id), or (value,) for the style 0.
+        The other cells are kept as they are, and a cell with an unknown style
+        becomes a plain value without style. With a string pool, the value of
+        a repeated string becomes its reference in the pool, and a plain
+        string becomes (reference, -1).
+
+        Args:
+            rows (list[list]): The rows of the worksheet.
+            string_pool (StringPool, optional): The string pool of the payload.
+
+        Returns:
+            list[list]: The rows to send to the shared library.
+        """
+        get_id = self._style_ids.get
+        get_ref = string_pool.get_ref if string_pool is not None else None
+        # The cells of the style 0 holding the same pooled string share their
+        # tuple, instead of a new tuple per cell.
+        default_cells: dict[tuple[int], tuple] = {}
+        encoded = []
+        for row in rows:
+            encoded_row = []
+            for cell in row:
+                if cell.__class__ is tuple and len(cell) == 2:
+                    value = cell[0]
+                    if get_ref is not None and value.__class__ is str:
+                        value = get_ref(value)
+                    style_id = get_id(cell[1])
+                    if style_id is None:
+                        cell = value if value.__class__ is not tuple else (value, -1)
+                    elif style_id == 0:
+                        if value.__class__ is tuple:
+                            cell = default_cells.get(value)
+                            if cell is None:
+                                cell = default_cells[value] = (value,)
+                        else:
+                            cell = (value,)
+                    else:
+                        cell = (value, style_id)
+                elif get_ref is not None and cell.__class__ is str:
+                    value = get_ref(cell)
+                    if value.__class__ is tuple:
+                        cell = (value, -1)
+                encoded_row.append(cell)
+            encoded.append(encoded_row)
+        return encoded
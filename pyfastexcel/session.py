@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import ctypes
+import os
+from typing import Any
+
+from .utils import encode_payload
+
+
+class ExportSession:
+    """
+    A handle of an export session in the shared library.
+
+    The session keeps the Excel file open in the shared library, so a workbook
+    can be sent sheet by sheet and batch by batch instead of being encoded into
+    a single payload. Only one sheet is written at a time, and opening a sheet
+    closes the sheet opened previously. A closed sheet can not be written again.
+
+    ### Methods:
+        open_sheet(sheet: str, sheet_data: dict[str, Any], styles: list[dict[str, Any]]):
+            Opens a new sheet.
+        append_rows(rows: list, styles: list[dict[str, Any]], arrays: list[dict[str, Any]]):
+            Writes a batch of rows.
+        close_sheet(): Closes the opened sheet.
+        save_to_file(path: str): Finishes the session and writes the file to disk.
+        save_to_bytes(): Finishes the session and returns the file content.
+        close(): Releases the session without writing the file.
+    """
+
+    def __init__(
+        self,
+        lib: ctypes.CDLL,
+        styles: list[dict[str, Any]],
+        file_props: dict[str, str],
+        protection: dict[str, Any],
+        ignore_go_panic: bool = True,
+        wire_format: str = 'json',
+    ):
+        """
+        Creates an export session in the shared library.
+
+        Args:
+            lib (ctypes.CDLL): The shared library.
+            styles (list[dict[str, Any]]): The styles created at the beginning of the
+                session, in the order of their style ids.
+            file_props (dict[str, str]): The file properties of the workbook.
+            protection (dict[str, Any]): The protection settings of the workbook.
+            ignore_go_panic (bool): The flag to determine should trigger panic in go.
+            wire_format (str): The encoding of the payloads, 'json' or 'msgpack'.
+
+        Raises:
+            RuntimeError: If the shared library failed to create the session.
+            ValueError: If the wire format is not supported.
+        """
+        self._lib = lib
+        self._ignore_go_panic = 0 if ignore_go_panic is False else 1
+        self._wire_format = wire_format
+        self._set_prototypes()
+
+        payload = encode_payload(
+            {'style': styles, 'file_props': file_props, 'protection': protection},
+            wire_format,
+        )
+        self._id = self._lib.SessionNew(payload, len(payload), self._ignore_go_panic)
+        if not self._id:
+            raise RuntimeError('Failed to create the export session in the shared library.')
+
+    def __enter__(self) -> ExportSession:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return not getattr(self, '_id', 0)
+
+    def open_sheet(
+        self,
+        sheet: str,
+        sheet_data: dict[str, Any],
+        styles: list[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Opens a new sheet and applies its settings, the sheet opened previously
+        will be closed.
+
+        Args:
+            sheet (str): The name of the sheet.
+            sheet_data (dict[str, Any]): The sheet settings from
+                WorkSheet._transfer_to_dict(). The 'Data' key is ignored.
+            styles (list[dict[str, Any]], optional): The styles that have not been
+                sent to the session yet, e.g. the styles of the columns. Their ids
+                continue the ids of the styles sent previously.
+        """
+        if styles:
+            sheet_data = {**sheet_data, 'Style': styles}
+        payload = encode_payload(sheet_data, self._wire_format)
+        self._check_error(
+            self._lib.SessionOpenSheet(
+                self._get_id(), sheet.encode(), payload, len(payload), self._ignore_go_panic
+            ),
+            f'Failed to open {sheet} in the export session',
+        )
+
+    def append_rows(
+        self,
+        rows: list,
+        styles: list[dict[str, Any]] = None,
+        arrays: list[dict[str, Any]] = None,
+        strings: list[str] = None,
+        columns: dict[str, Any] = None,
+        sparse: dict[str, Any] = None,
+    ) -> None:
+        """
+        Writes a batch of rows after the rows written previously in the opened sheet.
+
+        Args:
+            rows (list): The rows of (value, style id) tuples, see
+                StyleManager._encode_rows().
+            styles (list[dict[str, Any]], optional): The styles that have not been
+                sent to the session yet. Their ids continue the ids of the styles
+                sent previously.
+            arrays (list[dict[str, Any]], optional): The arrays written over the
+                rows, see ArrayBlock._encode(). Their rows are relative to the
+                first row of the batch.
+            strings (list[str], optional): The strings added to the string pool
+                of the session, see StringPool.pop_new_strings(). Their indexes
+                continue the indexes of the strings sent previously.
+            columns (dict[str, Any], optional): The cells of a ColumnarStorage
+                sent instead of the rows, see ColumnarStorage._encode_columns().
+            sparse (dict[str, Any], optional): The cells of a SparseStorage sent
+                instead of the rows, see SparseStorage._encode_cells().
+
+        Notes:
+            The style rules of the sheet style the columns and the sparse cells,
+            since they are the cells of the sheet.
+        """
+        payload = {'style': styles or [], 'data': rows}
+        if columns is not None:
+            payload['columns'] = columns
+        if sparse is not None:
+            payload['sparse'] = sparse
+        if arrays:
+            payload['arrays'] = arrays
+        if strings:
+            payload['strings'] = strings
+        payload = encode_payload(payload, self._wire_format)
+        self._check_error(
+            self._lib.SessionAppendRows(
+                self._get_id(), payload, len(payload), self._ignore_go_panic
+            ),
+            'Failed to append rows to the export session',
+        )
+
+    def close_sheet(self) -> None:
+        """
+        Closes the opened sheet.
+        """
+        self._check_error(
+            self._lib.SessionCloseSheet(self._get_id(), self._ignore_go_panic),
+            'Failed to close the sheet of the export session',
+        )
+
+    def save_to_file(self, path: str) -> None:
+        """
+        Finishes the session and writes the Excel file directly to the given path.
+
+        Args:
+            path (str): The path to save the file.
+
+        Raises:
+            RuntimeError: If the shared library failed to write the file.
+        """
+        session_id = self._get_id()
+        self._id = 0
+        self._check_error(
+            self._lib.SessionSaveFile(session_id, os.fsencode(path), self._ignore_go_panic),
+            'Failed to write the Excel file',
+        )
+
+    def save_to_bytes(self) -> bytes:
+        """
+        Finishes the session and returns the content of the Excel file.
+
+        Returns:
+            bytes: The byte data of the created Excel file.
+
+        Raises:
+            RuntimeError: If the shared library failed to create the file.
+        """
+        session_id = self._get_id()
+        self._id = 0
+        size = ctypes.c_int64(0)
+        byte_data = self._lib.SessionSaveBytes(
+            session_id, ctypes.byref(size), self._ignore_go_panic
+        )
+        if not byte_data:
+            raise RuntimeError('Failed to create the Excel file in the shared library.')
+        content = ctypes.string_at(byte_data, size.value)
+        self._lib.FreeCPointer(byte_data, 0)
+        return content
+
+    def close(self) -> None:
+        """
+        Releases the session without writing the Excel file. Closing a finished
+        session does nothing.
+        """
+        if not self.closed:
+            self._lib.SessionFree(self._id)
+            self._id = 0
+
+    def _get_id(self) -> int:
+        if self.closed:
+            raise RuntimeError('The export session has been closed.')
+        return self._id
+
+    def _check_error(self, err_msg: int | None, message: str) -> None:
+        if err_msg:
+            msg = ctypes.string_at(err_msg).decode()
+            self._lib.FreeCPointer(err_msg, 0)
+            raise RuntimeError(f'{message}: {msg}')
+
+    def _set_prototypes(self) -> None:
+        lib = self._lib
+        lib.FreeCPointer.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+        lib.SessionNew.argtypes = [ctypes.c_char_p, ctypes.c_int64, ctypes.c_int64]
+        lib.SessionNew.restype = ctypes.c_int64
+        lib.SessionOpenSheet.argtypes = [
+            ctypes.c_int64,
+            ctypes.c_char_p,
+            ctypes.c_char_p,
+            ctypes.c_int64,
+            ctypes.c_int64,
+        ]
+        lib.SessionOpenSheet.restype = ctypes.c_void_p
+        lib.SessionAppendRows.argtypes = [
+            ctypes.c_int64,
+            ctypes.c_char_p,
+            ctypes.c_int64,
+            ctypes.c_int64,
+        ]
+        lib.SessionAppendRows.restype = ctypes.c_void_p
+        lib.SessionCloseSheet.argtypes = [ctypes.c_int64, ctypes.c_int64]
+        lib.SessionCloseSheet.restype = ctypes.c_void_p
+        lib.SessionSaveFile.argtypes = [ctypes.c_int64, ctypes.c_char_p, ctypes.c_int64]
+        lib.SessionSaveFile.restype = ctypes.c_void_p
+        lib.SessionSaveBytes.argtypes = [
+            ctypes.c_int64,
+            ctypes.POINTER(ctypes.c_int64),
+            ctypes.c_int64,
+        ]
+        lib.SessionSaveBytes.restype = ctypes.c_void_p
+        lib.SessionFree.argtypes = [ctypes.c_int64]
+        lib.SessionFree.restype = None
@@ -0,0 +1,755 @@
+from __future__ import annotations
+
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .manager import StyleManager
+
+# The kinds of the cells of a column, shared with the Golang core (core/columns.go).
+_PAD = 0
+_NONE = 1
+_FLOAT = 2
+_INT = 3
+_STR = 4
+_BOOL = 5
+_OTHER = 6
+
+# The integers out of this range can not be kept exactly in a float64, so
+# they are kept as they are like the other values.
+_MAX_SAFE_INT = 2**53
+# The uint16 style indexes limit the number of styles of a sheet.
+_MAX_STYLES = 65536
+
+
+class _Column:
+    """
+    The cells of a column. The kind, number and style of the cell at row i
+    are kind[i], num[i] and style[i], and the values that can not be kept in
+    the arrays are kept in other[i].
+    """
+
+    __slots__ = ('kind', 'num', 'style', 'other')
+
+    def __init__(self):
+        self.kind = bytearray()
+        self.num = array('d')
+        self.style = array('H')
+        self.other = {}
+
+    def grow(self, size: int, kind: int = _PAD) -> None:
+        missing = size - len(self.kind)
+        if missing > 0:
+            self.kind.extend(bytes((kind,)) * missing)
+            self.num.frombytes(bytes(8 * missing))
+            self.style.frombytes(bytes(2 * missing))
+
+
+class _RowView:
+    """
+    A view of a row of a cell storage, which supports the list operations
+    used by the WorkSheet. The cells are built when they are read.
+    """
+
+    __slots__ = ('_storage', '_row')
+
+    def __init__(self, storage: _CellStorage, row: int):
+        self._storage = storage
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._storage._n_cols
+
+    def __iter__(self) -> Iterator[Any]:
+        get = self._storage.get
+        for col in range(self._storage._n_cols):
+            yield get(self._row, col)
+
+    def __getitem__(self, key: int | slice) -> Any:
+        if isinstance(key, slice):
+            return [self._storage.get(self._row, col) for col in range(*key.indices(len(self)))]
+        return self._storage.get(self._row, self._check_index(key))
+
+    def __setitem__(self, key: int | slice, value: Any) -> None:
+        if isinstance(key, slice):
+            cols = range(*key.indices(len(self)))
+            values = list(value)
+            if len(values) != len(cols):
+                raise ValueError(
+                    f'Can not assign {len(values)} values to a slice of {len(cols)} cells.'
+                )
+            for col, val in zip(cols, values):
+                self._storage.set(self._row, col, val)
+        else:
+            self._storage.set(self._row, self._check_index(key), value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_RowView, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def extend(self, values: Iterable[Any]) -> None:
+        start = len(self)
+        for i, value in enumerate(values):
+            self._storage.set(self._row, start + i, value)
+
+    def _check_index(self, col: int) -> int:
+        if col < 0:
+            col += len(self)
+        if not 0 <= col < len(self):
+            raise IndexError('list index out of range')
+        return col
+
+
+class _CellStorage(ABC):
+    """
+    The base of the cell storages, which implements the list operations used
+    by the WorkSheet on its list of rows on top of get() and set(). The
+    storage is a rectangle of n_rows x n_cols cells, the cells that have not
+    been written are read as empty tuples.
+    """
+
+    def __init__(self, rows: Iterable[Iterable[Any]] = ()):
+        self._n_rows = 0
+        self._n_cols = 0
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def __iter__(self) -> Iterator[_RowView]:
+        for row in range(self._n_rows):
+            yield _RowView(self, row)
+
+    def __getitem__(self, key: int | slice) -> _RowView | list[_RowView]:
+        if isinstance(key, slice):
+            return [_RowView(self, row) for row in range(*key.indices(self._n_rows))]
+        if key < 0:
+            key += self._n_rows
+        if not 0 <= key < self._n_rows:
+            raise IndexError('list index out of range')
+        return _RowView(self, key)
+
+    def __setitem__(self, key: int, values: Iterable[Any]) -> None:
+        if key < 0:
+            key += self._n_rows
+        if not 0 <= key < self._n_rows:
+            raise IndexError('list assignment index out of range')
+        self._set_row(key, values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_CellStorage, list)):
+            return self.tolist() == [list(row) for row in other]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._n_rows} rows, {self._n_cols} columns)'
+
+    def append(self, values: Iterable[Any]) -> None:
+        self._n_rows += 1
+        self._set_row(self._n_rows - 1, values)
+
+    def extend(self, rows: Iterable[Iterable[Any]]) -> None:
+        for values in rows:
+            self.append(values)
+
+    def tolist(self) -> list[list[Any]]:
+        return [list(row) for row in self]
+
+    def expand(self, row: int, col: int) -> None:
+        """
+        Expands the rectangle of the storage to include the cell at (row, col)
+        without allocating the new cells.
+        """
+        self._n_rows = max(self._n_rows, row + 1)
+        self._n_cols = max(self._n_cols, col + 1)
+
+    @abstractmethod
+    def get(self, row: int, col: int) -> Any:
+        """
+        Gets the value of a cell, or an empty tuple if it has not been written.
+        """
+
+    @abstractmethod
+    def set(self, row: int, col: int, value: Any) -> None:
+        """
+        Sets the value of a cell, expanding the rectangle if needed.
+        """
+
+    @abstractmethod
+    def _set_row(self, row: int, values: Iterable[Any]) -> None:
+        """
+        Sets the cells of a row, the cells after the values are cleared.
+        """
+
+
+class ColumnarStorage(_CellStorage):
+    """
+    A columnar storage for the cells of a WorkSheet.
+
+    Every column keeps the kind of its cells in a bytearray, their numbers in a
+    float64 array and their style in a uint16 array, which indexes the style
+    names of the storage. The strings are kept once in a string pool. So a
+    cell takes 11 bytes instead of a (value, style) tuple, and the columns are
+    sent to the shared library as raw buffers.
+
+    The storage supports the list operations used by the WorkSheet on its list
+    of rows, a row is a view that builds the (value, style) tuples on demand.
+    The storage is a rectangle, the cells that have not been written are read
+    as empty tuples.
+
+    ### Methods:
+        get(row: int, col: int): Gets the value of a cell.
+        set(row: int, col: int, value: Any): Sets the value of a cell.
+        expand(row: int, col: int): Expands the rectangle to include a cell.
+        append(values: Iterable[Any]): Appends a row.
+        extend(rows: Iterable[Iterable[Any]]): Appends rows.
+        tolist(): Gets the rows as lists.
+    """
+
+    def __init__(self, rows: Iterable[Iterable[Any]] = ()):
+        self._columns: list[_Column | None] = []
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        # The style 0 is a plain value without style.
+        self._style_names: list[str | None] = [None]
+        self._style_ids: dict[str, int] = {}
+        super().__init__(rows)
+
+    @classmethod
+    def allocate(cls, n_rows: int, n_cols: int) -> ColumnarStorage:
+        """
+        Creates a storage of n_rows x n_cols cells set to None.
+        """
+        storage = cls()
+        storage._n_rows = n_rows
+        storage._n_cols = n_cols
+        for _ in range(n_cols):
+            column = _Column()
+            column.grow(n_rows, _NONE)
+            storage._columns.append(column)
+        return storage
+
+    def get(self, row: int, col: int) -> Any:
+        column = self._columns[col] if col < len(self._columns) else None
+        if column is None or row >= len(column.kind):
+            return ()
+        kind = column.kind[row]
+        if kind == _FLOAT:
+            value = column.num[row]
+        elif kind == _INT:
+            value = int(column.num[row])
+        elif kind == _STR:
+            value = self._strings[int(column.num[row])]
+        elif kind == _BOOL:
+            value = column.num[row] != 0
+        elif kind == _NONE:
+            value = None
+        elif kind == _OTHER:
+            value = column.other[row]
+        else:
+            return ()
+        style = column.style[row]
+        return value if style == 0 else (value, self._style_names[style])
+
+    def set(self, row: int, col: int, value: Any) -> None:
+        if row >= self._n_rows:
+            self._n_rows = row + 1
+        if col >= self._n_cols:
+            self._n_cols = col + 1
+        if col >= len(self._columns):
+            self._columns.extend([None] * (col + 1 - len(self._columns)))
+        column = self._columns[col]
+        if column is None:
+            column = self._columns[col] = _Column()
+        column.grow(row + 1)
+
+        style = 0
+        if value.__class__ is tuple:
+            if len(value) == 2 and isinstance(value[1], str):
+                value, style = value[0], self._get_style_index(value[1])
+            elif len(value) == 0:
+                self._clear(column, row)
+                return
+
+        kind, num = self._encode_value(value)
+        if kind == _OTHER:
+            column.other[row] = value
+        elif column.other:
+            column.other.pop(row, None)
+        column.kind[row] = kind
+        column.num[row] = num
+        column.style[row] = style
+
+    def _set_row(self, row: int, values: Iterable[Any]) -> None:
+        # Like a list, the row only keeps the new values.
+        col = -1
+        for col, value in enumerate(values):
+            self.set(row, col, value)
+        for column in self._columns[col + 1 :]:
+            if column is not None and row < len(column.kind):
+                self._clear(column, row)
+
+    def _clear(self, column: _Column, row: int) -> None:
+        column.kind[row] = _PAD
+        column.num[row] = 0
+        column.style[row] = 0
+        if column.other:
+            column.other.pop(row, None)
+
+    def _encode_value(self, value: Any) -> tuple[int, float]:
+        cls = value.__class__
+        if cls is float:
+            return _FLOAT, value
+        if cls is int:
+            if -_MAX_SAFE_INT <= value <= _MAX_SAFE_INT:
+                return _INT, value
+            return _OTHER, 0
+        if cls is str:
+            return _STR, self._get_string_index(value)
+        if cls is bool:
+            return _BOOL, value
+        if value is None:
+            return _NONE, 0
+        # The subclasses of the builtin types, like the numpy scalars.
+        if isinstance(value, bool):
+            return _BOOL, bool(value)
+        if isinstance(value, float):
+            return _FLOAT, float(value)
+        if isinstance(value, str):
+            return _STR, self._get_string_index(str(value))
+        return _OTHER, 0
+
+    def _get_string_index(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def _get_style_index(self, name: str) -> int:
+        index = self._style_ids.get(name)
+        if index is None:
+            if len(self._style_names) >= _MAX_STYLES:
+                raise ValueError(f'A sheet can not use more than {_MAX_STYLES - 1} styles.')
+            index = self._style_ids[name] = len(self._style_names)
+            self._style_names.append(name)
+        return index
+
+    def _encode_columns(self, style_ids: dict[str, int]) -> dict[str, Any]:
+        """
+        Encodes the storage into the columnar payload of the shared library.
+
+        Args:
+            style_ids (dict[str, int]): The style ids of the workbook, see
+                StyleManager._assign_style_ids().
+
+        Returns:
+            dict[str, Any]: The columns of the sheet. A style unknown to the
+                workbook becomes a plain value without style, like in
+                StyleManager._encode_rows().
+        """
+        empty = _Column()
+        return {
+            'Rows': self._n_rows,
+            'Strings': self._strings,
+            'Styles': [-1] + [style_ids.get(name, -1) for name in self._style_names[1:]],
+            'Cols': [
+                {
+                    'Kind': column.kind,
+                    'Num': _little_endian(column.num),
+                    'Style': _little_endian(column.style),
+                    'Other': column.other,
+                }
+                for column in (c if c is not None else empty for c in self._columns)
+            ],
+        }
+
+
+def _little_endian(values: array) -> memoryview:
+    if sys.byteorder != 'little':  # pragma: no cover
+        values = array(values.typecode, values)
+        values.byteswap()
+    return memoryview(values)
+
+
+class SparseStorage(_CellStorage):
+    """
+    A sparse storage for the cells of a WorkSheet.
+
+    Only the cells that have been written are kept, in a dict of rows holding
+    a dict of cells keyed by their column index. So a few cells scattered on a
+    large area do not allocate the whole rectangle, and only the written cells
+    are sent to the shared library with their coordinates.
+
+    The storage supports the list operations used by the WorkSheet on its list
+    of rows, like the ColumnarStorage.
+
+    ### Methods:
+        get(row: int, col: int): Gets the value of a cell.
+        set(row: int, col: int, value: Any): Sets the value of a cell.
+        expand(row: int, col: int): Expands the rectangle to include a cell.
+        append(values: Iterable[Any]): Appends a row.
+        extend(rows: Iterable[Iterable[Any]]): Appends rows.
+        tolist(): Gets the rows as lists.
+    """
+
+    def __init__(self, rows: Iterable[Iterable[Any]] = ()):
+        self._rows: dict[int, dict[int, Any]] = {}
+        super().__init__(rows)
+
+    def get(self, row: int, col: int) -> Any:
+        cells = self._rows.get(row)
+        if cells is None:
+            return ()
+        return cells.get(col, ())
+
+    def set(self, row: int, col: int, value: Any) -> None:
+        if row >= self._n_rows:
+            self._n_rows = row + 1
+        if col >= self._n_cols:
+            self._n_cols = col + 1
+        cells = self._rows.get(row)
+        if value.__class__ is tuple and len(value) == 0:
+            # An empty tuple is a padding cell, which is not kept.
+            if cells is not None:
+                cells.pop(col, None)
+            return
+        if cells is None:
+            cells = self._rows[row] = {}
+        cells[col] = value
+
+    def _set_row(self, row: int, values: Iterable[Any]) -> None:
+        # Like a list, the row only keeps the new values.
+        self._rows.pop(row, None)
+        for col, value in enumerate(values):
+            self.set(row, col, value)
+
+    def _encode_cells(
+        self, style_manager: StyleManager, string_pool: Optional[StringPool] = None
+    ) -> dict[str, Any]:
+        """
+        Encodes the written cells into the sparse payload of the shared library.
+
+        Args:
+            style_manager (StyleManager): The style manager of the workbook, which
+                replaces the style names of the cells with their style ids.
+            string_pool (StringPool, optional): The string pool of the payload.
+
+        Returns:
+            dict[str, Any]: The 0-based row and column indexes of the cells and
+                the cells, sorted by row and then by column, with the number of
+                rows of the storage.
+        """
+        rows, cols, values = [], [], []
+        for row in sorted(self._rows):
+            cells = self._rows[row]
+            for col in sorted(cells):
+                rows.append(row)
+                cols.append(col)
+                values.append(cells[col])
+        return {
+            'Rows': rows,
+            'Cols': cols,
+            'Cells': style_manager._encode_rows([values], string_pool)[0],
+            'Length': self._n_rows,
+        }
+
+
+# The number of distinct strings tracked by a StringPool, so a stream of
+# unique strings, e.g. ids, does not keep every string alive.
+_MAX_POOL_CANDIDATES = 2**20
+
+
+class StringPool:
+    """
+    The strings repeated in the cells of a workbook payload, which are sent
+    once and referenced by their index, see core/strings.go.
+
+    A string is added to the pool when it is met for the second time, so the
+    strings written once are still sent in their cell. The cells of a string
+    of the pool are sent as [index] instead of the string.
+
+    Attributes:
+        strings (list[str]): The strings of the pool, by index.
+    """
+
+    def __init__(self):
+        self.strings: list[str] = []
+        # The index of the pooled strings, or -1 for the strings met once.
+        self._ids: dict[str, int] = {}
+        # The [index] reference of every pooled string, shared by its cells.
+        self._refs: list[tuple[int]] = []
+        self._sent = 0
+
+    def get_ref(self, value: str) -> str | tuple[int]:
+        """
+        Gets the reference of a string to send in its cell, or the string
+        itself if it has not been repeated yet.
+        """
+        index = self._ids.get(value)
+        if index is None:
+            if len(self._ids) < _MAX_POOL_CANDIDATES:
+                self._ids[value] = -1
+            return value
+        if index < 0:
+            index = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+            self._refs.append((index,))
+        return self._refs[index]
+
+    def pop_new_strings(self) -> list[str]:
+        """
+        Gets the strings added to the pool since the last call, which continue
+        the indexes of the strings sent previously to an export session.
+        """
+        strings = self.strings[self._sent :]
+        self._sent = len(self.strings)
+        return strings
+
+
+DATE_FORMAT = 'yyyy-mm-dd'
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+TIMEDELTA_FORMAT = '[h]:mm:ss'
+
+
+class ConvertedColumn(NamedTuple):
+    """
+    A column of a DataFrame or an Arrow table converted once by its dtype.
+
+    Attributes:
+        values (numpy.ndarray): The values written from their buffer, or the
+            codes of the strings if strings is not None.
+        strings (list[str] | None): The distinct strings of a column of strings.
+        number_format (str | None): The number format required by the values,
+            e.g. the date format of the serial numbers of the datetimes.
+    """
+
+    values: Any
+    strings: Optional[list[str]] = None
+    number_format: Optional[str] = None
+
+
+# The dtypes of the NumPy arrays written by the shared library from their raw
+# buffer, see core/arrays.go. The other dtypes are written cell by cell.
+_ARRAY_DTYPES = frozenset(('f4', 'f8', 'i1', 'i2', 'i4', 'i8', 'u1', 'u2', 'u4', 'u8', 'b1'))
+
+
+class ArrayBlock:
+    """
+    A rectangle of cells written from the raw buffer of a 2-D NumPy array,
+    see WorkSheet.write_array(). The buffer is sent to the shared library as
+    is, which creates the cells by the dtype of the array.
+
+    A block of strings is sent as the int32 codes of the strings, with the
+    dtype 'cat', so every distinct string is sent once.
+
+    The style rules recorded by WorkSheet.set_style() after the block style
+    its cells, so the block keeps the rules which overlap it, and the shared
+    library applies them to its cells after creating them.
+
+    ### Methods:
+        from_array(array, row: int, col: int, style: str): Creates a block from
+            an array, or returns None if the dtype is not supported.
+        from_codes(codes, strings: list[str], row: int, col: int, style: str):
+            Creates a block of strings from their codes.
+    """
+
+    __slots__ = (
+        'row',
+        'col',
+        'n_rows',
+        'n_cols',
+        'dtype',
+        'data',
+        'style',
+        'strings',
+        '_rule_start',
+        '_style_rules',
+    )
+
+    def __init__(
+        self,
+        row: int,
+        col: int,
+        n_rows: int,
+        n_cols: int,
+        dtype: str,
+        data: memoryview,
+        style: str,
+        strings: list[str] | None = None,
+    ):
+        self.row = row
+        self.col = col
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.dtype = dtype
+        self.data = data
+        self.style = style
+        self.strings = strings
+        # The index of the first pending rule of the sheet recorded after the block.
+        self._rule_start = 0
+        self._style_rules: list[tuple[int, int, int, int, str]] = []
+
+    @classmethod
+    def from_array(cls, array: Any, row: int, col: int, style: str) -> ArrayBlock | None:
+        """
+        Creates a block from a 2-D NumPy array anchored at the 0-based (row, col).
+
+        Args:
+            array (numpy.ndarray): The 2-D array.
+            row (int): The row index of the top left cell.
+            col (int): The column index of the top left cell.
+            style (str): The style name of the cells.
+
+        Returns:
+            ArrayBlock | None: The block, or None if the dtype of the array can
+                not be written from its buffer.
+        """
+        import numpy as np
+
+        dtype = array.dtype
+        if dtype.kind == 'f' and dtype.itemsize < 4:
+            dtype = np.dtype('f4')
+        code = f'{dtype.kind}{dtype.itemsize}'
+        if code not in _ARRAY_DTYPES:
+            return None
+        # The shared library reads the buffer in C order and little-endian.
+        array = np.ascontiguousarray(array, dtype=dtype.newbyteorder('<'))
+        n_rows, n_cols = array.shape
+        return cls(row, col, n_rows, n_cols, code, memoryview(array).cast('B'), style)
+
+    @classmethod
+    def from_codes(
+        cls,
+        codes: Any,
+        strings: list[str],
+        row: int,
+        col: int,
+        style: str,
+    ) -> ArrayBlock:
+        """
+        Creates a column of strings from their codes anchored at the 0-based (row, col).
+
+        Args:
+            codes (numpy.ndarray): The 1-D indexes of the strings, -1 for an empty cell.
+            strings (list[str]): The distinct strings.
+            row (int): The row index of the top cell.
+            col (int): The column index of the cells.
+            style (str): The style name of the cells.
+
+        Returns:
+            ArrayBlock: The block.
+        """
+        import numpy as np
+
+        codes = np.ascontiguousarray(codes, dtype='<i4')
+        return cls(row, col, len(codes), 1, 'cat', memoryview(codes).cast('B'), style, strings)
+
+    def _get_style_rules(
+        self, rules: list[tuple[int, int, int, int, str]]
+    ) -> list[tuple[int, int, int, int, str]]:
+        """
+        Gets the style rules recorded after the block which overlap its cells.
+
+        Args:
+            rules (list[tuple[int, int, int, int, str]]): The pending style rules
+                of the sheet, see WorkSheet._style_rules.
+        """
+        bottom, right = self.row + self.n_rows - 1, self.col + self.n_cols - 1
+        return [
+            rule
+            for rule in rules[self._rule_start :]
+            if rule[0] <= bottom
+            and rule[2] >= self.row
+            and rule[1] <= right
+            and rule[3] >= self.col
+        ]
+
+    def _keep_style_rules(self, rules: list[tuple[int, int, int, int, str]]) -> None:
+        """
+        Keeps the style rules recorded after the block when the pending rules
+        of the sheet are resolved, see WorkSheet._resolve_style_rules().
+        """
+        self._style_rules.extend(self._get_style_rules(rules))
+        self._rule_start = 0
+
+    def _encode(
+        self,
+        style_ids: dict[str, int],
+        style_rules: list[tuple[int, int, int, int, str]] = (),
+    ) -> dict[str, Any]:
+        """
+        Encodes the block into the array payload of the shared library.
+
+        Args:
+            style_ids (dict[str, int]): The style ids of the workbook.
+            style_rules (list[tuple[int, int, int, int, str]], optional): The
+                pending style rules of the sheet.
+
+        Returns:
+            dict[str, Any]: The block, with the style rules of its cells
+                referencing their style by id.
+        """
+        block = {
+            'Row': self.row,
+            'Col': self.col,
+            'Rows': self.n_rows,
+            'Cols': self.n_cols,
+            'Dtype': self.dtype,
+            'Data': self.data,
+            'Style': style_ids.get(self.style, -1),
+        }
+        if self.strings is not None:
+            block['Strings'] = self.strings
+        rules = self._style_rules + self._get_style_rules(style_rules)
+        if rules:
+            block['StyleRules'] = [(*rule[:4], style_ids.get(rule[4], -1)) for rule in rules]
+        return block
+
+
+class RowSource:
+    """
+    The rows written by WorkSheet.write_rows(), after the rows of the sheet.
+
+    The rows are pulled from the iterable when the workbook is exported, a
+    chunk at a time, and every chunk is sent to the export session of the
+    shared library, so the memory does not grow with the number of rows.
+    """
+
+    __slots__ = ('_rows', '_chunk_size', '_format_cell')
+
+    def __init__(
+        self,
+        rows: Iterable[Iterable[Any]],
+        chunk_size: int,
+        format_cell: Callable[[Any], tuple[Any, str]],
+    ):
+        self._rows = rows
+        self._chunk_size = chunk_size
+        self._format_cell = format_cell
+
+    def _iter_batches(self) -> Iterator[tuple[list[list], list[ArrayBlock]]]:
+        """
+        Pulls the rows chunk by chunk.
+
+        Yields:
+            tuple[list[list], list[ArrayBlock]]: The (value, style) cells of a
+                chunk of rows, and no arrays. None is kept as an empty cell.
+        """
+        rows = iter(self._rows)
+        format_cell = self._format_cell
+        while True:
+            chunk = [
+                [None if value is None else format_cell(value) for value in row]
+                for row in islice(rows, self._chunk_size)
+            ]
+            if not chunk:
+                return
+            yield chunk, []
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import copy
 from typing import Any, Callable, ClassVar, Literal, Optional
 
+import msgspec
 from pydantic import BaseModel, Field, model_serializer
 
 
@@ -153,6 +153,71 @@ class Protection(BaseModel):
     hidden: Optional[bool] = Field(False, serialization_alias='Hidden')
 
 
+def _freeze(value: Any) -> Any:
+    """
+    Converts the arguments of a style part into a hashable value.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    if isinstance(value, BaseModel):
+        return (value.__class__.__name__, _freeze(value.model_dump()))
+    return value
+
+
+class StylePart:
+    """
+    A frozen part of a CustomStyle, e.g. its font, which holds the arguments
+    of its pydantic model.
+
+    The model is only validated and serialized when the part is compiled, and
+    then once for all the styles sharing the part. A clone of a style shares
+    the parts it does not modify.
+
+    Attributes:
+        model_class (type[BaseModel]): The model of the part, e.g. Font.
+        kwargs (dict[str, Any]): The arguments of the model.
+        key (tuple): The hashable content of the part.
+    """
+
+    __slots__ = ('model_class', 'kwargs', 'key', '_model', '_settings')
+
+    def __init__(self, model_class: type[BaseModel], kwargs: dict[str, Any]):
+        object.__setattr__(self, 'model_class', model_class)
+        object.__setattr__(self, 'kwargs', kwargs)
+        object.__setattr__(self, 'key', (model_class.__name__, _freeze(kwargs)))
+        object.__setattr__(self, '_model', None)
+        object.__setattr__(self, '_settings', None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
+    def __repr__(self) -> str:
+        return f'StylePart({self.model_class.__name__}, {self.kwargs})'
+
+    def __deepcopy__(self, memo: dict) -> StylePart:
+        # The part is immutable, so the copies of a style share it.
+        return self
+
+    def compile(self) -> tuple[BaseModel, dict[str, Any]]:
+        """
+        Validates the model of the part and serializes it, on the first call.
+
+        Returns:
+            tuple[BaseModel, dict[str, Any]]: The model and its settings in the
+                style map, which are shared and should not be modified.
+
+        Raises:
+            pydantic.ValidationError: If the arguments of the model are invalid.
+        """
+        if self._model is None:
+            model = self.model_class(**self.kwargs)
+            object.__setattr__(self, '_settings', model.model_dump(by_alias=True))
+            object.__setattr__(self, '_model', model)
+        return self._model, self._settings
+
+
 class DefaultStyle:
     """
     Module for defining and customizing default and custom styles for formatting purposes.
@@ -328,6 +393,34 @@ class DefaultStyle:
         )
 
 
+# The parts of a CustomStyle and their keys in the style map.
+_PART_ALIASES = {
+    'font': 'Font',
+    'fill': 'Fill',
+    'border': 'Border',
+    'ali': 'Alignment',
+    'protection': 'Protection',
+}
+
+
+def _part_property(name: str) -> property:
+    """
+    Creates the attribute of a CustomStyle giving the model of a part, which
+    can be modified or replaced like the models of the previous versions.
+    """
+
+    def getter(self: CustomStyle) -> BaseModel:
+        # The model may be modified in place once it is handed out.
+        self.__dict__.pop('_fingerprint', None)
+        return self._get_model(name)
+
+    def setter(self: CustomStyle, model: BaseModel) -> None:
+        self._models[name] = model
+        self.__dict__.pop('_fingerprint', None)
+
+    return property(getter, setter)
+
+
 class CustomStyle(DefaultStyle):
     def __init__(self, **kwargs):
         """
@@ -353,8 +446,105 @@ class CustomStyle(DefaultStyle):
             - border_color_* (str): Border colors for top, right, left, and bottom.
         """
         super().__init__()
+        self._parts: dict[str, StylePart] = {}
+        # The models of the parts read or set through the attributes, e.g.
+        # style.font, which are private to the style and may be modified.
+        self._models: dict[str, BaseModel] = {}
         self.set_custom_style(**kwargs)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # The fingerprint is computed again after any change of the settings.
+        self.__dict__.pop('_fingerprint', None)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CustomStyle):
+            return NotImplemented
+        return self is other or self.fingerprint == other.fingerprint
+
+    # A style can be changed, so it is not hashable like the other mutable
+    # objects. The registries of the styles are keyed by the fingerprint.
+    __hash__ = None
+
+    font = _part_property('font')
+    fill = _part_property('fill')
+    ali = _part_property('ali')
+    border = _part_property('border')
+    protection = _part_property('protection')
+
+    @property
+    def fingerprint(self) -> bytes:
+        """
+        The canonical content of the style, the JSON of the settings written to
+        the Excel file with sorted keys. The styles with the same settings have
+        the same fingerprint, so they are equal and registered once.
+
+        Notes:
+            The registries of the styles keep a copy of a style keyed by its
+            fingerprint, so a style can be changed after it is assigned to a
+            cell without changing the cell.
+            The fingerprint is not cached while the models of the style have
+            been read or set through its attributes, e.g. style.font, since
+            they can be modified in place.
+        """
+        fingerprint = self.__dict__.get('_fingerprint')
+        if fingerprint is None:
+            fingerprint = msgspec.json.encode(self._get_settings(), order='sorted')
+            if not self._models:
+                self.__dict__['_fingerprint'] = fingerprint
+        return fingerprint
+
+    def _get_settings(self) -> dict[str, Any]:
+        """
+        Gets the settings of the style in the style map of the shared library,
+        from the process-wide cache of the compiled styles if a style with the
+        same content key has already been compiled, see _get_content_key().
+
+        Returns:
+            dict[str, Any]: The settings of the style, which may be shared and
+                should not be modified.
+
+        Raises:
+            pydantic.ValidationError: If the settings of a part are invalid.
+        """
+        from .manager import StyleManager
+
+        return StyleManager._compile_style(self)
+
+    def _get_content_key(self) -> tuple:
+        """
+        Gets the key of the style in the cache of the compiled styles, made of
+        the keys of its parts and its number format, which is built without
+        validating or serializing the models.
+        """
+        return tuple(part.key for part in self._parts.values()), self.number_format
+
+    def _compile_settings(self) -> dict[str, Any]:
+        """
+        Builds the settings of the style without the cache. The parts are
+        compiled once and their settings are shared, unless their model has
+        been read or set through the attributes, e.g. style.font.
+
+        Raises:
+            pydantic.ValidationError: If the settings of a part are invalid.
+        """
+        settings = {}
+        for name, alias in _PART_ALIASES.items():
+            model = self._models.get(name)
+            if model is not None:
+                settings[alias] = model.model_dump(by_alias=True)
+            else:
+                settings[alias] = self._parts[name].compile()[1]
+        settings['CustomNumFmt'] = self.number_format
+        return settings
+
+    def _get_model(self, name: str) -> BaseModel:
+        model = self._models.get(name)
+        if model is None:
+            model = self._parts[name].compile()[0].model_copy(deep=True)
+            self._models[name] = model
+        return model
+
     def set_custom_style(self, **kwargs):
         self.font_params = kwargs.get('font_params', self.font_params)
         self.fill_params = kwargs.get('fill_params', self.fill_params)
@@ -391,55 +581,78 @@ class CustomStyle(DefaultStyle):
         self._apply_settings()
 
     def _apply_settings(self):
-        self.font = (
-            Font(**self.font_params)
-            if self.font_params
-            else Font(
-                size=self.font_size, name=self.font_name, bold=self.font_bold, color=self.font_color
-            )
-        )
-        self.fill = (
-            Fill(**self.fill_params)
-            if self.fill_params
-            else Fill(
-                ftype=self.fill_type,
-                color=self.fill_color,
-                pattern=self.fill_pattern,
-                shading=self.fill_shading,
-            )
-        )
-        self.ali = (
-            Alignment(**self.ali_params)
-            if self.ali_params
-            else Alignment(
-                horizontal=self.ali_horizontal,
-                vertical=self.ali_vertical,
-                wrap_text=self.ali_wrap_text,
-            )
-        )
-        self.border = (
-            Border(**self.border_params)
-            if self.border_params
-            else Border(
-                top=BorderStyle(style=self.border_style_top, color=self.border_color_top),
-                right=BorderStyle(style=self.border_style_right, color=self.border_color_right),
-                left=BorderStyle(style=self.border_style_left, color=self.border_color_left),
-                bottom=BorderStyle(style=self.border_style_bottom, color=self.border_color_bottom),
-            )
-        )
-        self.protection = (
-            Protection(**self.protection)
-            if self.protection_params
-            else Protection(
-                locked=self.protect,
-                hidden=self.hidden,
-            )
-        )
+        """
+        Builds the parts of the style from its settings, keeping the parts whose
+        settings have not changed. The models are validated when the style is
+        compiled, see StylePart.compile().
+        """
+        parts = {
+            'font': StylePart(
+                Font,
+                dict(self.font_params)
+                if self.font_params
+                else {
+                    'size': self.font_size,
+                    'name': self.font_name,
+                    'bold': self.font_bold,
+                    'color': self.font_color,
+                },
+            ),
+            'fill': StylePart(
+                Fill,
+                dict(self.fill_params)
+                if self.fill_params
+                else {
+                    'ftype': self.fill_type,
+                    'color': self.fill_color,
+                    'pattern': self.fill_pattern,
+                    'shading': self.fill_shading,
+                },
+            ),
+            'ali': StylePart(
+                Alignment,
+                dict(self.ali_params)
+                if self.ali_params
+                else {
+                    'horizontal': self.ali_horizontal,
+                    'vertical': self.ali_vertical,
+                    'wrap_text': self.ali_wrap_text,
+                },
+            ),
+            'border': StylePart(
+                Border,
+                dict(self.border_params)
+                if self.border_params
+                else {
+                    'top': {'style': self.border_style_top, 'color': self.border_color_top},
+                    'right': {'style': self.border_style_right, 'color': self.border_color_right},
+                    'left': {'style': self.border_style_left, 'color': self.border_color_left},
+                    'bottom': {
+                        'style': self.border_style_bottom,
+                        'color': self.border_color_bottom,
+                    },
+                },
+            ),
+            'protection': StylePart(
+                Protection,
+                dict(self.protection_params)
+                if self.protection_params
+                else {'locked': self.protect, 'hidden': self.hidden},
+            ),
+        }
+        for name, part in parts.items():
+            old_part = self._parts.get(name)
+            if old_part is not None and old_part.key == part.key:
+                parts[name] = old_part
+        self._parts = parts
+        # Like the settings, the models are built again from the parts.
+        self._models = {}
 
     def clone_and_modify(self, **kwargs):
         """
-        Create a deep copy of the current CustomStyle instance and modify it with
-        the provided attributes.
+        Create a copy of the current CustomStyle instance and modify it with
+        the provided attributes. The copy shares the parts of the style that
+        are not modified.
 
         Args:
             **kwargs: Keyword arguments for the style customization.
@@ -448,6 +661,8 @@ class CustomStyle(DefaultStyle):
         Returns:
             CustomStyle: A new CustomStyle instance with the modified attributes.
         """
-        cloned_style = copy.deepcopy(self)
+        cloned_style = object.__new__(self.__class__)
+        cloned_style.__dict__.update(self.__dict__)
+        cloned_style.__dict__.pop('_fingerprint', None)
         cloned_style.set_custom_style(**kwargs)
         return cloned_style
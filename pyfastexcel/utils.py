@@ -1,18 +1,35 @@
 from __future__ import annotations
 
+import datetime
+import decimal
 import logging
 import re
 import string
 import warnings
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
+
+import msgspec
 
 # from dataclasses import dataclass
 from pydantic.dataclasses import dataclass
 
 from pyfastexcel import CustomStyle
 
+from .storage import DATE_FORMAT, DATETIME_FORMAT, TIMEDELTA_FORMAT
+
+if TYPE_CHECKING:
+    from .manager import StyleCacheInfo
+
 warnings.simplefilter('always', DeprecationWarning)
 
+# The day 0 of the Excel serial numbers from 1900-03-01. Excel counts the
+# nonexistent 1900-02-29 as the day 60, so the earlier dates are one day less,
+# see excel_serial().
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+_ONE_DAY = datetime.timedelta(days=1)
+# The serial number of 1900-03-01.
+_EXCEL_MARCH_1900 = 61
+
 
 @dataclass
 class CommentText:
@@ -56,6 +73,32 @@ def set_debug_level(level: int):
     logging.basicConfig(level=level)
 
 
+WIRE_FORMATS = ('json', 'msgpack')
+
+
+def encode_payload(payload: dict[str, Any], wire_format: str = 'json') -> bytes:
+    """
+    Encodes a payload sent to the shared library.
+
+    Args:
+        payload (dict[str, Any]): The payload to encode.
+        wire_format (str): The encoding of the payload, 'json' or 'msgpack'.
+            MessagePack keeps numbers in binary form and does not escape
+            strings, so it is cheaper to encode and decode than JSON.
+
+    Returns:
+        bytes: The encoded payload.
+
+    Raises:
+        ValueError: If the wire format is not supported.
+    """
+    if wire_format == 'json':
+        return msgspec.json.encode(payload)
+    if wire_format == 'msgpack':
+        return msgspec.msgpack.encode(payload)
+    raise ValueError(f'Unsupported wire format {wire_format}, expected one of {WIRE_FORMATS}.')
+
+
 def deprecated_warning(msg: str):
     warnings.warn(
         msg,
@@ -70,27 +113,81 @@ def set_custom_style(style_name: str, style: CustomStyle) -> None:
     StyleManager.set_custom_style(style_name, style)
 
 
-def validate_and_register_style(style: CustomStyle) -> None:
+def style_cache_info() -> StyleCacheInfo:
+    """
+    Gets the statistics of the process-wide cache of the compiled styles, which
+    keeps the settings of the exported styles across the workbooks.
+
+    Returns:
+        StyleCacheInfo: The hits, misses, maximum size and current size of the
+            cache.
+    """
     from .manager import StyleManager
 
-    if not isinstance(style, CustomStyle):
-        raise TypeError(
-            f'Invalid type ({type(style)}). Style should be a CustomStyle object.',
-        )
-    StyleManager.set_custom_style(f'Custom Style {StyleManager._STYLE_ID}', style)
-    StyleManager._STYLE_ID += 1
+    return StyleManager.style_cache_info()
+
+
+def convert_cell_value(value: Any) -> tuple[Any, str | None]:
+    """
+    Converts a cell value into a value written natively by the shared library.
+
+    The datetimes, dates and timedeltas become Excel serial numbers, which
+    need a number format to be displayed as dates. The Decimals become
+    floats, None is kept as an empty cell, and the other values which are
+    not a number, a boolean or a string are converted to strings.
+
+    Args:
+        value (Any): The value of the cell.
+
+    Returns:
+        tuple[Any, str | None]: The converted value and the number format it
+            requires, or None.
+    """
+    cls = value.__class__
+    if cls is str or cls is int or cls is float or value is None:
+        return value, None
+    if isinstance(value, (int, str)):
+        return value, None
+    # msgpec does not support np.float64, so we should convert
+    # it to python float.
+    if isinstance(value, (float, decimal.Decimal)):
+        return float(value), None
+    if isinstance(value, datetime.datetime):
+        # Excel has no time zone, the local time is written.
+        value = value.replace(tzinfo=None)
+        serial = excel_serial((value - _EXCEL_EPOCH) / _ONE_DAY)
+        # Like excelize, the dates before 1900 are written as strings.
+        return (serial, DATETIME_FORMAT) if serial >= 1 else (f'{value}', None)
+    if isinstance(value, datetime.date):
+        serial = excel_serial(float((value - _EXCEL_EPOCH.date()).days))
+        return (serial, DATE_FORMAT) if serial >= 1 else (f'{value}', None)
+    if isinstance(value, datetime.timedelta):
+        return value / _ONE_DAY, TIMEDELTA_FORMAT
+    return f'{value}', None
+
+
+def excel_serial(days: Any) -> Any:
+    """
+    Converts the days since 1899-12-30 into Excel serial numbers, which skip
+    1900-02-29 as they count it as a day. The serial numbers less than 1 are
+    the dates before 1900, which Excel can not write as numbers.
+
+    Args:
+        days (float | numpy.ndarray): The days, or an array of the days.
+
+    Returns:
+        float | numpy.ndarray: The serial numbers.
+    """
+    return days - (days < _EXCEL_MARCH_1900)
 
 
 def validate_and_format_value(
     value: Any,
     set_default_style: bool = True,
 ) -> tuple[Any, Literal['DEFAULT_STYLE']] | Any:
-    # Convert non-numeric value to string
-    value = f'{value}' if not isinstance(value, (int, float, str)) else value
-    # msgpec does not support np.float64, so we should convert
-    # it to python float.
-    value = float(value) if isinstance(value, float) else value
-
+    # The number format of the dates is dropped, see WorkSheet._format_cell
+    # which also applies it to the style of the cell.
+    value = convert_cell_value(value)[0]
     return (value, 'DEFAULT_STYLE') if set_default_style else value
 
 
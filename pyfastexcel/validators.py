@@ -81,7 +81,10 @@ class TableFinalValidation(BaseModel):
                     'Please write a row for table first row.'
                 )
 
-            if len(set(self.data[start_row])) != len(self.data[start_row]):
+            # Only the header of the table matters, the cells out of the table range
+            # may be padding cells, e.g. in a ColumnarStorage.
+            header = self.data[start_row][start_col : end_col + 1]
+            if len(set(header)) != len(header):
                 raise ValueError(
                     'Invalid table header. ' 'The first row contains duplicate values.'
                 )
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Literal, Optional, overload
+import ctypes
+import os
+from typing import List, Literal, Optional, Sequence, overload
 
 from pydantic import validate_call as pydantic_validate_call
 
@@ -91,6 +93,7 @@ class Workbook(ExcelDriver):
         sheet_name: str,
         pre_allocate: dict[str, int] = None,
         plain_data: list[list] = None,
+        storage: Literal['list', 'columnar', 'sparse'] = 'list',
     ) -> WorkSheet:
         """
         Creates a new sheet, and set it as current self.sheet.
@@ -102,12 +105,19 @@ class Workbook(ExcelDriver):
                 for pre-allocating data in new sheet.
             plain_data (list[list[str]], optional): A 2D list of strings
                 representing initial data to populate new sheet.
+            storage (Literal['list', 'columnar', 'sparse']): The storage of the cells of
+                the new sheet, see WorkSheet.
         Return:
             WorkSheet instance.
         """
         if self.workbook.get(sheet_name) is not None:
             raise ValueError(f'Sheet {sheet_name} already exists.')
-        self.workbook[sheet_name] = WorkSheet(pre_allocate=pre_allocate, plain_data=plain_data)
+        self.workbook[sheet_name] = WorkSheet(
+            pre_allocate=pre_allocate,
+            plain_data=plain_data,
+            style_manager=self.style,
+            storage=storage,
+        )
         self.sheet = sheet_name
         self._sheet_list = tuple([x for x in self._sheet_list] + [sheet_name])
         return self.workbook[sheet_name]
@@ -580,3 +590,95 @@ class Workbook(ExcelDriver):
                 classic_layout=classic_layout,
                 pivot_table_style_name=pivot_table_style_name,
             )
+
+
+def export_many(
+    workbooks: Sequence[ExcelDriver],
+    paths: Sequence[str],
+    max_workers: int = None,
+    lib_path: str = None,
+    ignore_go_panic: bool = True,
+    wire_format: str = None,
+) -> list[str | None]:
+    """
+    Writes several workbooks to their paths in a single call to the shared
+    library, which builds the files concurrently on a pool of goroutines.
+
+    A failure only affects its own workbook, the status of every workbook is
+    returned instead of raising an error. A workbook which fails to be encoded,
+    e.g. with an invalid table, is not sent to the shared library.
+
+    Args:
+        workbooks (Sequence[ExcelDriver]): The workbooks to export.
+        paths (Sequence[str]): The path to save each workbook.
+        max_workers (int, optional): The maximum number of files built at the
+            same time. Defaults to the number of CPUs.
+        lib_path (str, optional): The path to the library. Defaults to None.
+        ignore_go_panic (bool): The flag to determine should trigger panic in go.
+        wire_format (str, optional): The encoding of the payloads, 'json' or
+            'msgpack'. Defaults to the WIRE_FORMAT of each workbook.
+
+    Returns:
+        list[str | None]: The error message of each workbook, None if the
+            workbook was written.
+
+    Raises:
+        ValueError: If the numbers of workbooks and paths are different, or a
+            workbook has sources streamed at export, e.g. by write_arrow().
+    """
+    if len(workbooks) != len(paths):
+        raise ValueError(
+            f'Got {len(workbooks)} workbooks but {len(paths)} paths, they should be the same.'
+        )
+    if any(wb._has_row_sources() for wb in workbooks):
+        raise ValueError(
+            'The workbooks with streamed sources, e.g. by write_arrow, should be '
+            'exported by save().'
+        )
+    results: list[str | None] = [None] * len(workbooks)
+    payloads, encoded_paths, indexes = [], [], []
+    for i, (wb, path) in enumerate(zip(workbooks, paths)):
+        try:
+            payloads.append(wb._encode_workbook(wire_format))
+        except Exception as err:
+            # A workbook which can not be encoded, e.g. with an invalid table,
+            # fails alone like a workbook which fails in the shared library.
+            results[i] = str(err)
+            continue
+        encoded_paths.append(os.fsencode(path))
+        indexes.append(i)
+    if not payloads:
+        return results
+
+    count = len(payloads)
+    lib = workbooks[0]._read_lib(lib_path)
+
+    export_files = lib.ExportFiles
+    free_pointer = lib.FreeCPointer
+    free_pointer.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+    export_files.argtypes = [
+        ctypes.POINTER(ctypes.c_char_p),
+        ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(ctypes.c_char_p),
+        ctypes.c_int64,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_void_p),
+        ctypes.c_int64,
+    ]
+    export_files.restype = None
+    err_msgs = (ctypes.c_void_p * count)()
+    export_files(
+        (ctypes.c_char_p * count)(*payloads),
+        (ctypes.c_int64 * count)(*[len(payload) for payload in payloads]),
+        (ctypes.c_char_p * count)(*encoded_paths),
+        count,
+        max_workers or 0,
+        err_msgs,
+        0 if ignore_go_panic is False else 1,
+    )
+
+    for i, err_msg in zip(indexes, err_msgs):
+        if err_msg:
+            results[i] = ctypes.string_at(err_msg).decode()
+            free_pointer(err_msg, 0)
+    return results
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, List, Literal, Optional, overload
+from typing import Any, Iterable, List, Literal, Optional, overload
 
 from pydantic import validate_call as pydantic_validate_call
 
@@ -22,16 +22,17 @@ from .chart import (
 from .manager import StyleManager
 from .pivot import PivotTable, PivotTableField
 from .serializers import CommentSerializer, DataValidationSerializer, PanesSerializer
+from .storage import ArrayBlock, ColumnarStorage, RowSource, SparseStorage
 from .utils import (
     CommentText,
     Selection,
     _separate_alpha_numeric,
     cell_reference_to_index,
     column_to_index,
+    convert_cell_value,
     deprecated_warning,
     transfer_string_slice_to_slice,
     validate_and_format_value,
-    validate_and_register_style,
 )
 from .validators import validate_call
 
@@ -50,6 +51,8 @@ class WorkSheetBase:
         self,
         pre_allocate: Optional[dict[str, int]] = None,
         plain_data: Optional[list[list[str]]] = None,
+        style_manager: Optional[StyleManager] = None,
+        storage: Literal['list', 'columnar', 'sparse'] = 'list',
     ):
         """
         Initializes a WorkSheet instance with optional pre-allocation of data or initialization
@@ -61,6 +64,15 @@ class WorkSheetBase:
                 This can enhancement the performance when you need to write a large excel
             plain_data (list[list[str]], optional): A 2D list of strings representing the
                 initial data to populate the worksheet.
+            style_manager (StyleManager, optional): The StyleManager of the workbook,
+                which registers the CustomStyle assigned to the cells. A new one is
+                created if it is not provided.
+            storage (Literal['list', 'columnar', 'sparse']): The storage of the cells. 'list'
+                keeps a list of rows of (value, style) tuples, while 'columnar' keeps
+                typed arrays per column, which takes a fraction of the memory for
+                large sheets and builds the tuples only when the cells are read.
+                'sparse' only keeps the cells which are written, for a few cells
+                scattered on a large area.
 
         Notes:
             If both `pre_allocate` and `plain_data` are provided, `plain_data` takes precedence.
@@ -79,13 +91,20 @@ class WorkSheetBase:
 
         Raises:
             TypeError: If `plain_data` is provided but is not a valid 2D list of strings.
+            ValueError: If `storage` is not 'list', 'columnar' or 'sparse'.
 
         """
         self._sheet = self._get_default_sheet()
-        self._data = []
+        self._style_manager = style_manager if style_manager is not None else StyleManager()
+        storage_types = {'list': list, 'columnar': ColumnarStorage, 'sparse': SparseStorage}
+        if storage not in storage_types:
+            raise ValueError(f"storage should be 'list', 'columnar' or 'sparse', got {storage}.")
+        self._data = storage_types[storage]()
         self._merged_cells_list = []
         self._width_dict = {}
         self._height_dict = {}
+        self._column_style_dict = {}
+        self._row_style_dict = {}
         self._panes_dict = {}
         self._comment_list = []
         self._auto_filter_set = set()
@@ -95,6 +114,17 @@ class WorkSheetBase:
         self._table_list = []
         self._chart_list = []
         self._pivot_table_list = []
+        self._array_list: list[ArrayBlock] = []
+        # The (start row, start col, stop row, stop col, style) rules of
+        # set_style() on a range, resolved when the cells are accessed again
+        # or by the shared library at export.
+        self._style_rules: list[tuple[int, int, int, int, str]] = []
+        # The sources streamed after the other rows when the workbook is
+        # exported, e.g. the record batches of write_arrow().
+        self._source_list = []
+        # The styles registered with the number format of the dates, keyed by
+        # the (style, number format), see _get_formatted_style().
+        self._formatted_styles: dict[tuple[str, str], str] = {}
         self._sheet_visible = True
         # Using pyfastexcel to write as default
         self._excel_engine: Literal['pyfastexcel', 'openpyxl'] = 'pyfastexcel'
@@ -117,18 +147,29 @@ class WorkSheetBase:
                 int,
             ):
                 raise TypeError('n_rows and n_cols must be integers.')
-            self._data = [[None] * pre_allocate['n_cols'] for _ in range(pre_allocate['n_rows'])]
+            if storage == 'columnar':
+                self._data = ColumnarStorage.allocate(
+                    pre_allocate['n_rows'], pre_allocate['n_cols']
+                )
+            elif storage == 'sparse':
+                # The sparse storage only keeps the cells which are written.
+                self._data.expand(pre_allocate['n_rows'] - 1, pre_allocate['n_cols'] - 1)
+            else:
+                self._data = [
+                    [None] * pre_allocate['n_cols'] for _ in range(pre_allocate['n_rows'])
+                ]
 
         if plain_data is not None:
             if not isinstance(plain_data, list) or any(
                 not isinstance(row, list) for row in plain_data
             ):
                 raise TypeError('plain_data should be a valid 2D list of strings.')
-            self._data = plain_data
+            self._data = plain_data if storage == 'list' else storage_types[storage](plain_data)
             self._sheet['NoStyle'] = True
 
     @property
     def data(self):
+        self._resolve_style_rules()
         return self._data
 
     @property
@@ -150,10 +191,44 @@ class WorkSheetBase:
         self._data[row][col] = (self._data[row][col][0], style)
 
     def _apply_style_to_slice_target(self, target: slice, style: str) -> None:
-        start_row, start_col, stop_row, stop_col = self._extract_slice_indices(target)
-        for row in range(start_row, stop_row + 1):
-            for col in range(start_col, stop_col + 1):
-                self._data[row][col] = (self._data[row][col][0], style)
+        # The style is recorded as a rule instead of rewriting every cell.
+        start_row, start_col = cell_reference_to_index(target.start)
+        stop_row, stop_col = cell_reference_to_index(target.stop)
+        if min(start_row, start_col, stop_row, stop_col) < 0:
+            raise ValueError(f'Invalid range: {target.start}:{target.stop}')
+        if max(start_row, stop_row) >= self.MAX_ROW or max(start_col, stop_col) >= self.MAX_COL:
+            raise ValueError(f'Invalid range: {target.start}:{target.stop}')
+        self._style_rules.append(
+            (
+                min(start_row, stop_row),
+                min(start_col, stop_col),
+                max(start_row, stop_row),
+                max(start_col, stop_col),
+                style,
+            )
+        )
+
+    def _resolve_style_rules(self) -> None:
+        """
+        Applies the style rules recorded by set_style() to the written cells,
+        in the order they were recorded, so the later rules override the
+        earlier ones. The cells not written yet are kept.
+        """
+        if not self._style_rules:
+            return
+        rules, self._style_rules = self._style_rules, []
+        for block in self._array_list:
+            block._keep_style_rules(rules)
+        data = self._data
+        for start_row, start_col, stop_row, stop_col, style in rules:
+            for row in range(start_row, min(stop_row + 1, len(data))):
+                cells = data[row]
+                for col in range(start_col, min(stop_col + 1, len(cells))):
+                    cell = cells[col]
+                    if cell is None or cell == ():
+                        continue
+                    value = cell[0] if cell.__class__ is tuple else cell
+                    cells[col] = (value, style)
 
     def _apply_style_to_list_target(self, target: list[int, int], style: str) -> None:
         row = target[0]
@@ -167,6 +242,10 @@ class WorkSheetBase:
         self._data[row][col] = (self._data[row][col][0], style)
 
     def _expand_row_and_cols(self, target_row: int, target_col: int) -> None:
+        if isinstance(self._data, (ColumnarStorage, SparseStorage)):
+            # The cell storages read the cells not written as empty tuples.
+            self._data.expand(target_row, target_col)
+            return
         data_row_len = len(self._data)
         d = ()
         if data_row_len == 0:
@@ -197,6 +276,9 @@ class WorkSheetBase:
             'MergeCells': self._merged_cells_list,
             'Width': self._width_dict,
             'Height': self._height_dict,
+            'ColStyle': self._column_style_dict,
+            'RowStyle': self._row_style_dict,
+            'StyleRules': self._style_rules,
             'AutoFilter': self._auto_filter_set,
             'Panes': self._panes_dict,
             'DataValidation': self._data_validation_list,
@@ -218,6 +300,9 @@ class WorkSheetBase:
             'MergeCells': [],
             'Width': {},
             'Height': {},
+            'ColStyle': {},
+            'RowStyle': {},
+            'StyleRules': [],
             'AutoFilter': set(),
             'Panes': {},
             'DataValidation': [],
@@ -257,7 +342,7 @@ class WorkSheetBase:
             or a CustomStyle object.
         """
         if not isinstance(value, tuple):
-            value = validate_and_format_value(value)
+            value = self._format_cell(value, 'DEFAULT_STYLE')
         else:
             if len(value) != 2:
                 raise ValueError(
@@ -269,16 +354,41 @@ class WorkSheetBase:
                 )
             # The case that user do not register the Custom Style by 'Class attributes'
             # or set_custom_style function.
-            if (
-                isinstance(value[1], CustomStyle)
-                and StyleManager._STYLE_NAME_MAP.get(value[1]) is None
-            ):
-                validate_and_register_style(value[1])
-                style = StyleManager._STYLE_NAME_MAP[value[1]]
-                value = (value[0], style)
+            if isinstance(value[1], CustomStyle):
+                value = (value[0], self._style_manager._register_style(value[1]))
+            value = self._format_cell(*value)
         return value
 
+    def _format_cell(self, value: Any, style: str) -> tuple[Any, str]:
+        """
+        Converts the value of a cell with convert_cell_value, and gives the
+        number format required by the value, e.g. of a date, to the style.
+        """
+        value, number_format = convert_cell_value(value)
+        if number_format is not None:
+            style = self._get_formatted_style(style, number_format)
+        return value, style
+
+    def _get_formatted_style(self, style: str, number_format: str) -> str:
+        """
+        Gets the name of the style with the number format, if the style has no
+        number format. The formatted styles are registered once per sheet.
+        """
+        key = (style, number_format)
+        formatted_style = self._formatted_styles.get(key)
+        if formatted_style is None:
+            custom_style = self._style_manager._get_registered_style(style)
+            if custom_style is None or custom_style.number_format.lower() != 'general':
+                formatted_style = style
+            else:
+                formatted_style = self._style_manager._register_style(
+                    custom_style.clone_and_modify(number_format=number_format)
+                )
+            self._formatted_styles[key] = formatted_style
+        return formatted_style
+
     def __getitem__(self, key: str | slice) -> tuple | list[tuple]:
+        self._resolve_style_rules()
         if isinstance(key, slice):
             return self._get_cell_by_slice(key)
         elif isinstance(key, int):
@@ -290,6 +400,7 @@ class WorkSheetBase:
             return self._get_cell_by_location(key)
 
     def __setitem__(self, key: str | slice | int, value: Any) -> None:
+        self._resolve_style_rules()
         if isinstance(key, slice):
             self._set_cell_by_slice(key, value)
         elif isinstance(key, int):
@@ -388,13 +499,13 @@ class WorkSheet(WorkSheetBase):
                 Defaults to 'DEFAULT_STYLE'.
         """
         if not isinstance(value, tuple):
-            value = (f'{value}', style)
-        elif not isinstance(value[1], (str, CustomStyle)):
-            raise TypeError('Style should be a string or CustomStyle object.')
+            value = (value, style)
+        value = self._validate_value_and_set_default(value)
         if row < 1 or row > self.MAX_ROW:
             raise ValueError(f'Invalid row index: {row}')
         if column < 1 or column > self.MAX_COL:
             raise ValueError(f'Invalid column index: {column}')
+        self._resolve_style_rules()
         try:
             self._data[row][column] = value
         except IndexError:
@@ -409,39 +520,302 @@ class WorkSheet(WorkSheetBase):
         """
         Applies a specified style to a target range of cells.
 
+        The style of a range is recorded as a rule instead of being written to
+        every cell at once. The rules are applied in order, so the later ones
+        override the earlier ones, when the cells are accessed again or by the
+        shared library at export. A rule only styles the cells written before
+        it.
+
         Args:
             target (str | slice | list[int, int]): Target cells to apply style.
             style (CustomStyle | str): Style to apply to the cells.
 
         Raises:
             TypeError: If target type is invalid.
-            ValueError: If style is not registered.
+            ValueError: If style is not registered or the target is out of the sheet.
         """
         if isinstance(style, str):
-            if StyleManager.REGISTERED_STYLES.get(style) is None:
+            if self._style_manager._get_registered_style(style) is None:
                 raise ValueError(
                     f'Style not found: {style}. Style should be register by '
                     'set_custom_style function when you set a style with '
                     'string.',
                 )
         elif isinstance(style, CustomStyle):
-            if StyleManager._STYLE_NAME_MAP.get(style) is None:
-                validate_and_register_style(style)
-            style = StyleManager._STYLE_NAME_MAP[style]
+            style = self._style_manager._register_style(style)
 
         if isinstance(target, str):
             if ':' in target:
                 target = transfer_string_slice_to_slice(target)
                 self._apply_style_to_slice_target(target, style)
             else:
+                self._resolve_style_rules()
                 self._apply_style_to_string_target(target, style)
         elif isinstance(target, slice):
             self._apply_style_to_slice_target(target, style)
         elif isinstance(target, list) and len(target) == 2:
+            self._resolve_style_rules()
             self._apply_style_to_list_target(target, style)
         else:
             raise TypeError('Target should be a string, slice, or list[row, index].')
 
+    def write_array(
+        self,
+        array: Any,
+        anchor: str = 'A1',
+        style: str | CustomStyle = 'DEFAULT_STYLE',
+    ) -> None:
+        """
+        Writes a 2-D NumPy array, or a list of 1-D arrays as columns, from the
+        anchor cell with a single style.
+
+        The numeric and boolean arrays are sent to the shared library as their
+        raw buffer, so their cells are never created in python. The arrays of
+        the other dtypes are written cell by cell like the other setters.
+
+        Args:
+            array (numpy.ndarray | list[numpy.ndarray]): The 2-D array, or the
+                1-D arrays of the columns.
+            anchor (str): The top left cell of the array. Defaults to 'A1'.
+            style (str | CustomStyle, optional): The style of the cells.
+                Defaults to 'DEFAULT_STYLE'.
+
+        Raises:
+            TypeError: If the array is neither a 2-D array nor a list of 1-D arrays.
+            ValueError: If the style is not registered, or the array does not fit
+                in the sheet.
+
+        Notes:
+            The cells written from a raw buffer can not be read back from the
+            worksheet, and they are written over the other cells of the same
+            location.
+        """
+        import numpy as np
+
+        style = self._get_style_name(style)
+        if isinstance(array, (list, tuple)):
+            columns = [np.asarray(column) for column in array]
+            if any(column.ndim != 1 for column in columns):
+                raise TypeError('The columns should be 1-D arrays.')
+            arrays = [column.reshape(-1, 1) for column in columns]
+        else:
+            array = np.asarray(array)
+            if array.ndim != 2:
+                raise TypeError(f'The array should be a 2-D array, got {array.ndim}-D.')
+            arrays = [array]
+
+        row, col = cell_reference_to_index(anchor)
+        n_rows = max((a.shape[0] for a in arrays), default=0)
+        n_cols = sum(a.shape[1] for a in arrays)
+        if row < 0 or col < 0 or row + n_rows > self.MAX_ROW or col + n_cols > self.MAX_COL:
+            raise ValueError(f'The array does not fit in the sheet from {anchor}.')
+
+        for array in arrays:
+            if array.size != 0:
+                self._write_array_block(array, row, col, style)
+            col += array.shape[1]
+
+    def write_dataframe(
+        self,
+        df: Any,
+        anchor: str = 'A1',
+        index: bool = False,
+        header: bool = True,
+        column_styles: Optional[dict[Any, str | CustomStyle]] = None,
+        header_style: str | CustomStyle = 'DEFAULT_STYLE',
+    ) -> None:
+        """
+        Writes a pandas DataFrame from the anchor cell.
+
+        Every column is converted once by its dtype and sent to the shared
+        library as a raw buffer, like write_array(). The datetimes are written
+        as Excel serial numbers with a date number format, and the strings,
+        including the categories, are sent once with the codes of the cells.
+        The columns of mixed objects are written cell by cell.
+
+        Args:
+            df (pandas.DataFrame): The DataFrame to write.
+            anchor (str): The top left cell of the DataFrame. Defaults to 'A1'.
+            index (bool): Whether to write the index as the first columns.
+                Defaults to False.
+            header (bool): Whether to write the column names in the first row.
+                Defaults to True.
+            column_styles (dict[Any, str | CustomStyle], optional): The styles of
+                the columns keyed by their names. The other columns take the
+                DEFAULT_STYLE. The date number format is added to the style of a
+                column of datetimes if the style has no number format.
+            header_style (str | CustomStyle, optional): The style of the column
+                names. Defaults to 'DEFAULT_STYLE'.
+
+        Raises:
+            ValueError: If a style is not registered, a column of column_styles
+                is not in the DataFrame, or the DataFrame does not fit in the sheet.
+        """
+        from .dataframe import convert_column
+
+        if index:
+            df = df.reset_index()
+        column_styles = column_styles or {}
+        missing = [name for name in column_styles if name not in df.columns]
+        if missing:
+            raise ValueError(f'The columns {missing} are not in the DataFrame.')
+
+        row, col = cell_reference_to_index(anchor)
+        n_rows, n_cols = len(df) + (1 if header else 0), len(df.columns)
+        if row < 0 or col < 0 or row + n_rows > self.MAX_ROW or col + n_cols > self.MAX_COL:
+            raise ValueError(f'The DataFrame does not fit in the sheet from {anchor}.')
+
+        if header and n_cols:
+            header_style = self._get_style_name(header_style)
+            self._resolve_style_rules()
+            self._expand_row_and_cols(row, col + n_cols - 1)
+            self._data[row][col : col + n_cols] = [
+                (validate_and_format_value(name, set_default_style=False), header_style)
+                for name in df.columns
+            ]
+            row += 1
+
+        for j, (name, series) in enumerate(df.items()):
+            style = self._get_style_name(column_styles.get(name, 'DEFAULT_STYLE'))
+            converted = convert_column(series)
+            if converted is None:
+                values = series.astype(object).where(series.notna(), None).to_numpy()
+                values = values.reshape(-1, 1)
+                self._write_array_block(values, row, col + j, style)
+                continue
+            if converted.number_format is not None:
+                style = self._get_formatted_style(style, converted.number_format)
+            if converted.strings is not None:
+                self._append_array_block(
+                    ArrayBlock.from_codes(converted.values, converted.strings, row, col + j, style)
+                )
+            else:
+                self._write_array_block(converted.values.reshape(-1, 1), row, col + j, style)
+
+    def write_arrow(
+        self,
+        data: Any,
+        header: bool = True,
+        column_styles: Optional[dict[str, str | CustomStyle]] = None,
+        header_style: str | CustomStyle = 'DEFAULT_STYLE',
+    ) -> None:
+        """
+        Writes an Apache Arrow table or a stream of record batches after the
+        other rows of the sheet, from the column A.
+
+        The record batches are read when the workbook is exported, and sent to
+        the shared library one at a time. Every column of a batch is sent as a
+        raw buffer like write_array(): the numbers without nulls are sent as the
+        bytes of their buffer, without a Python object per cell, the strings
+        are sent once with the codes of the cells, and the dates are written as
+        Excel serial numbers with a date number format. The columns of the
+        other types, e.g. lists, are written cell by cell.
+
+        A RecordBatchReader or an iterator of record batches is consumed by the
+        export, so the workbook can be exported only once.
+
+        Args:
+            data (Any): A pyarrow Table, RecordBatch, RecordBatchReader or an
+                iterable of RecordBatch with the same schema.
+            header (bool): Whether to write the column names in the first row.
+                Defaults to True.
+            column_styles (dict[str, str | CustomStyle], optional): The styles of
+                the columns keyed by their names. The other columns take the
+                DEFAULT_STYLE. The date number format is added to the style of a
+                column of dates if the style has no number format.
+            header_style (str | CustomStyle, optional): The style of the column
+                names. Defaults to 'DEFAULT_STYLE'.
+
+        Raises:
+            TypeError: If the data is not Arrow data.
+            ValueError: If a style is not registered, or a column of column_styles
+                is not in the data.
+        """
+        from .arrow import ArrowSource, get_number_format, read_batches
+
+        schema, batches = read_batches(data)
+        column_styles = column_styles or {}
+        missing = [name for name in column_styles if name not in schema.names]
+        if missing:
+            raise ValueError(f'The columns {missing} are not in the Arrow data.')
+        if len(schema) > self.MAX_COL:
+            raise ValueError(f'The Arrow data has more than {self.MAX_COL} columns.')
+
+        styles = []
+        for field in schema:
+            style = self._get_style_name(column_styles.get(field.name, 'DEFAULT_STYLE'))
+            number_format = get_number_format(field.type)
+            if number_format is not None:
+                style = self._get_formatted_style(style, number_format)
+            styles.append(style)
+        header_row = None
+        if header:
+            header_style = self._get_style_name(header_style)
+            header_row = [(name, header_style) for name in schema.names]
+        self._source_list.append(ArrowSource(schema, batches, styles, header_row))
+
+    def write_rows(self, rows: Iterable[Iterable[Any]], chunk_size: int = 10000) -> None:
+        """
+        Writes the rows of an iterable after the other rows of the sheet, from
+        the column A.
+
+        The rows are pulled lazily when the workbook is exported, chunk_size
+        rows at a time, and every chunk is sent to the shared library before
+        the next one is pulled. So the rows of a generator, e.g. a database
+        cursor or a CSV reader, are never held in memory as a whole.
+
+        A cell is a value or a (value, style) tuple like the other cells of the
+        sheet, and None is written as an empty cell. An iterator is consumed by
+        the export, so the workbook can be exported only once.
+
+        Args:
+            rows (Iterable[Iterable[Any]]): The rows to write.
+            chunk_size (int): The number of rows sent to the shared library at
+                a time. Defaults to 10000.
+
+        Raises:
+            ValueError: If chunk_size is not a positive integer.
+        """
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError(f'chunk_size should be a positive integer, got {chunk_size}.')
+        self._source_list.append(RowSource(rows, chunk_size, self._validate_value_and_set_default))
+
+    def _get_style_name(self, style: str | CustomStyle) -> str:
+        """
+        Gets the name of a style, and registers it if it is a CustomStyle.
+
+        Raises:
+            ValueError: If the style is a name which is not registered.
+        """
+        if isinstance(style, CustomStyle):
+            return self._style_manager._register_style(style)
+        if self._style_manager._get_registered_style(style) is None:
+            raise ValueError(
+                f'Style not found: {style}. Style should be register by '
+                'set_custom_style function when you set a style with string.',
+            )
+        return style
+
+    def _append_array_block(self, block: ArrayBlock) -> None:
+        # Only the style rules recorded from now on style the cells of the block.
+        block._rule_start = len(self._style_rules)
+        self._array_list.append(block)
+
+    def _write_array_block(self, array: Any, row: int, col: int, style: str) -> None:
+        block = ArrayBlock.from_array(array, row, col, style)
+        if block is not None:
+            self._append_array_block(block)
+            return
+        # The dtypes which can not be sent as a buffer, e.g. strings or objects.
+        # None is kept as an empty cell.
+        self._resolve_style_rules()
+        n_cols = array.shape[1]
+        for i, values in enumerate(array.tolist()):
+            self._expand_row_and_cols(row + i, col + n_cols - 1)
+            self._data[row + i][col : col + n_cols] = [
+                self._format_cell(value, style) for value in values
+            ]
+
     @pydantic_validate_call
     def set_cell_width(self, col: str | int, value: int) -> None:
         if isinstance(col, str):
@@ -456,6 +830,47 @@ class WorkSheet(WorkSheetBase):
             raise ValueError(f'Invalid row index: {row}')
         self._height_dict[row] = value
 
+    def set_column_style(self, col: str | int, style: str | CustomStyle) -> None:
+        """
+        Sets the default style of a column.
+
+        The style is written once for the column instead of for every cell.
+        The cells of the column with the DEFAULT_STYLE take the style of the
+        column, the cells with another style keep their own.
+
+        Args:
+            col (str | int): The column letter or the 1-based column index.
+            style (str | CustomStyle): The style of the column.
+
+        Raises:
+            ValueError: If the column is invalid or the style is not registered.
+        """
+        if isinstance(col, str):
+            col = column_to_index(col)
+        if col < 1 or col > self.MAX_COL:
+            raise ValueError(f'Invalid column index: {col}')
+        self._column_style_dict[col] = self._get_style_name(style)
+
+    def set_row_style(self, row: int, style: str | CustomStyle) -> None:
+        """
+        Sets the default style of a row.
+
+        The style is written once for the row instead of for every cell. The
+        cells of the row with the DEFAULT_STYLE take the style of the row,
+        which takes precedence over the style of their column, the cells with
+        another style keep their own.
+
+        Args:
+            row (int): The 1-based row index.
+            style (str | CustomStyle): The style of the row.
+
+        Raises:
+            ValueError: If the row is invalid or the style is not registered.
+        """
+        if row < 1 or row > self.MAX_ROW:
+            raise ValueError(f'Invalid row index: {row}')
+        self._row_style_dict[row] = self._get_style_name(style)
+
     @overload
     def set_merge_cell(
         self,
@@ -4,11 +4,34 @@ from typing import Any, Optional
 
 from pyfastexcel import CustomStyle
 
-from .utils import validate_and_format_value, validate_and_register_style
+from ._typing import Writable
+from .session import ExportSession
+from .storage import StringPool
+from .utils import cell_reference_to_index, index_to_column
+from .validators import TableFinalValidation
 from .workbook import Workbook
 from .worksheet import WorkSheet
 
 
+class StyleHandle:
+    """
+    A style resolved once by StreamWriter.style_handle(), which is used by
+    row_append and row_append_list without resolving the style again.
+
+    Attributes:
+        name (str): The name of the registered style.
+    """
+
+    __slots__ = ('name', '_writer')
+
+    def __init__(self, name: str, writer: StreamWriter):
+        self.name = name
+        self._writer = writer
+
+    def __repr__(self) -> str:
+        return f'StyleHandle({self.name!r})'
+
+
 class StreamWriter(Workbook):
     """
     A class for writing data to Excel files with or without custom styles.
@@ -19,8 +42,19 @@ class StreamWriter(Workbook):
         self._row_list = []
         self.data = data
         self._collections = self._get_style_collections()
-        self._collections_list = list(self._collections)
         self._cache = {}
+        self._session = None
+        self._string_pool = None
+        self._session_sheet = None
+        self._closed_sheets = set()
+        self._batch_size = None
+        # The number of rows pushed in the export session for each sheet, and
+        # the header rows of the tables already pushed, see _validate_tables().
+        self._pushed_rows: dict[str, int] = {}
+        self._table_headers: dict[tuple[str, int], Any] = {}
+        # Whether the rows of the export session were written to a file by the
+        # shared library, so they are no longer kept anywhere in Python.
+        self._streamed_to_file = False
 
     @property
     def wb(self) -> StreamWriter:
@@ -30,53 +64,96 @@ class StreamWriter(Workbook):
     def ws(self) -> WorkSheet:
         return self.workbook[self.sheet]
 
-    def _handle_custom_style(self, style_instance: CustomStyle, kwargs: dict[str, Any]) -> None:
+    def style_handle(
+        self,
+        style: str | CustomStyle = 'DEFAULT_STYLE',
+        **kwargs,
+    ) -> StyleHandle:
+        """
+        Resolves a style, with the keyword arguments modifying it, once and
+        returns a handle to it. row_append and row_append_list use the style
+        of a handle as it is, without resolving it again for every call.
+
+        Args:
+            style (str | CustomStyle): The style, can be either a style name
+                or a CustomStyle object.
+            **kwargs: Additional keyword arguments to modify the style.
+
+        Returns:
+            StyleHandle: The handle of the style, which can only be used with
+                this writer.
+
+        Raises:
+            ValueError: If the style name is not found.
+        """
+        return StyleHandle(self._resolve_style(style, kwargs), self)
+
+    def _resolve_style(self, style: str | CustomStyle | StyleHandle, kwargs: dict[str, Any]) -> str:
+        """
+        Gets the name of the style of a cell, registering it if needed.
+        """
+        if isinstance(style, StyleHandle):
+            if style._writer is not self:
+                raise ValueError(f'{style} was not created by this writer.')
+            if kwargs:
+                raise ValueError(
+                    'The style of a StyleHandle can not be modified, pass the keyword '
+                    'arguments to style_handle() instead.'
+                )
+            return style.name
+        if isinstance(style, CustomStyle):
+            return self._handle_custom_style(style, kwargs)
+        if isinstance(style, str):
+            return self._handle_string_style(style, kwargs)
+        return style
+
+    def _handle_custom_style(self, style_instance: CustomStyle, kwargs: dict[str, Any]) -> str:
         """
         Handle the case when style is a CustomStyle instance.
         """
-        if self.style._STYLE_NAME_MAP.get(style_instance) is None:
-            validate_and_register_style(style_instance)
-        style_name = self.style._STYLE_NAME_MAP[style_instance]
+        style_name = self.style._register_style(style_instance)
 
         if not kwargs:
             return style_name
 
-        if self.style_key in self._cache:
-            return self._cache[self.style_key]
+        # The CustomStyle is keyed by its fingerprint, which is cheaper and
+        # more accurate than its repr.
+        style_key = (style_instance.fingerprint, f'{kwargs}')
+        if style_key in self._cache:
+            return self._cache[style_key]
 
         new_style = style_instance.clone_and_modify(**kwargs)
-        validate_and_register_style(new_style)
-        style_name = self.style._STYLE_NAME_MAP[new_style]
-        self._cache[self.style_key] = style_name
+        style_name = self.style._register_style(new_style)
+        self._cache[style_key] = style_name
         return style_name
 
-    def _handle_string_style(self, style: str, kwargs: dict[str, Any]) -> None:
+    def _handle_string_style(self, style: str, kwargs: dict[str, Any]) -> str:
         """
         Handle the case when style is a string.
         """
         if style == 'DEFAULT_STYLE':
             return style
 
-        if style not in (self._collections_list + list(self.style.REGISTERED_STYLES)):
+        if style not in self._collections and self.style._get_registered_style(style) is None:
             raise ValueError(f'Style {style} not found !')
 
         if not kwargs:
             return style
 
-        if self.style_key in self._cache:
-            return self._cache[self.style_key]
+        style_key = (style, f'{kwargs}')
+        if style_key in self._cache:
+            return self._cache[style_key]
 
-        self._collections.update(self.style.REGISTERED_STYLES)
-        new_style = self._collections[style].clone_and_modify(**kwargs)
-        validate_and_register_style(new_style)
-        style_name = self.style._STYLE_NAME_MAP[new_style]
-        self._cache[self.style_key] = style_name
+        base_style = self.style._get_registered_style(style) or self._collections[style]
+        new_style = base_style.clone_and_modify(**kwargs)
+        style_name = self.style._register_style(new_style)
+        self._cache[style_key] = style_name
         return style_name
 
     def row_append(
         self,
         value: Any,
-        style: str | CustomStyle = 'DEFAULT_STYLE',
+        style: str | CustomStyle | StyleHandle = 'DEFAULT_STYLE',
         **kwargs,
     ) -> None:
         """
@@ -84,24 +161,22 @@ class StreamWriter(Workbook):
 
         Args:
             value (Any): The value to be appended.
-            style (str | CustomStyle): The style of the value, can be either
-                a style name or a CustomStyle object.
+            style (str | CustomStyle | StyleHandle): The style of the value, can
+                be either a style name, a CustomStyle object or a handle from
+                style_handle().
             **kwargs: Additional keyword arguments to modify the style.
         """
-        self.style_key = f'{style}{kwargs}'
-
-        if isinstance(style, CustomStyle):
-            style = self._handle_custom_style(style, kwargs)
-        elif isinstance(style, str):
-            style = self._handle_string_style(style, kwargs)
+        if style.__class__ is StyleHandle and style._writer is self and not kwargs:
+            style = style.name
+        else:
+            style = self._resolve_style(style, kwargs)
 
-        value = validate_and_format_value(value, set_default_style=False)
-        self._row_list.append((value, style))
+        self._row_list.append(self.ws._format_cell(value, style))
 
     def row_append_list(
         self,
         value: list[Any],
-        style: str | CustomStyle = 'DEFAULT_STYLE',
+        style: str | CustomStyle | StyleHandle = 'DEFAULT_STYLE',
         create_row: bool = False,
         **kwargs,
     ) -> None:
@@ -110,22 +185,20 @@ class StreamWriter(Workbook):
 
         Args:
             value (list[Any]): The value to be appended.
-            style (str | CustomStyle): The style of the value, can be either
-                a style name or a CustomStyle object.
+            style (str | CustomStyle | StyleHandle): The style of the value, can
+                be either a style name, a CustomStyle object or a handle from
+                style_handle().
             create_row (bool): Whether to create row.
             **kwargs: Additional keyword arguments to modify the style.
         """
-        self.style_key = f'{style}{kwargs}'
-
-        if isinstance(style, CustomStyle):
-            style = self._handle_custom_style(style, kwargs)
-        elif isinstance(style, str):
-            style = self._handle_string_style(style, kwargs)
+        style = self._resolve_style(style, kwargs)
 
-        value = tuple((validate_and_format_value(x, set_default_style=False), style) for x in value)
+        format_cell = self.ws._format_cell
+        value = tuple(format_cell(x, style) for x in value)
 
         if create_row:
             self.workbook[self.sheet].data.append(value)
+            self._flush_full_batch()
         else:
             self._row_list.extend(value)
 
@@ -135,3 +208,217 @@ class StreamWriter(Workbook):
         """
         self.workbook[self.sheet].data.append(self._row_list)
         self._row_list = []
+        self._flush_full_batch()
+
+    def open_session(
+        self,
+        batch_size: int = 10000,
+        lib_path: str = None,
+        ignore_go_panic: bool = True,
+        wire_format: str = None,
+    ) -> None:
+        """
+        Opens an export session in the shared library. Once the session is
+        opened, the rows of the current sheet are pushed to the shared library
+        every `batch_size` rows, so the whole workbook is never held in memory.
+
+        Sheets are streamed in the order of the workbook. When a sheet starts
+        streaming, the sheets before it are finished and can not receive rows
+        anymore. The sheet settings (width, merged cells, charts, etc.) are sent
+        with the first batch of the sheet, so they should be set beforehand.
+
+        Args:
+            batch_size (int): The number of rows to push in a batch.
+            lib_path (str, optional): The path to the library. Defaults to None.
+            ignore_go_panic (bool): The flag to determine should trigger panic in go.
+            wire_format (str, optional): The encoding of the payloads, 'json' or
+                'msgpack'. Defaults to WIRE_FORMAT.
+
+        Raises:
+            RuntimeError: If an export session has already been opened.
+            ValueError: If batch_size is not a positive integer.
+        """
+        if self._session is not None:
+            raise RuntimeError('An export session has already been opened.')
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f'batch_size should be a positive integer, got {batch_size}.')
+
+        self._session = ExportSession(
+            self._read_lib(lib_path),
+            self._get_session_styles(reset=True),
+            self.file_props,
+            self.protection,
+            ignore_go_panic=ignore_go_panic,
+            wire_format=wire_format or self.WIRE_FORMAT,
+        )
+        self._string_pool = StringPool()
+        self._batch_size = batch_size
+        self._pushed_rows = {}
+        self._table_headers = {}
+        self._streamed_to_file = False
+
+    def flush_rows(self) -> None:
+        """
+        Pushes the rows of the current sheet to the export session.
+
+        Raises:
+            RuntimeError: If no export session is opened, the current sheet
+                has already been finished in the export session, or it has arrays
+                written by write_array or write_arrow.
+        """
+        if self._session is None:
+            raise RuntimeError('No export session is opened. Call open_session() first.')
+        self._stream_sheet(self.sheet)
+
+    def save(self, file_or_path: Writable | str) -> None:
+        """
+        Saves the workbook to a path or a writable object. If an export session
+        is opened, its remaining rows are streamed and the session is finished.
+
+        Raises:
+            RuntimeError: If the rows of a finished export session were saved to
+                a file, since they can not be built again.
+        """
+        if self._session is not None:
+            self._finish_session(file_or_path)
+            if isinstance(file_or_path, str):
+                return
+        elif self._streamed_to_file and not hasattr(self, 'decoded_bytes'):
+            raise RuntimeError(
+                'The rows of the export session have been saved to a file and are no '
+                'longer kept, so the workbook can not be saved again. Save the session '
+                'to a writable object to keep its content.'
+            )
+        super().save(file_or_path)
+
+    def _flush_full_batch(self) -> None:
+        if self._session is not None and len(self.workbook[self.sheet].data) >= self._batch_size:
+            self._stream_sheet(self.sheet)
+
+    def _stream_sheet(self, sheet: str) -> None:
+        """
+        Opens the sheet in the export session if needed and pushes its rows.
+        The sheets before it that have not been finished are streamed first.
+        """
+        if sheet in self._closed_sheets:
+            raise RuntimeError(f'{sheet} has already been finished in the export session.')
+
+        if sheet != self._session_sheet:
+            for name in self._sheet_list[: self._sheet_list.index(sheet)]:
+                if name not in self._closed_sheets and name != self._session_sheet:
+                    self._open_session_sheet(name)
+                    self._push_rows(name)
+            self._open_session_sheet(sheet)
+        self._push_rows(sheet)
+
+    def _open_session_sheet(self, sheet: str) -> None:
+        if self._session_sheet is not None:
+            # The tables are created when the sheet is finished.
+            self._check_table_headers(self._session_sheet)
+            self._closed_sheets.add(self._session_sheet)
+        # The rows of the session are pushed batch by batch, so the style rules
+        # are applied before.
+        self.workbook[sheet]._resolve_style_rules()
+        # The styles of the columns and the rows may have not been sent yet.
+        styles = self._get_session_styles()
+        sheet_data = self._get_sheet_settings(sheet)
+        self._session.open_sheet(
+            sheet, {k: v for k, v in sheet_data.items() if k != 'Data'}, styles
+        )
+        self._session_sheet = sheet
+
+    def _push_rows(self, sheet: str) -> None:
+        ws = self.workbook[sheet]
+        if ws._array_list or ws._source_list:
+            raise RuntimeError(
+                f'The arrays written by write_array or write_arrow in {sheet} can not '
+                'be streamed in the export session.',
+            )
+        ws._resolve_style_rules()
+        if len(ws._data) == 0:
+            return
+        if ws._table_list:
+            self._validate_tables(sheet, ws._data)
+        styles = self._get_session_styles()
+        rows = self.style._encode_rows(ws._data, self._string_pool)
+        self._session.append_rows(rows, styles, strings=self._string_pool.pop_new_strings())
+        self._pushed_rows[sheet] = self._pushed_rows.get(sheet, 0) + len(ws._data)
+        ws._data = type(ws._data)()
+
+    def _validate_tables(self, sheet: str, rows: list) -> None:
+        """
+        Validates the tables of a sheet through TableFinalValidation, with the
+        rows of a batch pushed in the export session.
+
+        The rows pushed previously are not kept, so every batch is validated
+        with the part of the tables it holds, below the header row of the
+        tables which is kept once it has been pushed.
+
+        Raises:
+            ValueError: If a table is invalid.
+        """
+        offset = self._pushed_rows.get(sheet, 0)
+        for i, table in enumerate(self.workbook[sheet]._table_list):
+            if table['validate_table'] is False:
+                continue
+            start, end = table['range'].split(':')
+            start_row, start_col = cell_reference_to_index(start)
+            end_row, end_col = cell_reference_to_index(end)
+            if end_row < offset or start_row >= offset + len(rows):
+                continue
+
+            key = (sheet, i)
+            if key not in self._table_headers:
+                if start_row < offset:
+                    # The table was added after its header row was pushed.
+                    self._table_headers[key] = None
+                    continue
+                self._table_headers[key] = rows[start_row - offset]
+                body = rows[start_row - offset + 1 : end_row - offset + 1]
+            elif self._table_headers[key] is None:
+                continue
+            else:
+                body = rows[: end_row - offset + 1]
+            # The table is moved to the first row of the validated rows.
+            first_col = index_to_column(start_col + 1)
+            last_col = index_to_column(end_col + 1)
+            TableFinalValidation(
+                data=[self._table_headers[key], *body],
+                table_list=[{**table, 'range': f'{first_col}1:{last_col}{len(body) + 1}'}],
+            )
+
+    def _check_table_headers(self, sheet: str) -> None:
+        """
+        Checks that the header row of every validated table of a sheet has been
+        pushed in the export session before the sheet is finished.
+
+        Raises:
+            ValueError: If the header row of a table has not been written.
+        """
+        for i, table in enumerate(self.workbook[sheet]._table_list):
+            if table['validate_table'] is not False and (sheet, i) not in self._table_headers:
+                raise ValueError(
+                    f"Invalid table range for {table['name']}. "
+                    'Please write a row for table first row.'
+                )
+
+    def _finish_session(self, file_or_path: Writable | str) -> None:
+        """
+        Streams the remaining rows of every sheet and finishes the export session.
+        """
+        session = self._session
+        try:
+            for sheet in self._sheet_list:
+                if sheet not in self._closed_sheets:
+                    self._stream_sheet(sheet)
+            if self._session_sheet is not None:
+                self._check_table_headers(self._session_sheet)
+            if isinstance(file_or_path, str):
+                session.save_to_file(file_or_path)
+                self._streamed_to_file = True
+            else:
+                self.decoded_bytes = session.save_to_bytes()
+        finally:
+            session.close()
+            self._session = None
+            self._string_pool = None
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.arrow import convert_arrow_column
+from pyfastexcel.storage import DATE_FORMAT, DATETIME_FORMAT, TIMEDELTA_FORMAT
+from pyfastexcel.workbook import export_many
+
+
+@pytest.mark.parametrize(
+    'array, values, strings, number_format',
+    [
+        (pa.array([1, 2], type=pa.int16()), [1, 2], None, None),
+        (pa.array([1, None]), [1.0, np.nan], None, None),
+        (pa.array([decimal.Decimal('1.5'), None]), [1.5, np.nan], None, None),
+        (pa.array([True, False]), [True, False], None, None),
+        (pa.array(['a', None, 'b', 'a']), [0, -1, 1, 0], ['a', 'b'], None),
+        (pa.array(['x', 'y', None]).dictionary_encode(), [0, 1, -1], ['x', 'y'], None),
+        (pa.array([datetime.date(2024, 1, 2), None]), [45293.0, np.nan], None, DATE_FORMAT),
+        (
+            pa.array([datetime.datetime(2024, 1, 2, 6)], type=pa.timestamp('ms', tz='UTC')),
+            [45293.25],
+            None,
+            DATETIME_FORMAT,
+        ),
+        (pa.array([datetime.timedelta(hours=12)]), [0.5], None, TIMEDELTA_FORMAT),
+        (
+            pa.array([datetime.date(1900, 1, 1), datetime.date(1900, 2, 28)]),
+            [1.0, 59.0],
+            None,
+            DATE_FORMAT,
+        ),
+        (
+            pa.array([datetime.datetime(1900, 3, 1)], type=pa.timestamp('s')),
+            [61.0],
+            None,
+            DATETIME_FORMAT,
+        ),
+    ],
+)
+def test_convert_arrow_column(array, values, strings, number_format):
+    converted = convert_arrow_column(array)
+    np.testing.assert_array_equal(converted.values, values)
+    assert converted.strings == strings
+    assert converted.number_format == number_format
+
+
+@pytest.mark.parametrize(
+    'array',
+    [
+        pa.array([[1], None]),
+        pa.array([True, None]),
+        pa.array([datetime.date(1850, 1, 1), datetime.date(2024, 1, 2)]),
+    ],
+)
+def test_convert_arrow_column_cell_by_cell(array):
+    assert convert_arrow_column(array) is None
+
+
+def test_convert_arrow_column_zero_copy():
+    array = pa.array(np.arange(3, dtype='float64'))
+    converted = convert_arrow_column(array)
+    assert converted.values.ctypes.data == array.buffers()[1].address
+
+
+def test_write_arrow():
+    table = pa.table(
+        {
+            'num': [1.5, 2.5, 3.5],
+            'text': ['a', 'b', 'a'],
+            'date': [datetime.date(2024, 1, 2)] * 3,
+            'obj': [[1], None, [2]],
+        }
+    )
+    bold = CustomStyle(font_bold=True)
+    wb = Workbook()
+    ws = wb['Sheet1']
+    ws['A1'] = 'title'
+    ws.write_arrow(table.to_batches(max_chunksize=2), column_styles={'date': bold})
+
+    date_style = wb.style._get_registered_style('Custom Style 1')
+    assert date_style.number_format == DATE_FORMAT and date_style.font.bold
+
+    batches = list(ws._source_list[0]._iter_batches())
+    assert batches[0] == ([[(name, 'DEFAULT_STYLE') for name in table.column_names]], [])
+    assert [len(rows) for rows, _ in batches[1:]] == [2, 1]
+    rows, arrays = batches[1]
+    assert rows == [[None, None, None, ('[1]', 'DEFAULT_STYLE')], [None, None, None, None]]
+    blocks = [(b.dtype, b.row, b.col, b.n_rows, b.style, b.strings) for b in arrays]
+    assert blocks == [
+        ('f8', 0, 0, 2, 'DEFAULT_STYLE', None),
+        ('cat', 0, 1, 2, 'DEFAULT_STYLE', ['a', 'b']),
+        ('f8', 0, 2, 2, 'Custom Style 1', None),
+    ]
+
+
+def test_write_arrow_export(tmp_path):
+    schema = pa.schema([('a', pa.int64()), ('b', pa.string())])
+    batches = [pa.record_batch([[1, 2], ['x', None]], schema=schema)] * 3
+
+    wb = Workbook()
+    wb['Sheet1'].write_arrow(pa.RecordBatchReader.from_batches(schema, iter(batches)))
+    wb.create_sheet('Sheet2')
+    wb['Sheet2'].write_arrow(pa.Table.from_batches(batches), header=False)
+    assert wb.read_lib_and_create_excel()[:2] == b'PK'
+
+    wb = Workbook()
+    wb['Sheet1'].write_arrow(iter(batches))
+    wb.save(str(tmp_path / 'arrow.xlsx'))
+    assert (tmp_path / 'arrow.xlsx').exists()
+
+
+def test_write_arrow_failed(tmp_path):
+    ws = Workbook()['Sheet1']
+    table = pa.table({'a': [1]})
+    with pytest.raises(TypeError):
+        ws.write_arrow([])
+    with pytest.raises(TypeError):
+        ws.write_arrow({'a': [1]})
+    with pytest.raises(ValueError):
+        ws.write_arrow(table, column_styles={'b': 'DEFAULT_STYLE'})
+    with pytest.raises(ValueError):
+        ws.write_arrow(table, header_style='not registered')
+
+    wb = Workbook()
+    wb['Sheet1'].write_arrow(iter([table.to_batches()[0], pa.record_batch({'b': [1]})]))
+    with pytest.raises(ValueError):
+        wb.read_lib_and_create_excel()
+    with pytest.raises(ValueError):
+        export_many([wb], [str(tmp_path / 'arrow.xlsx')])
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+
+import msgspec
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.dataframe import DATE_FORMAT, DATETIME_FORMAT, convert_column
+
+
+@pytest.mark.parametrize(
+    'series, values, strings, number_format',
+    [
+        (pd.Series([1, 2]), [1, 2], None, None),
+        (pd.Series([1, None], dtype='Int64'), [1.0, np.nan], None, None),
+        (pd.Series([decimal.Decimal('1.5'), None]), [1.5, np.nan], None, None),
+        (pd.Series(['a', None, 'b', 'a']), [0, -1, 1, 0], ['a', 'b'], None),
+        (pd.Series(pd.Categorical(['x', 'y', None])), [0, 1, -1], ['x', 'y'], None),
+        (pd.Series(pd.to_datetime(['2024-01-02', None])), [45293.0, np.nan], None, DATE_FORMAT),
+        (
+            pd.Series(pd.to_datetime(['2024-01-02 06:00']).tz_localize('UTC')),
+            [45293.25],
+            None,
+            DATETIME_FORMAT,
+        ),
+        (pd.Series([datetime.date(2024, 1, 2)]), [45293.0], None, DATE_FORMAT),
+        (
+            pd.Series(pd.to_datetime(['1900-01-01 00:00', '1900-02-28 12:00', '1900-03-01 00:00'])),
+            [1.0, 59.5, 61.0],
+            None,
+            DATETIME_FORMAT,
+        ),
+    ],
+)
+def test_convert_column(series, values, strings, number_format):
+    converted = convert_column(series)
+    np.testing.assert_array_equal(converted.values, values)
+    assert converted.strings == strings
+    assert converted.number_format == number_format
+
+
+@pytest.mark.parametrize(
+    'series',
+    [
+        pd.Series([[1], {}]),
+        pd.Series([True, None], dtype='boolean'),
+        pd.Series(pd.to_datetime(['1850-01-01', '2024-01-02'])),
+    ],
+)
+def test_convert_column_cell_by_cell(series):
+    assert convert_column(series) is None
+
+
+def test_write_dataframe():
+    df = pd.DataFrame(
+        {
+            'num': [1.5, 2.5],
+            'text': ['a', 'b'],
+            'date': pd.to_datetime(['2024-01-02', '2024-01-03']),
+            'obj': [[1], None],
+        },
+        index=pd.Index([10, 20], name='id'),
+    )
+    bold = CustomStyle(font_bold=True)
+    wb = Workbook()
+    ws = wb['Sheet1']
+    ws.write_dataframe(
+        df,
+        'B2',
+        index=True,
+        column_styles={'num': bold, 'date': bold},
+        header_style=bold,
+    )
+
+    assert ws['B2':'F2'][1:] == [
+        ('id', 'Custom Style 0'),
+        ('num', 'Custom Style 0'),
+        ('text', 'Custom Style 0'),
+        ('date', 'Custom Style 0'),
+        ('obj', 'Custom Style 0'),
+    ]
+    assert ws['F3'] == ('[1]', 'DEFAULT_STYLE')
+    assert ws['F4'] == (None, 'DEFAULT_STYLE')
+
+    blocks = [(b.dtype, b.row, b.col, b.style, b.strings) for b in ws._array_list]
+    assert blocks == [
+        ('i8', 2, 1, 'DEFAULT_STYLE', None),
+        ('f8', 2, 2, 'Custom Style 0', None),
+        ('cat', 2, 3, 'DEFAULT_STYLE', ['a', 'b']),
+        ('f8', 2, 4, 'Custom Style 1', None),
+    ]
+    date_style = wb.style._get_registered_style('Custom Style 1')
+    assert date_style.number_format == DATE_FORMAT and date_style.font.bold
+
+    content = msgspec.json.decode(wb._encode_workbook())['content']['Sheet1']
+    assert content['Arrays'][2]['Strings'] == ['a', 'b']
+    assert wb.read_lib_and_create_excel()[:2] == b'PK'
+
+
+def test_write_dataframe_before_1900():
+    wb = Workbook()
+    ws = wb['Sheet1']
+    df = pd.DataFrame({'date': pd.to_datetime(['1850-01-01', '2024-01-02'])})
+    ws.write_dataframe(df, header=False)
+    assert ws['A1'] == ('1850-01-01 00:00:00', 'DEFAULT_STYLE')
+    assert ws['A2'] == (45293.0, 'Custom Style 0')
+    assert wb.style._get_registered_style('Custom Style 0').number_format == DATETIME_FORMAT
+
+
+def test_write_dataframe_failed():
+    ws = Workbook()['Sheet1']
+    df = pd.DataFrame({'a': [1]})
+    with pytest.raises(ValueError):
+        ws.write_dataframe(df, column_styles={'b': 'DEFAULT_STYLE'})
+    with pytest.raises(ValueError):
+        ws.write_dataframe(df, header_style='not registered')
+    with pytest.raises(ValueError):
+        ws.write_dataframe(df, 'A1048576')
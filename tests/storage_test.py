@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import datetime
+
+import msgspec
+import pytest
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.storage import ColumnarStorage, SparseStorage, StringPool, _CellStorage
+
+
+def test_columnar_storage_list_protocol():
+    rows = [[1, 2.5, 'a'], [None, True, ('b', 'style')], [2**60, datetime.date(2024, 1, 2)]]
+    storage = ColumnarStorage(rows)
+
+    assert len(storage) == 3
+    assert storage.tolist() == [
+        [1, 2.5, 'a'],
+        [None, True, ('b', 'style')],
+        [2**60, datetime.date(2024, 1, 2), ()],
+    ]
+    assert storage[1][2] == ('b', 'style')
+    assert storage[-1][0] == 2**60
+    assert isinstance(storage[0][0], int) and isinstance(storage[1][1], bool)
+
+    storage[0] = ['x']
+    assert storage[0] == ['x', (), ()]
+    storage[2][1:3] = [(), 3]
+    assert storage[2] == [2**60, (), 3]
+    storage.append([4])
+    assert storage[3] == [4, (), ()]
+
+    with pytest.raises(IndexError):
+        storage[4]
+    with pytest.raises(IndexError):
+        storage[0][3]
+    with pytest.raises(ValueError):
+        storage[0][0:2] = [1]
+
+
+def test_cell_storage_is_abstract():
+    with pytest.raises(TypeError):
+        _CellStorage()
+
+    class RowOnlyStorage(_CellStorage):
+        def get(self, row, col):
+            return ()
+
+    with pytest.raises(TypeError):
+        RowOnlyStorage()
+
+
+def test_columnar_storage_allocate_and_expand():
+    storage = ColumnarStorage.allocate(2, 3)
+    assert storage.tolist() == [[None, None, None], [None, None, None]]
+
+    storage.expand(3, 4)
+    assert len(storage) == 4 and len(storage[0]) == 5
+    assert storage[3][4] == ()
+
+
+def test_columnar_storage_encode_columns():
+    storage = ColumnarStorage([[1.5, ('a', 'bold')], ['a', ('b', 'unknown')]])
+    columns = msgspec.json.decode(msgspec.json.encode(storage._encode_columns({'bold': 3})))
+
+    assert columns['Rows'] == 2
+    assert columns['Strings'] == ['a', 'b']
+    assert columns['Styles'] == [-1, 3, -1]
+    assert len(columns['Cols']) == 2
+
+
+@pytest.mark.parametrize('wire_format', ['json', 'msgpack'])
+def test_workbook_with_columnar_storage(wire_format):
+    style = CustomStyle(font_bold=True)
+    values = [[1, 'a', None], [2.5, ('b', style), True]]
+
+    expected = Workbook()
+    wb = Workbook(storage='columnar')
+    wb.create_sheet('Sheet2', storage='columnar', plain_data=[[1, 2], [3]])
+    for book in (expected, wb):
+        ws = book['Sheet1']
+        ws['A1':'C1'] = values[0]
+        ws['A2':'C2'] = values[1]
+        ws['E4'] = 'x'
+
+    assert isinstance(wb['Sheet1'].data, ColumnarStorage)
+    # The columnar storage is a rectangle, unlike the rows of the list storage.
+    assert wb['Sheet1'].data[2:] == expected['Sheet1'].data[2:]
+    assert wb['Sheet1']['A1':'C2'] == expected['Sheet1']['A1':'C2']
+    wb['Sheet1'].create_table('A1:C2', 'Table1')
+    assert wb['Sheet2'].data.tolist() == [[1, 2], [3, ()]]
+    assert wb.read_lib_and_create_excel(wire_format=wire_format)[:2] == b'PK'
+
+    with pytest.raises(ValueError):
+        Workbook(storage='rows')
+
+
+def test_sparse_storage():
+    storage = SparseStorage([[1, ('a', 'style')], [], [None]])
+    storage.expand(49999, 701)
+
+    assert len(storage) == 50000 and len(storage[0]) == 702
+    assert storage[0][1] == ('a', 'style')
+    assert storage[49999][701] == ()
+    assert sum(len(cells) for cells in storage._rows.values()) == 3
+
+    storage[0] = ['b']
+    assert storage[0][:2] == ['b', ()]
+    storage[2][0] = ()
+    assert storage._rows[2] == {}
+
+
+def test_sparse_storage_encode_cells():
+    wb = Workbook(storage='sparse')
+    ws = wb['Sheet1']
+    ws['ZZ50000'] = 'far'
+    ws['B2'] = ('styled', CustomStyle(font_bold=True))
+    ws['A1'] = 1
+    wb._encode_workbook()
+
+    encoded = ws.data._encode_cells(wb.style)
+    assert encoded['Rows'] == [0, 1, 49999]
+    assert encoded['Cols'] == [0, 1, 701]
+    assert [cell[0] for cell in encoded['Cells']] == [1, 'styled', 'far']
+    assert len(ws.data._rows) == 3
+
+
+@pytest.mark.parametrize('wire_format', ['json', 'msgpack'])
+def test_workbook_with_sparse_storage(wire_format):
+    wb = Workbook(storage='sparse', pre_allocate={'n_rows': 10, 'n_cols': 3})
+    wb.create_sheet('Sheet2', storage='sparse', plain_data=[[1, 2], [3]])
+    wb.create_sheet('Sheet3', storage='sparse')
+    # Make pyfastexcel use the normal writer to write content
+    wb['Sheet3'].group_columns('F1')
+    for sheet in ('Sheet1', 'Sheet3'):
+        ws = wb[sheet]
+        ws['A1':'B1'] = ['header', 'value']
+        ws['D20'] = ('styled', CustomStyle(font_bold=True))
+        # NaN is written as an empty cell.
+        ws['E5'] = float('nan')
+
+    assert isinstance(wb['Sheet1'].data, SparseStorage)
+    assert len(wb['Sheet1'].data) == 20
+    assert wb['Sheet2'].data.tolist() == [[1, 2], [3, ()]]
+    assert wb.read_lib_and_create_excel(wire_format=wire_format)[:2] == b'PK'
+
+
+def test_string_pool():
+    pool = StringPool()
+    assert pool.get_ref('a') == 'a'
+    assert pool.get_ref('b') == 'b'
+    assert pool.get_ref('b') == (0,)
+    assert pool.get_ref('a') == (1,)
+    # The references are shared by the cells of a string.
+    assert pool.get_ref('b') is pool.get_ref('b')
+    assert pool.pop_new_strings() == ['b', 'a']
+    assert pool.pop_new_strings() == []
+    pool.get_ref('c')
+    pool.get_ref('c')
+    assert pool.pop_new_strings() == ['c']
+    assert pool.strings == ['b', 'a', 'c']
+
+
+@pytest.mark.parametrize('wire_format', ['json', 'msgpack'])
+def test_workbook_with_string_pool(wire_format):
+    wb = Workbook()
+    bold = CustomStyle(font_bold=True)
+    ws = wb['Sheet1']
+    ws[0] = ['north', 'south', ('north', bold), 'unique']
+    ws[1] = [('=A1', 'NOT_REGISTERED'), '=A1']
+    wb.create_sheet('Sheet2', storage='sparse')
+    wb['Sheet2']['C3'] = 'south'
+    wb.create_sheet('Plain', plain_data=[['north', 'east', 'east']])
+
+    payload = msgspec.json.decode(wb._encode_workbook())
+    assert payload['strings'] == ['north', '=A1', 'south', 'east']
+    content = payload['content']
+    assert content['Sheet1']['Data'] == [
+        [['north'], ['south'], [[0], 1], ['unique']],
+        ['=A1', [[1]]],
+    ]
+    assert content['Sheet2']['Sparse']['Cells'] == [[[2]]]
+    assert content['Plain']['Data'] == [[[[0], -1], 'east', [[3], -1]]]
+    assert wb.read_lib_and_create_excel(wire_format=wire_format)[:2] == b'PK'
+
+    # The strings of an export session are sent with the batches.
+    wb['Sheet1'].write_rows([['north', 'west']] * 3, chunk_size=2)
+    assert wb.read_lib_and_create_excel(wire_format=wire_format)[:2] == b'PK'
+
+
+def test_encode_rows_with_string_pool():
+    wb = Workbook()
+    ws = wb['Sheet1']
+    ws[0] = ['north', 'north', 'south', 'north', 1.5, 1.5]
+    wb._create_style()
+    wb.style._assign_style_ids()
+    pool = StringPool()
+    row = wb.style._encode_rows(ws._data, pool)[0]
+    assert row == [('north',), ((0,),), ('south',), ((0,),), (1.5,), (1.5,)]
+    # The cells of the default style share the tuple of a pooled string.
+    assert row[1] is row[3]
@@ -1,7 +1,7 @@
 import pytest
 
 from pyfastexcel import CustomStyle, DefaultStyle
-from pyfastexcel.style import BorderStyle
+from pyfastexcel.style import BorderStyle, Font, StylePart
 
 
 @pytest.mark.style
@@ -396,3 +396,97 @@ class TestStylesArgs:
         assert custom.ali_horizontal == expected_ali_horizontal
         assert custom.ali_vertical == expected_ali_vertical
         assert custom.ali_wrap_text == expected_ali_wrap_text
+
+
+@pytest.mark.style
+class TestStyleFingerprint:
+    def test_equal_styles(self):
+        style = CustomStyle(font_bold=True, fill_color='a1b2c3')
+        same = CustomStyle(fill_color='a1b2c3', font_bold=True)
+        assert style is not same
+        assert style == same
+        assert style.fingerprint == same.fingerprint
+        assert style != CustomStyle(font_bold=True)
+        assert style != 'style'
+        with pytest.raises(TypeError):
+            hash(style)
+
+    def test_fingerprint_follows_changes(self):
+        style = CustomStyle(font_bold=True)
+        fingerprint = style.fingerprint
+        cloned = style.clone_and_modify(number_format='0.00')
+        assert cloned.fingerprint != fingerprint
+        assert style.fingerprint == fingerprint
+
+        style.set_custom_style(font_size=20)
+        assert style.fingerprint != fingerprint
+        assert style == CustomStyle(font_bold=True, font_size=20)
+
+    def test_fingerprint_follows_modified_models(self):
+        style = CustomStyle(font_params={'bold': False}, fill_params={'color': 'a1b2c3'})
+        same = CustomStyle(font_params={'bold': False}, fill_params={'color': 'a1b2c3'})
+        assert style == same
+        style.font.bold = True
+        assert style != same
+        assert style.fingerprint != same.fingerprint
+        style.font.bold = False
+        assert style == same
+
+    def test_equal_styles_are_registered_once(self):
+        from pyfastexcel import Workbook
+
+        wb = Workbook()
+        ws = wb['Sheet1']
+        for i in range(100):
+            ws[i] = [(i, CustomStyle(font_italic=True, font_color='123456'))]
+        names = {ws[i][0][1] for i in range(100)}
+        assert len(names) == 1
+        assert list(wb.style._registered_styles) == list(names)
+
+
+@pytest.mark.style
+class TestStyleParts:
+    def test_clone_shares_unchanged_parts(self):
+        style = CustomStyle(font_params={'bold': True}, fill_params={'color': 'a1b2c3'})
+        cloned = style.clone_and_modify(font_params={'bold': True, 'size': 20})
+        assert cloned._parts['fill'] is style._parts['fill']
+        assert cloned._parts['border'] is style._parts['border']
+        assert cloned._parts['font'] is not style._parts['font']
+        assert cloned.font.size == 20 and style.font.size == 11
+        assert cloned.fill == style.fill
+
+    def test_style_part_is_immutable(self):
+        part = StylePart(Font, {'bold': True})
+        with pytest.raises(AttributeError):
+            part.kwargs = {}
+        model, settings = part.compile()
+        assert model == Font(bold=True)
+        assert settings == Font(bold=True).model_dump(by_alias=True)
+        assert part.compile()[1] is settings
+        assert part.key == StylePart(Font, {'bold': True}).key
+
+    def test_settings_match_models(self):
+        style = CustomStyle(font_params={'bold': True}, ali_params={'horizontal': 'center'})
+        settings = style._get_settings()
+        assert settings['Font'] == style.font.model_dump(by_alias=True)
+        assert settings['Alignment'] == style.ali.model_dump(by_alias=True)
+        assert settings['Border'] == style.border.model_dump(by_alias=True)
+        assert settings['Protection'] == style.protection.model_dump(by_alias=True)
+        assert settings['CustomNumFmt'] == style.number_format
+
+    def test_modified_models_are_exported(self):
+        style = CustomStyle(font_bold=True)
+        fingerprint = style.fingerprint
+        style.protection.hidden = True
+        assert style._get_settings()['Protection']['Hidden'] is True
+
+        style.font = Font(italic=True)
+        assert style._get_settings()['Font']['Italic'] is True
+        assert style.fingerprint != fingerprint
+        # The settings of the shared part are not modified.
+        assert CustomStyle(font_bold=True)._get_settings()['Protection']['Hidden'] is False
+
+    def test_invalid_settings_are_raised_at_compile(self):
+        style = CustomStyle(font_params={'size': 'large'})
+        with pytest.raises(ValueError):
+            style._get_settings()
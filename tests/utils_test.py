@@ -1,11 +1,18 @@
+import datetime
+import decimal
+
+import msgspec
 import pytest
 
 from pyfastexcel import CustomStyle
+from pyfastexcel.storage import DATE_FORMAT, DATETIME_FORMAT, TIMEDELTA_FORMAT
 from pyfastexcel.utils import (
     _separate_alpha_numeric,
     _validate_cell_reference,
     column_to_index,
+    convert_cell_value,
     deprecated_warning,
+    encode_payload,
     index_to_column,
     set_custom_style,
     transfer_string_slice_to_slice,
@@ -189,3 +196,47 @@ def test_base_enum():
 
     with pytest.raises(ValueError):
         BaseEnum.get_enum('test')
+
+
+@pytest.mark.parametrize(
+    'wire_format, decoder',
+    [('json', msgspec.json.decode), ('msgpack', msgspec.msgpack.decode), ('xml', None)],
+)
+def test_encode_payload(wire_format, decoder):
+    payload = {'Data': [[(1, 'DEFAULT_STYLE'), ('text', 'style')]]}
+    if decoder is None:
+        with pytest.raises(ValueError):
+            encode_payload(payload, wire_format)
+    else:
+        assert decoder(encode_payload(payload, wire_format)) == {
+            'Data': [[[1, 'DEFAULT_STYLE'], ['text', 'style']]]
+        }
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        (1, (1, None)),
+        (True, (True, None)),
+        (None, (None, None)),
+        ('a', ('a', None)),
+        (decimal.Decimal('1.25'), (1.25, None)),
+        (datetime.date(2024, 1, 2), (45293.0, DATE_FORMAT)),
+        (datetime.datetime(2024, 1, 2, 6), (45293.25, DATETIME_FORMAT)),
+        (
+            datetime.datetime(2024, 1, 2, 6, tzinfo=datetime.timezone.utc),
+            (45293.25, DATETIME_FORMAT),
+        ),
+        (datetime.timedelta(hours=36), (1.5, TIMEDELTA_FORMAT)),
+        # Excel counts 1900-02-29 as a day, and has no dates before 1900.
+        (datetime.date(1900, 1, 1), (1.0, DATE_FORMAT)),
+        (datetime.date(1900, 2, 28), (59.0, DATE_FORMAT)),
+        (datetime.datetime(1900, 2, 28, 12), (59.5, DATETIME_FORMAT)),
+        (datetime.date(1900, 3, 1), (61.0, DATE_FORMAT)),
+        (datetime.date(1899, 12, 31), ('1899-12-31', None)),
+        (datetime.datetime(1850, 1, 1, 6), ('1850-01-01 06:00:00', None)),
+        ([1], ('[1]', None)),
+    ],
+)
+def test_convert_cell_value(value, expected):
+    assert convert_cell_value(value) == expected
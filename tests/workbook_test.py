@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import datetime
+import decimal
+import os
+
 import pytest
 from pydantic import ValidationError
 
 from pyfastexcel import CustomStyle, Workbook
 from pyfastexcel._typing import SelectionDict
+from pyfastexcel.storage import DATE_FORMAT, DATETIME_FORMAT, TIMEDELTA_FORMAT
 from pyfastexcel.utils import CommentText, Selection
 
 style_for_set_custom_style = CustomStyle(font_color='fcfcfc')
@@ -308,52 +313,286 @@ def test_save_workbook():
     wb.save(buffer)
 
 
-def test_if_style_is_reset():
+@pytest.mark.parametrize('wire_format', ['json', 'msgpack'])
+def test_save_workbook_with_wire_format(wire_format):
+    wb = Workbook()
+    ws = wb['Sheet1']
+    ws['A1':'E1'] = [1, -2.5, 'text', '=SUM(A1:B1)', True]
+    ws['A2'] = ('styled', CustomStyle(font_bold=True))
+    ws.set_cell_width('A', 20)
+
+    excel_bytes = wb.read_lib_and_create_excel(wire_format=wire_format)
+    assert excel_bytes[:2] == b'PK'
+
+
+def test_save_workbook_with_parallel_sheets():
+    import msgspec
+
+    wb = Workbook()
+    wb.PARALLEL_SHEETS = True
+    for sheet in ('Sheet1', 'Sheet2', 'Sheet3'):
+        if sheet != 'Sheet1':
+            wb.create_sheet(sheet)
+        ws = wb[sheet]
+        ws['A1':'C1'] = [sheet, 2, 3]
+        ws['A2'] = ('styled', CustomStyle(font_bold=True))
+
+    assert msgspec.json.decode(wb._encode_workbook())['parallel'] is True
+    excel_bytes = wb.read_lib_and_create_excel()
+    assert excel_bytes[:2] == b'PK'
+
+
+def test_save_workbook_with_invalid_wire_format():
+    wb = Workbook()
+    with pytest.raises(ValueError):
+        wb.read_lib_and_create_excel(wire_format='xml')
+
+
+def test_save_workbook_to_file_directly(tmp_path):
+    import io
+
+    wb = Workbook()
+    ws = wb['Sheet1']
+    ws['A1':'C1'] = [1, 2, 3]
+    path1 = str(tmp_path / 'test_direct1.xlsx')
+    path2 = str(tmp_path / 'test_direct2.xlsx')
+
+    # The first save with a path writes the file through the shared library
+    wb.save(path1)
+    assert not hasattr(wb, 'decoded_bytes')
+    with open(path1, 'rb') as file:
+        content = file.read()
+
+    # Later saves build the file again, and do not depend on the first file,
+    # which may have been moved or deleted.
+    (tmp_path / 'test_direct1.xlsx').unlink()
+    wb.save(path2)
+    with open(path2, 'rb') as file:
+        assert file.read() == content
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    assert buffer.getvalue() == content
+
+
+def test_export_many(tmp_path):
+    from pyfastexcel import export_many
+
+    workbooks = []
+    for i in range(3):
+        wb = Workbook()
+        ws = wb['Sheet1']
+        ws['A1':'C1'] = [i, 'text', 2.5]
+        ws['A2'] = ('styled', CustomStyle(font_bold=True))
+        workbooks.append(wb)
+    paths = [str(tmp_path / f'export_many_{i}.xlsx') for i in range(3)]
+    paths[1] = str(tmp_path / 'missing' / 'export_many_1.xlsx')
+
+    results = export_many(workbooks, paths, max_workers=2)
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], str)
+    for i in (0, 2):
+        with open(paths[i], 'rb') as file:
+            assert file.read(2) == b'PK'
+
+    # A workbook which fails to be encoded does not abort the others.
+    invalid = Workbook()
+    invalid['Sheet1']['A1'] = 'header'
+    invalid['Sheet1'].create_table('A1:D2', 'Table1')
+    paths = [str(tmp_path / 'invalid.xlsx'), str(tmp_path / 'valid.xlsx')]
+    results = export_many([invalid, workbooks[0]], paths)
+    assert 'Invalid table range' in results[0] and results[1] is None
+    assert not os.path.exists(paths[0]) and os.path.exists(paths[1])
+
+    assert export_many([], []) == []
+    with pytest.raises(ValueError):
+        export_many(workbooks, paths[:1])
+
+
+def test_export_workbooks_in_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def build_and_export(i):
+        wb = Workbook()
+        ws = wb['Sheet1']
+        ws['A1':'C1'] = [i, 'text', 2.5]
+        ws['A2'] = ('styled', CustomStyle(font_size=10 + i))
+        return wb, wb.read_lib_and_create_excel()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(build_and_export, range(4)))
+    assert all(result[:2] == b'PK' for _, result in results)
+    # The styles and their ids belong to each workbook.
+    for i, (wb, _) in enumerate(results):
+        assert wb['Sheet1']['A2'] == ('styled', 'Custom Style 0')
+        assert wb.style._registered_styles['Custom Style 0'].font.size == 10 + i
+        assert wb.style._style_ids['DEFAULT_STYLE'] == 0
+        assert 'Custom Style 0' in wb.style._style_ids
+
+
+def test_encode_workbook_with_style_ids():
+    import msgspec
+
     from pyfastexcel.manager import StyleManager
 
+    StyleManager.reset_style_configs()
+    wb = Workbook(pre_allocate={'n_rows': 2, 'n_cols': 2})
+    style = CustomStyle(font_bold=True)
+    ws = wb['Sheet1']
+    ws['A1'] = ('bold', style)
+    ws['B1'] = 'default'
+    ws['A2'] = ('unknown', 'NOT_REGISTERED')
+    ws['C3'] = 1
+
+    payload = msgspec.json.decode(wb._encode_workbook())
+    assert wb.style._style_ids == {'DEFAULT_STYLE': 0, 'Custom Style 0': 1}
+    assert len(payload['style']) == 2
+    assert payload['style'][1]['Font']['Bold'] is True
+    assert payload['content']['Sheet1']['Data'] == [
+        [['bold', 1], ['default']],
+        ['unknown', None],
+        [[], [], [1]],
+    ]
+    # The worksheet keeps the style names.
+    assert ws['A1'] == ('bold', 'Custom Style 0')
+    StyleManager.reset_style_configs()
+
+
+def test_styles_are_scoped_to_workbook():
+    from pyfastexcel.manager import StyleManager
+    from pyfastexcel.utils import set_custom_style
+
+    StyleManager.reset_style_configs()
+    shared_style = CustomStyle(font_bold=True)
+    set_custom_style('shared_style', shared_style)
+
     wb = Workbook()
     style = CustomStyle(font_size=11, font_color='000000')
-
     ws = wb['Sheet1']
     ws['A1'] = ('test', style)
+    ws['A2'] = ('test', 'shared_style')
     wb._create_style()
-    assert len(StyleManager._style_map) != 0
-    assert len(StyleManager._STYLE_NAME_MAP) != 0
-    assert StyleManager._STYLE_ID == 1
-    assert StyleManager.REGISTERED_STYLES == {
-        'DEFAULT_STYLE': StyleManager.DEFAULT_STYLE,
-        'Custom Style 0': style,
-    }
-    wb.read_lib_and_create_excel()
-    assert len(StyleManager._style_map) == 0
-    assert len(StyleManager._STYLE_NAME_MAP) == 0
-    assert StyleManager._STYLE_ID == 0
+    assert wb.style._style_id == 1
+    assert wb.style._registered_styles == {'Custom Style 0': style}
+    assert set(wb.style._style_map) == {'DEFAULT_STYLE', 'shared_style', 'Custom Style 0'}
+    # The styles of a workbook are not registered in the shared catalog.
     assert StyleManager.REGISTERED_STYLES == {
         'DEFAULT_STYLE': StyleManager.DEFAULT_STYLE,
+        'shared_style': shared_style,
     }
 
-    # Create another Workbook in one process to ensure that after style configs
-    # reset, everythings is still working.
+    # Another workbook in the same process numbers its styles independently,
+    # and still reads the shared catalog after the first workbook is exported.
     wb2 = Workbook()
     style2 = CustomStyle(font_size=99, font_color='fcfcfc')
-
     ws2 = wb2['Sheet1']
     ws2['A1'] = ('test', style2)
+    wb.read_lib_and_create_excel()
+    ws2['A2'] = ('test', shared_style)
     wb2._create_style()
-    assert len(StyleManager._style_map) != 0
-    assert len(StyleManager._STYLE_NAME_MAP) != 0
-    assert StyleManager._STYLE_ID == 1
-    assert StyleManager.REGISTERED_STYLES == {
-        'DEFAULT_STYLE': StyleManager.DEFAULT_STYLE,
-        'Custom Style 0': style2,
-    }
-    wb2.read_lib_and_create_excel()
-    assert len(StyleManager._style_map) == 0
-    assert len(StyleManager._STYLE_NAME_MAP) == 0
-    assert StyleManager._STYLE_ID == 0
-    assert StyleManager.REGISTERED_STYLES == {
-        'DEFAULT_STYLE': StyleManager.DEFAULT_STYLE,
-    }
+    assert ws2['A1'] == ('test', 'Custom Style 0')
+    assert ws2['A2'] == ('test', 'shared_style')
+    assert wb2.style._registered_styles == {'Custom Style 0': style2}
+    assert wb.style._registered_styles == {'Custom Style 0': style}
+    assert 'shared_style' in StyleManager.REGISTERED_STYLES
+    StyleManager.reset_style_configs()
+
+
+@pytest.mark.parametrize('modified', ['first', 'second'])
+def test_style_changed_after_assignment(modified):
+    wb = Workbook()
+    ws = wb['Sheet1']
+    first = CustomStyle(font_bold=True, font_size=12)
+    second = CustomStyle(font_bold=True, font_size=12)
+    ws['A1'] = ('y', first)
+    ws['A2'] = ('z', second)
+    # The equal styles share a name, and the cells keep the settings the
+    # styles had when they were assigned.
+    assert ws['A1'] == ('y', 'Custom Style 0')
+    assert ws['A2'] == ('z', 'Custom Style 0')
+    style = first if modified == 'first' else second
+    style.set_custom_style(font_size=30)
+    style.font.italic = True
+    ws['A3'] = ('x', style)
+    wb._create_style()
+
+    assert ws['A1'][1] == ws['A2'][1] == 'Custom Style 0'
+    assert ws['A3'][1] == 'Custom Style 1'
+    assert wb.style._style_map['Custom Style 0']['Font']['Size'] == 12
+    assert not wb.style._style_map['Custom Style 0']['Font']['Italic']
+    assert wb.style._style_map['Custom Style 1']['Font']['Size'] == 30
+    assert wb.style._style_map['Custom Style 1']['Font']['Italic'] is True
+
+
+def test_catalog_style_changed_after_registration():
+    from pyfastexcel.manager import StyleManager
+    from pyfastexcel.utils import set_custom_style
+
+    StyleManager.reset_style_configs()
+    style = CustomStyle(font_bold=True, font_size=12)
+    set_custom_style('bold_style', style)
+    style.set_custom_style(font_size=30)
+
+    wb = Workbook()
+    ws = wb['Sheet1']
+    ws['A1'] = ('y', CustomStyle(font_bold=True, font_size=12))
+    ws['A2'] = ('z', style)
+    wb._create_style()
+    assert ws['A1'][1] == 'bold_style'
+    assert ws['A2'][1] == 'Custom Style 0'
+    assert wb.style._style_map['bold_style']['Font']['Size'] == 12
+    assert wb.style._style_map['Custom Style 0']['Font']['Size'] == 30
+    StyleManager.reset_style_configs()
+
+
+def test_compiled_style_cache(monkeypatch):
+    from collections import OrderedDict
+
+    from pyfastexcel.manager import StyleManager
+    from pyfastexcel.utils import style_cache_info
+
+    # Isolate the process-wide catalog and cache from the other tests.
+    monkeypatch.setattr(StyleManager, 'REGISTERED_STYLES', {'DEFAULT_STYLE': CustomStyle()})
+    monkeypatch.setattr(StyleManager, '_STYLE_NAME_MAP', {})
+    monkeypatch.setattr(StyleManager, '_STYLE_CACHE', OrderedDict())
+    monkeypatch.setattr(StyleManager, '_style_cache_hits', 0)
+    monkeypatch.setattr(StyleManager, '_style_cache_misses', 0)
+
+    settings = []
+    for _ in range(3):
+        wb = Workbook()
+        style = CustomStyle(font_bold=True, fill_color='c0ffee')
+        wb['Sheet1']['A1'] = ('test', style)
+        wb._create_style()
+        settings.append(wb.style._style_map[wb.style._get_style_name(style)])
+    # The style is compiled once, for the first instance, and the settings
+    # are reused by the equal instances of the other workbooks.
+    assert settings[0] is settings[1] is settings[2]
+    assert settings[0]['Fill']['Color'] == 'c0ffee'
+    info = style_cache_info()
+    assert info.misses == 2  # the DEFAULT_STYLE and the custom style
+    assert info.hits >= 4
+    assert info.currsize == 2 and info.maxsize == StyleManager.STYLE_CACHE_SIZE
+
+    # A new equal instance is neither validated nor serialized again.
+    style = CustomStyle(font_bold=True, fill_color='c0ffee')
+    assert style._get_settings() is settings[0]
+    assert all(part._settings is None for part in style._parts.values())
+
+    # A style whose models can be modified in place is not cached.
+    style.protection.hidden = True
+    assert StyleManager._compile_style(style)['Protection']['Hidden'] is True
+    assert settings[0]['Protection']['Hidden'] is not True
+    assert style_cache_info().currsize == 2
+
+    # The least recently used styles are evicted.
+    monkeypatch.setattr(StyleManager, 'STYLE_CACHE_SIZE', 2)
+    StyleManager._compile_style(CustomStyle(font_size=31))
+    assert style_cache_info().currsize == 2
+    default_key = StyleManager.REGISTERED_STYLES['DEFAULT_STYLE']._get_content_key()
+    assert default_key not in StyleManager._STYLE_CACHE
+
+    StyleManager.clear_style_cache()
+    assert style_cache_info() == (0, 0, 2, 0)
 
 
 @pytest.mark.parametrize(
@@ -364,7 +603,6 @@ def test_if_style_is_reset():
     ],
 )
 def test_set_style_with_str(target, expected_output1):
-    from pyfastexcel.manager import StyleManager
     from pyfastexcel.utils import set_custom_style
 
     wb = Workbook()
@@ -380,7 +618,7 @@ def test_set_style_with_str(target, expected_output1):
     assert ws[target] == expected_output1
 
     ws.set_style(target, color_style)
-    assert ws[target][1] == f'Custom Style {StyleManager._STYLE_ID - 1}'
+    assert ws[target][1] == f'Custom Style {wb.style._style_id - 1}'
 
     with pytest.raises(ValueError):
         ws.set_style(target, 'wrong_style')
@@ -394,7 +632,6 @@ def test_set_style_with_str(target, expected_output1):
     ],
 )
 def test_set_style_with_silce(target, expected_output1):
-    from pyfastexcel.manager import StyleManager
     from pyfastexcel.utils import set_custom_style
 
     wb = Workbook()
@@ -417,7 +654,7 @@ def test_set_style_with_silce(target, expected_output1):
     assert ws[t] == expected_output1
 
     ws.set_style(target, color_style)
-    assert ws[t][1][1] == f'Custom Style {StyleManager._STYLE_ID - 1}'
+    assert ws[t][1][1] == f'Custom Style {wb.style._style_id - 1}'
 
     with pytest.raises(ValueError):
         ws.set_style(target, 'wrong_style')
@@ -431,7 +668,6 @@ def test_set_style_with_silce(target, expected_output1):
     ],
 )
 def test_set_style_with_list(row, target, expected_output1):
-    from pyfastexcel.manager import StyleManager
     from pyfastexcel.utils import set_custom_style
 
     wb = Workbook()
@@ -447,7 +683,7 @@ def test_set_style_with_list(row, target, expected_output1):
     assert ws[row] == expected_output1
 
     ws.set_style(target, color_style)
-    assert ws[row][target[1]][1] == f'Custom Style {StyleManager._STYLE_ID - 1}'
+    assert ws[row][target[1]][1] == f'Custom Style {wb.style._style_id - 1}'
 
 
 @pytest.mark.parametrize(
@@ -1027,3 +1263,257 @@ def test_fill_style(custom_style):
     ws[0] = [(1, custom_style)]
 
     wb.read_lib_and_create_excel()
+
+
+@pytest.mark.parametrize('storage', ['list', 'columnar', 'sparse'])
+def test_write_array(storage):
+    import msgspec
+    import numpy as np
+
+    wb = Workbook(storage=storage)
+    ws = wb['Sheet1']
+    style = CustomStyle(font_bold=True)
+    ws.write_array(np.arange(6, dtype='>i4').reshape(2, 3), 'B2', style=style)
+    ws.write_array([np.array([0.5, np.nan]), np.array([True, False])], 'A10')
+    ws.write_array(np.array([['a', 'b']]), 'C20', style=style)
+
+    assert [(block.dtype, block.n_rows, block.n_cols) for block in ws._array_list] == [
+        ('i4', 2, 3),
+        ('f8', 2, 1),
+        ('b1', 2, 1),
+    ]
+    name = wb.style._get_style_name(style)
+    assert ws['C20'] == ('a', name)
+    assert ws['D20'] == ('b', name)
+
+    arrays = msgspec.json.decode(wb._encode_workbook())['content']['Sheet1']['Arrays']
+    bold = wb.style._style_ids[name]
+    assert [(a['Row'], a['Col'], a['Style']) for a in arrays] == [
+        (1, 1, bold),
+        (9, 0, 0),
+        (9, 1, 0),
+    ]
+    assert wb.read_lib_and_create_excel(wire_format='msgpack')[:2] == b'PK'
+
+
+def test_write_array_failed():
+    import numpy as np
+
+    ws = Workbook()['Sheet1']
+    with pytest.raises(TypeError):
+        ws.write_array(np.zeros(3))
+    with pytest.raises(TypeError):
+        ws.write_array([np.zeros((2, 2))])
+    with pytest.raises(ValueError):
+        ws.write_array(np.zeros((2, 2)), style='not registered')
+    with pytest.raises(ValueError):
+        ws.write_array(np.zeros((2, 2)), 'A1048576')
+
+
+@pytest.mark.parametrize('storage', ['list', 'sparse'])
+def test_write_array_style_rules(storage, monkeypatch):
+    import msgspec
+    import numpy as np
+
+    from pyfastexcel.session import ExportSession
+
+    wb = Workbook(storage=storage)
+    ws = wb['Sheet1']
+    bold = CustomStyle(font_bold=True)
+    italic = CustomStyle(font_italic=True)
+    ws.set_style('A1:C3', italic)
+    ws.write_array(np.zeros((3, 3)), 'A1')
+    ws.set_style('A1:B2', bold)
+    # Writing a cell resolves the pending rules, the block keeps its rules.
+    ws['E5'] = 1
+    ws.set_style('B2:Z9', italic)
+    ws.set_style('Y1:Z9', bold)
+
+    arrays = msgspec.json.decode(wb._encode_workbook())['content']['Sheet1']['Arrays']
+    style_ids = wb.style._style_ids
+    bold_id = style_ids[wb.style._get_style_name(bold)]
+    italic_id = style_ids[wb.style._get_style_name(italic)]
+    # Only the rules recorded after the block which overlap it are sent.
+    assert arrays[0]['StyleRules'] == [[0, 0, 1, 1, bold_id], [1, 1, 8, 25, italic_id]]
+    assert wb.read_lib_and_create_excel(wire_format='msgpack')[:2] == b'PK'
+
+    # The rules are sent with the arrays of an export session.
+    sent = []
+    append_rows = ExportSession.append_rows
+
+    def spy(self, rows, styles=None, arrays=None, *args, **kwargs):
+        sent.extend(arrays or [])
+        append_rows(self, rows, styles, arrays, *args, **kwargs)
+
+    monkeypatch.setattr(ExportSession, 'append_rows', spy)
+    wb['Sheet1'].write_rows([[1]])
+    assert wb.read_lib_and_create_excel()[:2] == b'PK'
+    assert [list(rule) for rule in sent[0]['StyleRules']] == arrays[0]['StyleRules']
+
+
+def test_write_rows(tmp_path):
+    pulled = []
+
+    def rows():
+        for i in range(5):
+            pulled.append(i)
+            yield [i, None, (f'row {i}', CustomStyle(font_bold=True))]
+
+    wb = Workbook()
+    ws = wb['Sheet1']
+    ws['A1'] = 'title'
+    ws.write_rows(rows(), chunk_size=2)
+    # The rows are not pulled until the workbook is exported.
+    assert pulled == []
+
+    batches = ws._source_list[0]._iter_batches()
+    chunk, arrays = next(batches)
+    assert pulled == [0, 1] and arrays == []
+    bold = ws._style_manager._get_style_name(CustomStyle(font_bold=True))
+    assert chunk[0] == [(0, 'DEFAULT_STYLE'), None, ('row 0', bold)]
+    assert [len(chunk) for chunk, _ in batches] == [2, 1]
+
+    wb = Workbook()
+    italic = CustomStyle(font_italic=True)
+    wb['Sheet1'].write_rows(([i, (i, italic)] for i in range(3)), 2)
+    wb.save(str(tmp_path / 'rows.xlsx'))
+    assert wb.style._get_style_name(italic) in wb.style._style_ids
+
+
+@pytest.mark.parametrize('storage', ['sparse', 'columnar'])
+@pytest.mark.parametrize('wire_format', ['json', 'msgpack'])
+def test_write_rows_with_storage(storage, wire_format, monkeypatch):
+    from pyfastexcel.session import ExportSession
+
+    batches = []
+    append_rows = ExportSession.append_rows
+
+    def spy(self, rows, *args, **kwargs):
+        batches.append((rows, kwargs))
+        append_rows(self, rows, *args, **kwargs)
+
+    monkeypatch.setattr(ExportSession, 'append_rows', spy)
+    wb = Workbook()
+    wb.create_sheet('Storage', storage=storage)
+    ws = wb['Storage']
+    ws['A1'] = 'first'
+    ws['ZZ50'] = 'last'
+    ws.set_style('A1:B2', CustomStyle(font_bold=True))
+    wb['Sheet1'].write_rows([[1, 2]] * 3)
+    assert wb.read_lib_and_create_excel(wire_format=wire_format)[:2] == b'PK'
+
+    # The cells of the storage are sent as they are kept, not as dense rows.
+    rows, kwargs = batches[-1]
+    assert rows == []
+    if storage == 'sparse':
+        assert kwargs['sparse']['Rows'] == [0, 49] and kwargs['sparse']['Length'] == 50
+    else:
+        assert kwargs['columns']['Rows'] == 50
+    # The style rules are applied by the shared library.
+    assert ws._style_rules
+
+
+def test_write_rows_failed():
+    ws = Workbook()['Sheet1']
+    with pytest.raises(ValueError):
+        ws.write_rows([[1]], chunk_size=0)
+
+
+@pytest.mark.parametrize('storage', ['list', 'sparse'])
+def test_set_column_and_row_style(storage):
+    import msgspec
+
+    wb = Workbook(storage=storage)
+    ws = wb['Sheet1']
+    ws['A1':'B1'] = [1, (2, 'DEFAULT_STYLE')]
+    bold = CustomStyle(font_bold=True)
+    italic = CustomStyle(font_italic=True)
+    ws.set_column_style('A', bold)
+    ws.set_column_style(2, italic)
+    ws.set_row_style(3, wb.style._get_style_name(bold))
+    # The cells keep their own style.
+    assert ws['A1'] == (1, 'DEFAULT_STYLE')
+
+    content = msgspec.json.decode(wb._encode_workbook())['content']['Sheet1']
+    style_ids = wb.style._style_ids
+    bold_id = style_ids[wb.style._get_style_name(bold)]
+    italic_id = style_ids[wb.style._get_style_name(italic)]
+    assert content['ColStyle'] == {'1': bold_id, '2': italic_id}
+    assert content['RowStyle'] == {'3': bold_id}
+    assert wb.read_lib_and_create_excel()[:2] == b'PK'
+
+
+def test_set_column_and_row_style_failed():
+    ws = Workbook()['Sheet1']
+    with pytest.raises(ValueError):
+        ws.set_column_style(0, 'DEFAULT_STYLE')
+    with pytest.raises(ValueError):
+        ws.set_column_style('A', 'not registered')
+    with pytest.raises(ValueError):
+        ws.set_row_style(1048577, 'DEFAULT_STYLE')
+    with pytest.raises(ValueError):
+        ws.set_row_style(1, 'not registered')
+
+
+@pytest.mark.parametrize('storage', ['list', 'columnar', 'sparse'])
+def test_set_style_rules(storage):
+    import msgspec
+
+    wb = Workbook(storage=storage)
+    ws = wb['Sheet1']
+    ws['A1':'C2'] = [[1, 2, 3], [4, 5, 6]]
+    bold = CustomStyle(font_bold=True)
+    italic = CustomStyle(font_italic=True)
+    ws.set_style('A1:C1000000', bold)
+    ws.set_style(slice('B2', 'C2'), italic)
+    # The rules are recorded without touching the cells.
+    assert len(ws._style_rules) == 2
+    assert ws._data[0][0] == (1, 'DEFAULT_STYLE')
+
+    content = msgspec.json.decode(wb._encode_workbook())['content']['Sheet1']
+    style_ids = wb.style._style_ids
+    bold_name = wb.style._get_style_name(bold)
+    italic_name = wb.style._get_style_name(italic)
+    assert content['StyleRules'] == [
+        [0, 0, 999999, 2, style_ids[bold_name]],
+        [1, 1, 1, 2, style_ids[italic_name]],
+    ]
+    assert wb.read_lib_and_create_excel()[:2] == b'PK'
+
+    # The rules are resolved in order before the cells are accessed.
+    ws['D1'] = 7
+    assert ws._style_rules == []
+    assert ws['A2'] == (4, bold_name)
+    assert ws['C2'] == (6, italic_name)
+    assert ws['D1'] == (7, 'DEFAULT_STYLE')
+
+
+def test_set_style_rules_failed():
+    ws = Workbook()['Sheet1']
+    with pytest.raises(ValueError):
+        ws.set_style('A1:A1048577', 'DEFAULT_STYLE')
+
+
+@pytest.mark.parametrize('storage', ['list', 'columnar', 'sparse'])
+def test_typed_cell_values(storage):
+    wb = Workbook(storage=storage)
+    ws = wb['Sheet1']
+    bold = CustomStyle(font_bold=True)
+    ws[0] = [datetime.date(2024, 1, 2), decimal.Decimal('1.5'), None, True]
+    ws['A2'] = (datetime.datetime(2024, 1, 2, 6), bold)
+    ws['B2'] = (datetime.date(2024, 1, 3), 'DEFAULT_STYLE')
+    ws.cell(4, 1, datetime.timedelta(hours=12))
+
+    date_style = ws['A1'][1]
+    assert ws['A1'] == (45293.0, date_style)
+    assert wb.style._get_registered_style(date_style).number_format == DATE_FORMAT
+    assert ws['B1'] == (1.5, 'DEFAULT_STYLE')
+    assert ws['C1'] == (None, 'DEFAULT_STYLE')
+    assert ws['D1'] == (True, 'DEFAULT_STYLE')
+    # The formatted styles are registered once per sheet.
+    assert ws['B2'] == (45294.0, date_style)
+    datetime_style = wb.style._get_registered_style(ws['A2'][1])
+    assert datetime_style.number_format == DATETIME_FORMAT and datetime_style.font.bold
+    timedelta_style = wb.style._get_registered_style(ws._data[4][1][1])
+    assert ws._data[4][1][0] == 0.5 and timedelta_style.number_format == TIMEDELTA_FORMAT
+    assert wb.read_lib_and_create_excel()[:2] == b'PK'
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+from io import BytesIO
+
 import pytest
 
 from pyfastexcel import CustomStyle, StreamWriter
@@ -370,6 +373,33 @@ def test_pyfastexcel_stream_style_kwargs():
         excel_example.row_append('new_style', style=style, font_color='0000ff', font_bold=True)
 
 
+def test_stream_style_handle():
+    sw = StreamWriter()
+    style = CustomStyle(font_bold=True, fill_color='0d0d0d')
+    handle = sw.style_handle(style, font_color='ff0000')
+    assert handle.name == sw.style_handle(style, font_color='ff0000').name
+    assert sw.style._get_registered_style(handle.name) == style.clone_and_modify(
+        font_color='ff0000'
+    )
+    assert repr(handle) == f'StyleHandle({handle.name!r})'
+
+    sw.row_append('a', style=handle)
+    sw.row_append(1, style=sw.style_handle())
+    sw.row_append_list(['b', 'c'], style=handle, create_row=True)
+    sw.create_row()
+    assert sw.ws.data == [
+        (('b', handle.name), ('c', handle.name)),
+        [('a', handle.name), (1, 'DEFAULT_STYLE')],
+    ]
+
+    with pytest.raises(ValueError):
+        sw.style_handle('not_found_style')
+    with pytest.raises(ValueError):
+        sw.row_append('a', style=handle, font_bold=False)
+    with pytest.raises(ValueError):
+        StreamWriter().row_append('a', style=handle)
+
+
 def test_overwrite_style():
     from pyfastexcel import Workbook
 
@@ -385,3 +415,133 @@ def test_overwrite_style():
     ws['A1'] = 'A1 value'
     ws['B1'] = ('B1 value', 'bold_style')
     wb.read_lib_and_create_excel()
+
+
+def test_stream_writer_session():
+    wb = StreamWriter()
+    wb.create_sheet('Sheet2')
+    wb.switch_sheet('Sheet1')
+    wb.set_cell_width('Sheet1', 'A', 20)
+    wb.open_session(batch_size=2)
+    style = CustomStyle(font_bold=True)
+    for i in range(5):
+        wb.row_append(i, style=style)
+        wb.row_append(f'row {i}', style=style, font_color='ff0000')
+        wb.create_row()
+    # Every full batch has been pushed to the export session.
+    assert len(wb['Sheet1'].data) == 1
+
+    wb.switch_sheet('Sheet2')
+    # The style of the column is sent with the settings of the sheet.
+    wb['Sheet2'].set_column_style('B', CustomStyle(font_italic=True))
+    wb.row_append_list(['a', 'b', 'c'], create_row=True)
+    wb.save('session_test.xlsx')
+    assert wb._session is None
+    assert wb['Sheet2']._column_style_dict[2] in wb.style._style_ids
+    assert os.path.getsize('session_test.xlsx') > 0
+    os.remove('session_test.xlsx')
+
+
+def test_stream_writer_session_saved_to_file(tmp_path):
+    wb = StreamWriter()
+    wb.open_session(batch_size=1)
+    wb.row_append('value')
+    wb.create_row()
+    path = str(tmp_path / 'session.xlsx')
+    wb.save(path)
+    assert os.path.getsize(path) > 0
+    # The streamed rows are not kept, so the workbook can not be built again.
+    with pytest.raises(RuntimeError):
+        wb.save(str(tmp_path / 'session_copy.xlsx'))
+    with pytest.raises(RuntimeError):
+        wb.save(BytesIO())
+
+
+def test_stream_writer_session_to_writable():
+    wb = StreamWriter()
+    wb.open_session(batch_size=1)
+    wb.row_append('value')
+    wb.create_row()
+    wb.flush_rows()
+    buffer = BytesIO()
+    wb.save(buffer)
+    assert buffer.getvalue() == wb.decoded_bytes
+
+
+def test_stream_writer_session_msgpack():
+    wb = StreamWriter()
+    wb.open_session(batch_size=2, wire_format='msgpack')
+    style = CustomStyle(font_bold=True)
+    for i in range(5):
+        wb.row_append(i, style=style)
+        wb.row_append(None)
+        wb.row_append(f'row {i}', style=style, font_color='ff0000')
+        wb.create_row()
+    wb.save('session_msgpack_test.xlsx')
+    assert os.path.getsize('session_msgpack_test.xlsx') > 0
+    os.remove('session_msgpack_test.xlsx')
+
+
+def test_stream_writer_session_errors():
+    wb = StreamWriter()
+    with pytest.raises(RuntimeError):
+        wb.flush_rows()
+    with pytest.raises(ValueError):
+        wb.open_session(batch_size=0)
+
+    wb.create_sheet('Sheet2')
+    wb.open_session(batch_size=1)
+    with pytest.raises(RuntimeError):
+        wb.open_session()
+    wb.switch_sheet('Sheet2')
+    wb.row_append('value')
+    wb.create_row()
+    # Sheet1 is finished once Sheet2 starts streaming.
+    wb.switch_sheet('Sheet1')
+    wb.row_append('value')
+    with pytest.raises(RuntimeError):
+        wb.create_row()
+    # Saving finishes the remaining sheets and closes the session.
+    buffer = BytesIO()
+    wb.save(buffer)
+    assert wb._session is None
+    assert buffer.getvalue() == wb.decoded_bytes
+
+
+def test_stream_writer_session_table():
+    # The table spans several batches of the session.
+    wb = StreamWriter()
+    wb['Sheet1'].create_table('A1:B6', 'Table1')
+    wb.open_session(batch_size=2)
+    wb.row_append_list(['name', 'value'], create_row=True)
+    for i in range(5):
+        wb.row_append_list([f'row {i}', i], create_row=True)
+    buffer = BytesIO()
+    wb.save(buffer)
+    assert len(buffer.getvalue()) > 0
+
+
+@pytest.mark.parametrize(
+    'rows, cell_range',
+    [
+        # Duplicate headers
+        ([['name', 'name'], ['a', 1], ['b', 2]], 'A1:B3'),
+        # The header is repeated in a later batch
+        ([['name', 'value'], ['a', 1], ['b', 2], ['name', 3]], 'A1:B4'),
+        # The header row is never written
+        ([['name', 'value']], 'A3:B4'),
+    ],
+)
+def test_stream_writer_session_invalid_table(rows, cell_range):
+    wb = StreamWriter()
+    wb['Sheet1'].create_table(cell_range, 'Table1')
+    wb.open_session(batch_size=2)
+    with pytest.raises(ValueError):
+        for row in rows:
+            wb.row_append_list(row, create_row=True)
+        wb.save(BytesIO())
+    # The session is closed by save even if the validation failed.
+    if wb._session is not None:
+        with pytest.raises(ValueError):
+            wb.save(BytesIO())
+    assert wb._session is None